@@ -30,6 +30,62 @@ class Settings(BaseSettings):
         None, env="SUPABASE_PUBLISHABLE_KEY"
     )
 
+    # Supabase HTTP connection pool settings
+    supabase_http_max_connections: int = Field(100, env="SUPABASE_HTTP_MAX_CONNECTIONS")
+    supabase_http_max_keepalive_connections: int = Field(
+        20, env="SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    supabase_http_keepalive_expiry: float = Field(
+        30.0, env="SUPABASE_HTTP_KEEPALIVE_EXPIRY"
+    )
+    supabase_http2: bool = Field(True, env="SUPABASE_HTTP2")
+    supabase_http_timeout: float = Field(120.0, env="SUPABASE_HTTP_TIMEOUT")
+
+    # Response compression settings (brotli / zstd require brotli / zstandard)
+    compression_enabled: bool = Field(True, env="COMPRESSION_ENABLED")
+    compression_minimum_size: int = Field(1024, env="COMPRESSION_MINIMUM_SIZE")
+
+    # Use orjson for JSON responses (requires orjson)
+    orjson_response_enabled: bool = Field(False, env="ORJSON_RESPONSE_ENABLED")
+
+    # Election funds settings
+    election_funds_rpc_enabled: bool = Field(False, env="ELECTION_FUNDS_RPC_ENABLED")
+
+    # Ledger response cache settings (0 disables the cache)
+    ledger_response_cache_max_bytes: int = Field(
+        64 * 1024 * 1024, env="LEDGER_RESPONSE_CACHE_MAX_BYTES"
+    )
+
+    # Stream ledgers with more journals than this as JSON (0 disables streaming)
+    ledger_stream_threshold: int = Field(20000, env="LEDGER_STREAM_THRESHOLD")
+    journal_page_size: int = Field(1000, env="JOURNAL_PAGE_SIZE")
+
+    # Seconds a request waits for a shared in-flight ledger build
+    single_flight_timeout: float = Field(30.0, env="SINGLE_FLIGHT_TIMEOUT")
+
+    # Published elections list cache settings (seconds)
+    elections_list_cache_ttl: float = Field(60.0, env="ELECTIONS_LIST_CACHE_TTL")
+    elections_list_stale_while_revalidate: int = Field(
+        300, env="ELECTIONS_LIST_STALE_WHILE_REVALIDATE"
+    )
+
+    # Master data cache settings
+    master_data_refresh_interval: float = Field(
+        300.0, env="MASTER_DATA_REFRESH_INTERVAL"
+    )
+
+    # Existence index settings (seconds)
+    existence_index_enabled: bool = Field(True, env="EXISTENCE_INDEX_ENABLED")
+    existence_index_refresh_interval: float = Field(
+        15.0, env="EXISTENCE_INDEX_REFRESH_INTERVAL"
+    )
+    existence_index_max_staleness: float = Field(
+        60.0, env="EXISTENCE_INDEX_MAX_STALENESS"
+    )
+    existence_index_miss_refresh_interval: float = Field(
+        1.0, env="EXISTENCE_INDEX_MISS_REFRESH_INTERVAL"
+    )
+
     class Config:
         """Pydantic設定
 
@@ -2,26 +2,160 @@
 
 Supabaseへの接続を管理し、FastAPIの依存性注入で使用できる
 クライアントを提供する。
+
+クライアントはアプリケーションの lifespan で生成される
+SupabaseClientPool が APIキーごとに1つだけ保持し、
+全リクエストで共有する。HTTP接続はプール内の単一トランスポートで
+keep-alive されるため、リクエストごとのTLSハンドシェイクが発生しない。
+
+クライアントは非同期版（AsyncClient）で、PostgRESTへの問い合わせは
+イベントループをブロックせずに await できる。
 """
 
+import httpx
 from fastapi import HTTPException, status
-from supabase import Client, create_client
-from supabase.lib.client_options import ClientOptions
+from supabase import AsyncClient
+from supabase.lib.client_options import AsyncClientOptions
 
 from app.config import settings
 
 
-def _create_supabase_client(api_key: str) -> Client:
-    """Supabaseクライアントを作成する内部ヘルパー関数。
+class SupabaseClientPool:
+    """APIキーごとのSupabaseクライアントと共有HTTPトランスポートを保持するプール
+
+    postgrest はクライアントに渡された httpx.AsyncClient の base_url とヘッダーを
+    書き換えるため、httpx.AsyncClient 自体はAPIキーごとに分け、
+    接続プール（トランスポート）のみを共有する。
+
+    Attributes:
+        supabase_url: SupabaseのURL
+    """
+
+    def __init__(
+        self,
+        supabase_url: str | None,
+        *,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        http2: bool,
+        timeout: float,
+    ):
+        self.supabase_url = supabase_url
+        self._timeout = timeout
+        self._transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._http_clients: list[httpx.AsyncClient] = []
+        self._clients: dict[str, AsyncClient] = {}
+        self._closed = False
+
+    def get(self, api_key: str) -> AsyncClient:
+        """APIキーに対応する共有クライアントを取得する
+
+        初回呼び出し時にクライアントを生成し、以降は同じインスタンスを返す。
+        イベントループ上からのみ呼び出すため、生成処理に排他制御は不要。
+
+        Args:
+            api_key: SupabaseのAPIキー
+
+        Returns:
+            AsyncClient: Supabaseクライアントインスタンス
+
+        Raises:
+            RuntimeError: プールがクローズ済みの場合
+        """
+        if self._closed:
+            raise RuntimeError("Supabase client pool is closed")
+
+        client = self._clients.get(api_key)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=self._timeout,
+                follow_redirects=True,
+            )
+            options = AsyncClientOptions(
+                auto_refresh_token=False,
+                persist_session=False,
+                httpx_client=http_client,
+            )
+            client = AsyncClient(self.supabase_url, api_key, options=options)
+            self._http_clients.append(http_client)
+            self._clients[api_key] = client
+
+        return client
+
+    async def close(self) -> None:
+        """保持しているクライアントと接続プールをすべてクローズする"""
+        self._closed = True
+        for http_client in self._http_clients:
+            await http_client.aclose()
+        self._http_clients.clear()
+        self._clients.clear()
+        await self._transport.aclose()
+
+
+_pool: SupabaseClientPool | None = None
+
+
+def open_supabase_pool() -> SupabaseClientPool:
+    """Supabaseクライアントプールを生成する
+
+    アプリケーションの lifespan 開始時に呼び出す。
+
+    Returns:
+        SupabaseClientPool: 生成したプール
+    """
+    global _pool
+
+    if _pool is None:
+        _pool = SupabaseClientPool(
+            settings.supabase_url,
+            max_connections=settings.supabase_http_max_connections,
+            max_keepalive_connections=settings.supabase_http_max_keepalive_connections,
+            keepalive_expiry=settings.supabase_http_keepalive_expiry,
+            http2=settings.supabase_http2,
+            timeout=settings.supabase_http_timeout,
+        )
+    return _pool
+
+
+async def close_supabase_pool() -> None:
+    """Supabaseクライアントプールをクローズする
+
+    アプリケーションの lifespan 終了時に呼び出す。
+    """
+    global _pool
+
+    if _pool is not None:
+        pool = _pool
+        _pool = None
+        await pool.close()
+
+
+def _create_supabase_client(api_key: str) -> AsyncClient:
+    """Supabaseクライアントを取得する内部ヘルパー関数。
+
+    起動済みのプールから共有クライアントを返す。呼び出しごとにクライアントを
+    作成すると、クローズされない httpx.AsyncClient が残り続けるため、
+    プールが起動していない場合はエラーとする。lifespan を経由しない実行環境
+    （スクリプト等）では、先に open_supabase_pool() を呼び出すこと。
 
     Args:
         api_key (str): SupabaseのAPIキー（公開キーまたはService Roleキー）。
 
     Returns:
-        Client: Supabaseクライアントインスタンス。
+        AsyncClient: Supabaseクライアントインスタンス。
 
     Raises:
         HTTPException: Supabase設定が不完全な場合。
+        RuntimeError: プールが起動していない場合。
     """
     if not settings.supabase_url or not api_key:
         raise HTTPException(
@@ -29,22 +163,20 @@ def _create_supabase_client(api_key: str) -> Client:
             detail="Supabase configuration is incomplete",
         )
 
-    options = ClientOptions(
-        auto_refresh_token=False,
-        persist_session=False,
-    )
+    if _pool is None:
+        raise RuntimeError("Supabase client pool is not open")
 
-    return create_client(settings.supabase_url, api_key, options=options)
+    return _pool.get(api_key)
 
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> AsyncClient:
     """RLSを尊重するSupabaseクライアントを取得する。
 
     Publishable（匿名）キーを使用してSupabaseクライアントを作成する。
     Row Level Security（RLS）のポリシーが有効な通常のエンドポイントで使用する。
 
     Returns:
-        Client: Supabaseクライアントインスタンス。
+        AsyncClient: Supabaseクライアントインスタンス。
 
     Raises:
         HTTPException: Supabase設定が不完全な場合。
@@ -58,16 +190,16 @@ def get_supabase_client() -> Client:
     return _create_supabase_client(settings.supabase_publishable_key)
 
 
-def get_supabase_client_dep() -> Client:
+async def get_supabase_client_dep() -> AsyncClient:
     """FastAPIの依存性注入で使用する通常権限のSupabaseクライアント取得関数。
 
     Returns:
-        Client: RLSを尊重するSupabaseクライアントインスタンス。
+        AsyncClient: RLSを尊重するSupabaseクライアントインスタンス。
     """
     return get_supabase_client()
 
 
-def get_admin_supabase_client() -> Client:
+def get_admin_supabase_client() -> AsyncClient:
     """管理者用Supabaseクライアントを取得する。
 
     Service Roleキーを使用してSupabaseクライアントを作成する。
@@ -75,7 +207,7 @@ def get_admin_supabase_client() -> Client:
     施された管理者専用のエンドポイントでのみ使用すること。
 
     Returns:
-        Client: 管理者権限を持つSupabaseクライアントインスタンス。
+        AsyncClient: 管理者権限を持つSupabaseクライアントインスタンス。
 
     Raises:
         HTTPException: Supabase設定が不完全な場合。
@@ -89,10 +221,10 @@ def get_admin_supabase_client() -> Client:
     return _create_supabase_client(settings.supabase_secret_key)
 
 
-def get_admin_supabase_client_dep() -> Client:
+async def get_admin_supabase_client_dep() -> AsyncClient:
     """FastAPIの依存性注入で使用する管理者用Supabaseクライアント取得関数。
 
     Returns:
-        Client: 管理者権限を持つSupabaseクライアントインスタンス。
+        AsyncClient: 管理者権限を持つSupabaseクライアントインスタンス。
     """
     return get_admin_supabase_client()
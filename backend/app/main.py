@@ -1,12 +1,21 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.config import settings
+from app.database.supabase import (
+    close_supabase_pool,
+    get_supabase_client,
+    open_supabase_pool,
+)
 from app.routers import election_funds, health, polimoney, political_funds
+from app.utils.compression import CompressionMiddleware
+from app.utils.existence_index import start_existence_index, stop_existence_index
+from app.utils.json_response import get_default_response_class
+from app.utils.master_data import start_master_data_cache, stop_master_data_cache
 from app.utils.polimoney_response import MultipleCandidatesException
 
 # Configure logging
@@ -21,8 +30,8 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """FastAPIアプリケーションのライフサイクルを管理するコンテキストマネージャー
 
-    アプリケーション起動時にデータベースの初期化を行い、
-    シャットダウン時にクリーンアップ処理を実行する。
+    アプリケーション起動時に共有Supabaseクライアントプールを生成してマスタデータと
+    ID 存在インデックスを読み込み、シャットダウン時に再読み込みを停止して接続をクローズする。
 
     Args:
         app (FastAPI): FastAPIアプリケーションインスタンス
@@ -34,10 +43,24 @@ async def lifespan(app: FastAPI):
         Exception: データベース初期化に失敗した場合
     """
     logger.info("Starting Polimoney API server...")
+    open_supabase_pool()
+    try:
+        supabase = get_supabase_client()
+    except HTTPException:
+        logger.warning(
+            "Supabase is not configured; master data cache and existence index "
+            "are disabled"
+        )
+    else:
+        await start_master_data_cache(supabase)
+        await start_existence_index(supabase)
 
     yield
 
     logger.info("Shutting down Polimoney API server...")
+    await stop_existence_index()
+    await stop_master_data_cache()
+    await close_supabase_pool()
 
 
 # Create FastAPI application
@@ -46,6 +69,7 @@ app = FastAPI(
     description="政治資金収支報告書・選挙運動費用収支報告書管理システム",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=get_default_response_class(),
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -60,6 +84,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Accept-Encoding に応じたレスポンス圧縮
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+    )
+
 
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
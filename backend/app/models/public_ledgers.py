@@ -22,6 +22,7 @@ class PublicLedger(BaseModel):
         total_income: 収入合計
         total_expense: 支出合計
         journal_count: 仕訳件数
+        public_expense_total: 公費負担合計（トリガーで維持される集計値）
         ledger_source_id: Ledger側のID
         last_updated_at: 最終更新日時
         first_synced_at: 初回同期日時
@@ -37,6 +38,7 @@ class PublicLedger(BaseModel):
     total_income: int = 0
     total_expense: int = 0
     journal_count: int = 0
+    public_expense_total: int = 0
     ledger_source_id: UUID
     last_updated_at: str
     first_synced_at: str
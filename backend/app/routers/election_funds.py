@@ -5,38 +5,80 @@ public_journalsとpublic_ledgersテーブルから選挙資金データを取得
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
-from supabase import Client
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from supabase import AsyncClient
 
 from app import schemas
 from app.database.supabase import get_supabase_client_dep
-from app.utils.election_funds_response import build_election_funds_response
+from app.utils.election_funds_response import (
+    build_election_funds_conditional_response,
+)
+from app.utils.http_cache import conditional_response
+from app.utils.journal_csv import CSV_OPENAPI_RESPONSES, ledger_csv_response
+from app.utils.ledger_response import LedgerResponseFormat, fetch_ledger_or_raise
 
 router = APIRouter()
 
 
 @router.get(
     "/election-funds/{ledger_id}",
-    response_model=schemas.ElectionFundsResponse,
+    response_model=(
+        schemas.ElectionFundsResponse | schemas.ElectionFundsColumnarResponse
+    ),
+    responses={
+        **CSV_OPENAPI_RESPONSES,
+        status.HTTP_304_NOT_MODIFIED: {"description": "ETag が一致"},
+    },
 )
 async def get_election_funds_by_ledger_id(
     ledger_id: UUID,
-    supabase: Client = Depends(get_supabase_client_dep),
+    response: Response,
+    response_format: LedgerResponseFormat = Query(
+        default="rows",
+        alias="format",
+        description="仕訳データの形式（rows: 行形式、columnar: 列形式、csv: CSV）",
+    ),
+    if_none_match: str | None = Header(default=None),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
 ):
     """指定した台帳IDの選挙資金データを取得する
 
     public_ledgersのIDを指定して、関連するpublic_journalsと
     選挙情報、政治家情報を取得する。
+    レスポンスには ETag を付与し、If-None-Match が一致する場合は 304 を返す。
+    format=columnar を指定すると仕訳データを列形式で返す。
+    format=csv を指定すると仕訳のみを CSV で逐次出力する（ETag は付与しない）。
 
     Args:
         ledger_id: 台帳ID（public_ledgers.id）
+        response: ETag ヘッダーを設定するレスポンス
+        response_format: 仕訳データの形式
+        if_none_match: If-None-Match ヘッダー
         supabase: Supabaseクライアント
 
     Returns:
-        schemas.ElectionFundsResponse: 選挙資金データ
+        schemas.ElectionFundsResponse | schemas.ElectionFundsColumnarResponse:
+            選挙資金データ（format=csv の場合は CSV の StreamingResponse）
 
     Raises:
         HTTPException: 指定されたデータが見つからない場合
             - 404: 台帳が存在しない場合、または選挙運動の台帳でない場合
     """
-    return build_election_funds_response(supabase, ledger_id)
+    if response_format == "csv":
+        await fetch_ledger_or_raise(supabase, ledger_id, "election")
+        return ledger_csv_response(supabase, ledger_id, "election")
+
+    result = await build_election_funds_conditional_response(
+        supabase,
+        ledger_id,
+        if_none_match=if_none_match,
+        render="json",
+        response_format=response_format,
+    )
+    return conditional_response(
+        result.etag,
+        result.body,
+        response,
+        result.content,
+        stream=result.stream,
+    )
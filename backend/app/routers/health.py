@@ -1,7 +1,11 @@
+from dataclasses import asdict
 from datetime import datetime
 
 from fastapi import APIRouter
 
+from app.utils.ledger_response import ledger_journals_flight, ledger_lookup_flight
+from app.utils.response_cache import ledger_response_cache
+
 router = APIRouter()
 
 
@@ -21,3 +25,21 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
     }
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    """台帳レスポンスキャッシュの統計情報を取得するエンドポイント
+
+    Returns:
+        dict: キャッシュの統計情報
+            - ledger_response (dict): ヒット数・ミス数・追い出し数・エントリ数・
+              推定サイズ合計・上限
+            - ledger_builds_in_flight (int): 共有中の仕訳の取得数
+            - ledger_lookups_in_flight (int): 共有中の台帳の行の取得数
+    """
+    return {
+        "ledger_response": asdict(ledger_response_cache.stats()),
+        "ledger_builds_in_flight": ledger_journals_flight.in_flight(),
+        "ledger_lookups_in_flight": ledger_lookup_flight.in_flight(),
+    }
@@ -5,20 +5,38 @@
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
-from supabase import Client
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import StreamingResponse
+from supabase import AsyncClient
 
 from app import schemas
+from app.config import settings
 from app.database.supabase import get_supabase_client_dep
 from app.utils.election_funds_response import (
-    build_election_funds_response,
-    build_election_funds_response_for_ledger,
+    build_election_funds_conditional_response,
     fetch_election_ledger_or_raise,
 )
+from app.utils.http_cache import conditional_response
+from app.utils.journal_export import (
+    NDJSON_MEDIA_TYPE,
+    NDJSON_OPENAPI_RESPONSES,
+    fetch_export_ledger_kinds,
+    iter_journals_ndjson,
+)
+from app.utils.ledger_response import (
+    RENDER_MEDIA_TYPES,
+    JournalFormat,
+    build_conditional_ledger_response,
+)
+from app.utils.msgpack_response import (
+    MSGPACK_OPENAPI_RESPONSES,
+    accepts_msgpack,
+    msgpack_response,
+)
 from app.utils.polimoney_response import (
     build_election_candidates_response,
-    build_elections_list_response,
-    resolve_ledger_for_election,
+    get_elections_list_response,
+    resolve_election_ledger,
 )
 
 router = APIRouter(prefix="/polimoney")
@@ -27,16 +45,24 @@ router = APIRouter(prefix="/polimoney")
 @router.get(
     "/elections",
     response_model=schemas.ElectionsListResponse,
+    responses=MSGPACK_OPENAPI_RESPONSES,
 )
 async def get_polimoney_elections(
-    supabase: Client = Depends(get_supabase_client_dep),
+    response: Response,
+    accept: str | None = Header(default=None),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
 ):
     """収支データが公開されている選挙の一覧を取得する
 
     public_ledgers に election_id が設定されている選挙のみ返却する。
-    同一選挙に複数候補者の台帳がある場合は重複を除去する。
+    同一選挙に複数候補者の台帳がある場合も選挙は1件のみ返却する。
+    一覧はプロセス内のスナップショットから返し、TTL 経過後は
+    バックグラウンドで再取得する（stale-while-revalidate）。
+    Accept で application/msgpack を求めた場合は MessagePack で返す。
 
     Args:
+        response: Cache-Control ヘッダーを設定するレスポンス
+        accept: Accept ヘッダー
         supabase: Supabaseクライアント
 
     Returns:
@@ -45,59 +71,110 @@ async def get_polimoney_elections(
     Raises:
         HTTPException: データ取得に失敗した場合
     """
-    return build_elections_list_response(supabase)
+    elections = await get_elections_list_response(supabase)
+    response.headers["Cache-Control"] = (
+        f"public, max-age={int(settings.elections_list_cache_ttl)}, "
+        f"stale-while-revalidate={settings.elections_list_stale_while_revalidate}"
+    )
+    response.headers["Vary"] = "Accept"
+    if accepts_msgpack(accept):
+        return msgpack_response(elections, response)
+    return elections
 
 
 @router.get(
     "/elections/{election_id}/journals",
-    response_model=schemas.ElectionFundsResponse,
+    response_model=(
+        schemas.ElectionFundsResponse | schemas.ElectionFundsColumnarResponse
+    ),
     responses={
+        **MSGPACK_OPENAPI_RESPONSES,
+        status.HTTP_304_NOT_MODIFIED: {"description": "ETag が一致"},
         status.HTTP_400_BAD_REQUEST: {"model": schemas.MultipleCandidatesError},
     },
 )
 async def get_polimoney_election_journals(
     election_id: UUID,
+    response: Response,
     politician_id: UUID | None = Query(
         default=None,
         description="政治家 ID（同じ選挙に複数候補者がいる場合は必須）",
     ),
-    supabase: Client = Depends(get_supabase_client_dep),
+    response_format: JournalFormat = Query(
+        default="rows",
+        alias="format",
+        description="仕訳データの形式（rows: 行形式、columnar: 列形式）",
+    ),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
 ):
     """指定選挙の収支データを Polimoney JSON 形式で取得する
 
-    該当選挙の public_ledgers を解決し、仕訳一覧とメタ情報を返却する。
+    該当選挙の public_ledgers をメタ情報付きで1回で解決し、仕訳一覧とメタ情報を返却する。
     同一選挙に複数候補者がいる場合は politician_id の指定が必須。
+    レスポンスには ETag を付与し、If-None-Match が一致する場合は 304 を返す。
+    format=columnar を指定すると仕訳データを列形式で返す。
+    Accept で application/msgpack を求めた場合は MessagePack で返す。
 
     Args:
         election_id: 選挙ID
+        response: ETag ヘッダーを設定するレスポンス
         politician_id: 政治家ID（複数候補時は必須）
+        response_format: 仕訳データの形式
+        if_none_match: If-None-Match ヘッダー
+        accept: Accept ヘッダー
         supabase: Supabaseクライアント
 
     Returns:
-        schemas.ElectionFundsResponse: 選挙収支データ
+        schemas.ElectionFundsResponse | schemas.ElectionFundsColumnarResponse:
+            選挙収支データ
 
     Raises:
         HTTPException: 選挙・台帳が見つからない場合（404）
         MultipleCandidatesException: 複数候補者かつ politician_id 未指定（400）
     """
-    ledger_id = resolve_ledger_for_election(supabase, election_id, politician_id)
-    return build_election_funds_response(supabase, ledger_id)
+    render = "msgpack" if accepts_msgpack(accept) else "json"
+    response.headers["Vary"] = "Accept"
+    ledger_data = await resolve_election_ledger(supabase, election_id, politician_id)
+    result = await build_election_funds_conditional_response(
+        supabase,
+        UUID(ledger_data["id"]),
+        ledger_data,
+        if_none_match,
+        render=render,
+        response_format=response_format,
+    )
+    return conditional_response(
+        result.etag,
+        result.body,
+        response,
+        result.content,
+        RENDER_MEDIA_TYPES[render],
+        result.stream,
+    )
 
 
 @router.get(
     "/elections/{election_id}/candidates",
     response_model=schemas.ElectionCandidatesResponse,
+    responses=MSGPACK_OPENAPI_RESPONSES,
 )
 async def get_polimoney_election_candidates(
     election_id: UUID,
-    supabase: Client = Depends(get_supabase_client_dep),
+    response: Response,
+    accept: str | None = Header(default=None),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
 ):
     """指定選挙の候補者（収支データ公開済み）一覧を取得する
 
     該当選挙に紐づく public_ledgers と政治家情報を返却する。
+    Accept で application/msgpack を求めた場合は MessagePack で返す。
 
     Args:
         election_id: 選挙ID
+        response: Vary ヘッダーを設定するレスポンス
+        accept: Accept ヘッダー
         supabase: Supabaseクライアント
 
     Returns:
@@ -106,32 +183,115 @@ async def get_polimoney_election_candidates(
     Raises:
         HTTPException: 候補者が見つからない、またはデータ取得に失敗した場合
     """
-    return build_election_candidates_response(supabase, election_id)
+    candidates = await build_election_candidates_response(supabase, election_id)
+    response.headers["Vary"] = "Accept"
+    if accepts_msgpack(accept):
+        return msgpack_response(candidates, response)
+    return candidates
 
 
 @router.get(
     "/ledgers/{ledger_id}/journals",
-    response_model=schemas.ElectionFundsResponse,
+    response_model=(
+        schemas.ElectionFundsResponse | schemas.ElectionFundsColumnarResponse
+    ),
+    responses={
+        **MSGPACK_OPENAPI_RESPONSES,
+        status.HTTP_304_NOT_MODIFIED: {"description": "ETag が一致"},
+    },
 )
 async def get_polimoney_ledger_journals(
     ledger_id: UUID,
-    supabase: Client = Depends(get_supabase_client_dep),
+    response: Response,
+    response_format: JournalFormat = Query(
+        default="rows",
+        alias="format",
+        description="仕訳データの形式（rows: 行形式、columnar: 列形式）",
+    ),
+    if_none_match: str | None = Header(default=None),
+    accept: str | None = Header(default=None),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
 ):
     """台帳IDを指定して収支データを Polimoney JSON 形式で取得する
 
     選挙台帳（election_id が設定されている台帳）のみ対応する。
+    レスポンスには ETag を付与し、If-None-Match が一致する場合は 304 を返す。
+    format=columnar を指定すると仕訳データを列形式で返す。
+    Accept で application/msgpack を求めた場合は MessagePack で返す。
 
     Args:
         ledger_id: 台帳ID（public_ledgers.id）
+        response: ETag ヘッダーを設定するレスポンス
+        response_format: 仕訳データの形式
+        if_none_match: If-None-Match ヘッダー
+        accept: Accept ヘッダー
         supabase: Supabaseクライアント
 
     Returns:
-        schemas.ElectionFundsResponse: 収支データ
+        schemas.ElectionFundsResponse | schemas.ElectionFundsColumnarResponse:
+            収支データ
 
     Raises:
         HTTPException:
             - 404: 台帳が存在しない場合
             - 400: 選挙台帳以外の場合
     """
-    ledger = fetch_election_ledger_or_raise(supabase, ledger_id)
-    return build_election_funds_response_for_ledger(supabase, ledger_id, ledger)
+    render = "msgpack" if accepts_msgpack(accept) else "json"
+    response.headers["Vary"] = "Accept"
+    ledger_data = await fetch_election_ledger_or_raise(supabase, ledger_id)
+    result = await build_conditional_ledger_response(
+        supabase,
+        ledger_id,
+        ledger_data,
+        "election",
+        if_none_match,
+        render=render,
+        response_format=response_format,
+    )
+    return conditional_response(
+        result.etag,
+        result.body,
+        response,
+        result.content,
+        RENDER_MEDIA_TYPES[render],
+        result.stream,
+    )
+
+
+@router.get(
+    "/journals/export",
+    response_class=StreamingResponse,
+    responses={
+        **NDJSON_OPENAPI_RESPONSES,
+        status.HTTP_400_BAD_REQUEST: {"description": "対象が指定されていない"},
+        status.HTTP_404_NOT_FOUND: {"description": "対象の台帳が無い"},
+    },
+)
+async def export_polimoney_journals(
+    election_id: UUID | None = Query(default=None, description="選挙ID"),
+    politician_id: UUID | None = Query(default=None, description="政治家ID"),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
+):
+    """選挙または政治家の全台帳の仕訳を NDJSON で一括エクスポートする
+
+    対象の台帳の仕訳を1行1件の JSON（JournalExportItem）で逐次出力する。
+    各行には ledger_id と正規化したカテゴリ・種別を含める。
+    election_id と politician_id の両方を指定した場合は両方に該当する台帳が対象。
+
+    Args:
+        election_id: 選挙ID
+        politician_id: 政治家ID
+        supabase: Supabaseクライアント
+
+    Returns:
+        StreamingResponse: application/x-ndjson のレスポンス
+
+    Raises:
+        HTTPException: 対象が指定されていない場合（400）、
+            対象の台帳が無い場合（404）
+    """
+    ledger_kinds = await fetch_export_ledger_kinds(supabase, election_id, politician_id)
+    return StreamingResponse(
+        iter_journals_ndjson(supabase, ledger_kinds),
+        media_type=NDJSON_MEDIA_TYPE,
+    )
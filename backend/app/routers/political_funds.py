@@ -3,178 +3,89 @@
 public_journalsとpublic_ledgersテーブルから政治資金データを取得する。
 """
 
-from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from supabase import Client
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from supabase import AsyncClient
 
 from app import schemas
 from app.database.supabase import get_supabase_client_dep
-from app.models.public_journals import PublicJournal
-from app.models.public_ledgers import PublicLedger
-from app.utils.category import derive_category, get_category_name
+from app.utils.http_cache import conditional_response
+from app.utils.journal_csv import CSV_OPENAPI_RESPONSES, ledger_csv_response
+from app.utils.ledger_response import (
+    LedgerResponseFormat,
+    build_conditional_ledger_response,
+    fetch_ledger_or_raise,
+)
 
 router = APIRouter()
 
 
 @router.get(
     "/political-funds/{ledger_id}",
-    response_model=schemas.PoliticalFundsResponse,
+    response_model=(
+        schemas.PoliticalFundsResponse | schemas.PoliticalFundsColumnarResponse
+    ),
+    responses={
+        **CSV_OPENAPI_RESPONSES,
+        status.HTTP_304_NOT_MODIFIED: {"description": "ETag が一致"},
+    },
 )
 async def get_political_funds_by_ledger_id(
     ledger_id: UUID,
-    supabase: Client = Depends(get_supabase_client_dep),
+    response: Response,
+    response_format: LedgerResponseFormat = Query(
+        default="rows",
+        alias="format",
+        description="仕訳データの形式（rows: 行形式、columnar: 列形式、csv: CSV）",
+    ),
+    if_none_match: str | None = Header(default=None),
+    supabase: AsyncClient = Depends(get_supabase_client_dep),
 ):
     """指定した台帳IDの政治資金データを取得する
 
     public_ledgersのIDを指定して、関連するpublic_journalsと
     政治団体情報、政治家情報を取得する。
+    レスポンスには ETag を付与し、If-None-Match が一致する場合は 304 を返す。
+    format=columnar を指定すると仕訳データを列形式で返す。
+    format=csv を指定すると仕訳のみを CSV で逐次出力する（ETag は付与しない）。
 
     Args:
         ledger_id: 台帳ID（public_ledgers.id）
+        response: ETag ヘッダーを設定するレスポンス
+        response_format: 仕訳データの形式
+        if_none_match: If-None-Match ヘッダー
         supabase: Supabaseクライアント
 
     Returns:
-        schemas.PoliticalFundsResponse: 政治資金データ
+        schemas.PoliticalFundsResponse | schemas.PoliticalFundsColumnarResponse:
+            政治資金データ（format=csv の場合は CSV の StreamingResponse）
 
     Raises:
         HTTPException: 指定されたデータが見つからない場合
             - 404: 台帳が存在しない場合、または政治団体の台帳でない場合
     """
-    # 1. public_ledgersを取得（organization_idがNULLでないことを確認）
-    ledger_response = (
-        supabase.table("public_ledgers")
-        .select("*")
-        .eq("id", str(ledger_id))
-        .not_.is_("organization_id", "null")
-        .single()
-        .execute()
-    )
-
-    if not ledger_response.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="政治資金の台帳が見つかりません",
-        )
-
-    ledger = PublicLedger(**ledger_response.data)
-
-    # 2. 政治家情報を取得
-    politician_response = (
-        supabase.table("politicians")
-        .select("id, name, name_kana")
-        .eq("id", str(ledger.politician_id))
-        .single()
-        .execute()
-    )
-
-    if not politician_response.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="政治家情報が見つかりません",
-        )
-
-    politician = schemas.PoliticianInfo(**politician_response.data)
-
-    # 3. 政治団体情報を取得
-    organization_response = (
-        supabase.table("organizations")
-        .select("id, name, type")
-        .eq("id", str(ledger.organization_id))
-        .single()
-        .execute()
-    )
-
-    if not organization_response.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="政治団体情報が見つかりません",
-        )
-
-    organization = schemas.OrganizationInfo(**organization_response.data)
-
-    # 4. public_journalsを取得
-    journals_response = (
-        supabase.table("public_journals")
-        .select("*")
-        .eq("ledger_id", str(ledger_id))
-        .order("date", desc=False)
-        .execute()
-    )
-
-    if not journals_response.data:
-        journals_data = []
-    else:
-        journals_data = journals_response.data
-
-    # 5. account_codesを一括取得（必要なaccount_codeのリストを作成）
-    account_codes_list = [
-        journal_data.get("account_code")
-        for journal_data in journals_data
-        if journal_data.get("account_code")
-    ]
-    account_codes_map = {}
-    if account_codes_list:
-        account_codes_response = (
-            supabase.table("account_codes")
-            .select("code, name")
-            .in_("code", account_codes_list)
-            .execute()
-        )
-        if account_codes_response.data:
-            account_codes_map = {
-                item["code"]: item["name"] for item in account_codes_response.data
-            }
-
-    # 6. データを変換
-    data_items = []
-    for journal_data in journals_data:
-        journal = PublicJournal(**journal_data)
-
-        # account_codeからcategoryを導出
-        category = derive_category(journal.account_code)
-        category_name = get_category_name(category)
-
-        # account_codesテーブルから取得した名前があれば使用
-        if journal.account_code and journal.account_code in account_codes_map:
-            category_name = account_codes_map[journal.account_code]
-
-        # public_expense_amountが0の場合はNoneにする
-        public_expense_amount = journal.public_expense_amount
-        if public_expense_amount == 0:
-            public_expense_amount = None
-
-        data_item = schemas.PoliticalFundsDataItem(
-            id=journal.id,
-            date=journal.date,
-            amount=journal.amount,
-            category=category,
-            category_name=category_name,
-            type="政治活動",
-            purpose=journal.description,
-            non_monetary_basis=journal.non_monetary_basis,
-            note=journal.note,
-            public_expense_amount=public_expense_amount,
-        )
-        data_items.append(data_item)
-
-    # 7. サマリー情報を作成
-    summary = schemas.PoliticalFundsSummary(
-        total_income=ledger.total_income,
-        total_expense=ledger.total_expense,
-        balance=ledger.total_income - ledger.total_expense,
-        journal_count=ledger.journal_count,
+    # 1. public_ledgersを政治家・政治団体の埋め込み付きで取得
+    #    （organization_idがNULLでないことを確認）
+    ledger_data = await fetch_ledger_or_raise(supabase, ledger_id, "organization")
+    if response_format == "csv":
+        return ledger_csv_response(supabase, ledger_id, "organization")
+
+    # 2. 仕訳・勘定科目を取得してレスポンスを作成
+    #    （ETag が一致する場合は仕訳を取得せずに 304 を返す）
+    result = await build_conditional_ledger_response(
+        supabase,
+        ledger_id,
+        ledger_data,
+        "organization",
+        if_none_match,
+        render="json",
+        response_format=response_format,
     )
-
-    # 8. メタ情報を作成
-    meta = schemas.PoliticalFundsMeta(
-        api_version="v1",
-        politician=politician,
-        organization=organization,
-        summary=summary,
-        generated_at=datetime.now(),
+    return conditional_response(
+        result.etag,
+        result.body,
+        response,
+        result.content,
+        stream=result.stream,
     )
-
-    # 9. レスポンスを作成
-    return schemas.PoliticalFundsResponse(meta=meta, data=data_items)
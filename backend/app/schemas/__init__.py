@@ -1,4 +1,5 @@
 # Schemas package
+from .columnar import *
 from .election_funds import *
 from .polimoney import *
 from .political_funds import *
@@ -0,0 +1,56 @@
+"""列形式（format=columnar）の仕訳データのスキーマ定義
+
+行形式ではフィールド名と、category などの少数の値が仕訳の件数だけ繰り返されるため、
+フィールドごとの配列と、値の種類が少ない列の辞書符号化で表す。
+"""
+
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class ColumnarJournalData(BaseModel):
+    """列形式の仕訳データ
+
+    columns の各配列は同じ長さで、i 番目の要素が行形式の data[i] に対応する。
+    dictionaries に含まれる列は、値ではなく辞書の添字（整数）を持つ。
+
+    Attributes:
+        count: 仕訳の件数
+        columns: 行形式と同じフィールド名をキーとした列
+        dictionaries: 辞書符号化した列の値の一覧
+    """
+
+    count: int
+    columns: dict[str, list[Any]]
+    dictionaries: dict[str, list[str]]
+
+    class Config:
+        """Pydantic設定"""
+
+        json_schema_extra = {
+            "example": {
+                "count": 3,
+                "columns": {
+                    "id": [
+                        "123e4567-e89b-12d3-a456-426614174000",
+                        "123e4567-e89b-12d3-a456-426614174001",
+                        "123e4567-e89b-12d3-a456-426614174002",
+                    ],
+                    "date": ["2026-01-10", "2026-01-29", None],
+                    "amount": [12000, 30605, 80000],
+                    "category": [0, 1, 2],
+                    "category_name": [0, 1, 2],
+                    "type": [0, 1, 1],
+                    "purpose": ["事前ビラ印刷", "車上運動員報酬", "選挙公報掲載"],
+                    "non_monetary_basis": [None, None, None],
+                    "note": ["備考あり", None, None],
+                    "public_expense_amount": [None, 30605, 80000],
+                },
+                "dictionaries": {
+                    "category": ["printing", "personnel", "advertising"],
+                    "category_name": ["印刷費", "人件費", "広告費"],
+                    "type": ["立候補準備", "選挙運動"],
+                },
+            }
+        }
@@ -10,6 +10,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.schemas.columnar import ColumnarJournalData
+
 
 class PoliticianInfo(BaseModel):
     """政治家情報
@@ -140,3 +142,15 @@ class ElectionFundsResponse(BaseModel):
 
     meta: ElectionFundsMeta
     data: list[ElectionFundsDataItem]
+
+
+class ElectionFundsColumnarResponse(BaseModel):
+    """選挙資金レスポンス（列形式）
+
+    Attributes:
+        meta: メタ情報
+        data: 列形式の仕訳データ
+    """
+
+    meta: ElectionFundsMeta
+    data: ColumnarJournalData
@@ -7,7 +7,7 @@ from datetime import date
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.election_funds import ElectionFundsSummary, PoliticianInfo
 
@@ -98,3 +98,41 @@ class MultipleCandidatesError(BaseModel):
 
     error: str
     candidates: list[CandidateRef]
+
+
+class JournalExportItem(BaseModel):
+    """仕訳エクスポート（NDJSON）の1行
+
+    フィールドは台帳の収支データの各項目に台帳IDを加えたもの。
+    type と public_expense_amount は台帳の種別（選挙・政治団体）に応じて導出する。
+
+    Attributes:
+        ledger_id: 台帳ID
+        data_id: データID（public_journals.id）
+        date: 日付
+        amount: 金額
+        category: カテゴリコード
+        category_name: カテゴリ名
+        type: 種別（選挙運動/立候補準備/政治活動）
+        purpose: 摘要
+        non_monetary_basis: 金銭以外の見積根拠
+        note: 備考
+        public_expense_amount: 公費負担額（0の場合は含めない）
+    """
+
+    ledger_id: UUID
+    data_id: UUID = Field(..., alias="id")
+    date: str | None = None
+    amount: int
+    category: str
+    category_name: str
+    type: str
+    purpose: str | None = None
+    non_monetary_basis: str | None = None
+    note: str | None = None
+    public_expense_amount: int | None = None
+
+    class Config:
+        """Pydantic設定"""
+
+        populate_by_name = True
@@ -10,19 +10,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-
-class PoliticianInfo(BaseModel):
-    """政治家情報
-
-    Attributes:
-        id: 政治家ID
-        name: 氏名
-        name_kana: 氏名（カナ）
-    """
-
-    id: UUID
-    name: str
-    name_kana: Optional[str] = None
+from app.schemas.columnar import ColumnarJournalData
+from app.schemas.election_funds import PoliticianInfo
 
 
 class OrganizationInfo(BaseModel):
@@ -130,3 +119,15 @@ class PoliticalFundsResponse(BaseModel):
 
     meta: PoliticalFundsMeta
     data: list[PoliticalFundsDataItem]
+
+
+class PoliticalFundsColumnarResponse(BaseModel):
+    """政治資金レスポンス（列形式）
+
+    Attributes:
+        meta: メタ情報
+        data: 列形式の仕訳データ
+    """
+
+    meta: PoliticalFundsMeta
+    data: ColumnarJournalData
@@ -5,6 +5,8 @@ account_codeからcategoryを導出するロジックを提供する。
 
 from typing import Literal
 
+from app.utils.master_data import get_master_data
+
 CategoryCode = Literal[
     "personnel",
     "building",
@@ -112,10 +114,15 @@ def get_category_name(category: str) -> str:
 def get_election_type_name(election_type: str) -> str:
     """選挙タイプコードから日本語名を取得する
 
+    マスタデータキャッシュ（election_types）を優先し、無い場合は定数を参照する。
+
     Args:
         election_type: 選挙タイプコード
 
     Returns:
         str: 選挙タイプ名（見つからない場合はそのまま返す）
     """
+    master_data = get_master_data()
+    if master_data is not None and election_type in master_data.election_type_names:
+        return master_data.election_type_names[election_type]
     return ELECTION_TYPE_NAMES.get(election_type, election_type)
@@ -0,0 +1,406 @@
+"""レスポンス圧縮のミドルウェア
+
+Accept-Encoding から brotli・zstd・gzip のいずれかを選び、一定サイズ以上の
+JSON などのレスポンスを圧縮する。brotli と zstd は該当パッケージ
+（brotli / zstandard）がインストールされている場合のみ使用する。
+
+強い ETag は同じ表現（バイト列）を指すため、ETag 付きのレスポンスの圧縮結果は
+(パス, エンコーディング, ETag) をキーに ledger_response_cache へ格納し、
+キャッシュから返すレスポンスを毎回圧縮し直さない。
+
+圧縮は同じ入力から同じ出力が得られる（gzip は mtime を固定する）ため、圧縮した
+レスポンスには ETag にエンコーディングを付けた強い ETag（"<tag>-gzip" など）を付ける。
+If-None-Match のこの接尾辞は外してからアプリケーションに渡し、304 の ETag には
+クライアントが送った圧縮後の ETag を付け直して、200 と 304 の ETag を揃える。
+"""
+
+import gzip
+import importlib
+import zlib
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.response_cache import LRUResponseCache, ledger_response_cache
+
+# エンコーディングごとの圧縮レベル（応答時間を優先し、最大圧縮にはしない）
+COMPRESSION_LEVELS = {"br": 5, "zstd": 3, "gzip": 6}
+
+# 圧縮対象のメディアタイプ（text/ は前方一致）
+COMPRESSIBLE_MEDIA_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "text/",
+)
+
+
+def _optional_module(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+brotli = _optional_module("brotli")
+zstandard = _optional_module("zstandard")
+
+
+def available_encodings() -> tuple[str, ...]:
+    """使用できるエンコーディングを優先順に取得する
+
+    Returns:
+        tuple[str, ...]: Content-Encoding の値（圧縮率の高い順）
+    """
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Accept-Encoding から使用するエンコーディングを選ぶ
+
+    q 値の最も高いものを選び、同じ q 値の場合はサーバー側の優先順に従う。
+    q=0 のものと、使用できないものは選ばない。
+
+    Args:
+        accept_encoding: リクエストの Accept-Encoding ヘッダー
+
+    Returns:
+        str | None: 選んだエンコーディング。圧縮しない場合は None
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(content: bytes, encoding: str) -> bytes:
+    """バイト列を一括で圧縮する
+
+    Args:
+        content: 圧縮するバイト列
+        encoding: エンコーディング（available_encodings() のいずれか）
+
+    Returns:
+        bytes: 圧縮したバイト列
+    """
+    level = COMPRESSION_LEVELS[encoding]
+    if encoding == "br":
+        return brotli.compress(content, quality=level)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(content)
+    # mtime を固定し、同じ入力から同じ出力が得られるようにする
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """圧縮後の表現を表す ETag を作成する
+
+    Args:
+        etag: 圧縮前の ETag
+        encoding: エンコーディング
+
+    Returns:
+        str: 引用符の内側の末尾にエンコーディングを付けた ETag
+    """
+    return etag.removesuffix('"') + f'-{encoding}"'
+
+
+def strip_encoded_etags(if_none_match: str, encoding: str) -> tuple[str, set[str]]:
+    """If-None-Match から圧縮後の ETag の接尾辞を外す
+
+    Args:
+        if_none_match: リクエストの If-None-Match ヘッダー
+        encoding: 今回のレスポンスで使うエンコーディング
+
+    Returns:
+        tuple[str, set[str]]: 接尾辞を外した If-None-Match と、
+            接尾辞を外した ETag（W/ 接頭辞を除く）の集合
+    """
+    suffix = f'-{encoding}"'
+    candidates = []
+    stripped: set[str] = set()
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.endswith(suffix):
+            candidate = candidate.removesuffix(suffix) + '"'
+            stripped.add(candidate.removeprefix("W/"))
+        candidates.append(candidate)
+    return ", ".join(candidates), stripped
+
+
+class StreamCompressor(Protocol):
+    """逐次圧縮のインターフェース
+
+    compress() は渡された断片をすべて出力に含める（フラッシュする）。
+    圧縮器の内部に溜めたままにすると、ストリーミングのレスポンスが
+    最後の断片まで届かなくなるため。
+    """
+
+    def compress(self, chunk: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _BrotliStreamCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b""
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStreamCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b""
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _GzipStreamCompressor:
+    def __init__(self, level: int):
+        # wbits=31 で gzip 形式のヘッダーとトレーラーを付ける
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if not chunk:
+            return b""
+        return self._compressor.compress(chunk) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def stream_compressor(encoding: str) -> StreamCompressor:
+    """逐次圧縮に使う圧縮器を作成する
+
+    Args:
+        encoding: エンコーディング（available_encodings() のいずれか）
+
+    Returns:
+        StreamCompressor: 圧縮器
+    """
+    level = COMPRESSION_LEVELS[encoding]
+    if encoding == "br":
+        return _BrotliStreamCompressor(level)
+    if encoding == "zstd":
+        return _ZstdStreamCompressor(level)
+    return _GzipStreamCompressor(level)
+
+
+def is_compressible(headers: Headers) -> bool:
+    """レスポンスが圧縮の対象かを判定する
+
+    Args:
+        headers: レスポンスヘッダー
+
+    Returns:
+        bool: 未圧縮かつ圧縮対象のメディアタイプの場合は True
+    """
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return content_type.startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+class CompressionMiddleware:
+    """Accept-Encoding に応じてレスポンスを圧縮する ASGI ミドルウェア
+
+    本体が1回で送られるレスポンスは minimum_size 以上の場合に一括で圧縮し、
+    ストリーミングのレスポンスはサイズによらず逐次圧縮する。
+
+    Attributes:
+        minimum_size: 圧縮する最小のバイト数
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache: LRUResponseCache = ledger_response_cache,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self._cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if scope.get("query_string"):
+            path = f"{path}?{scope['query_string'].decode('latin-1')}"
+
+        encoded_tags: set[str] = set()
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match:
+            if_none_match, encoded_tags = strip_encoded_etags(if_none_match, encoding)
+            scope = dict(scope)
+            request_headers = MutableHeaders(scope=scope)
+            request_headers["If-None-Match"] = if_none_match
+
+        responder = _CompressionResponder(
+            send, encoding, path, self.minimum_size, self._cache, encoded_tags
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        path: str,
+        minimum_size: int,
+        cache: LRUResponseCache,
+        encoded_tags: set[str],
+    ):
+        self._send = send
+        self._encoding = encoding
+        self._path = path
+        self._minimum_size = minimum_size
+        self._cache = cache
+        self._encoded_tags = encoded_tags
+        self._start_message: Message | None = None
+        self._compressor: StreamCompressor | None = None
+        self._passthrough = False
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        # 圧縮後のバイト列は元の表現と異なるため、エンコーディングごとの ETag にする
+        etag = headers.get("etag")
+        if etag is not None:
+            headers["ETag"] = encoded_etag(etag, self._encoding)
+
+    def _set_not_modified_etag(self, headers: MutableHeaders) -> None:
+        # クライアントが圧縮後の ETag で問い合わせた場合は、同じ ETag を返す
+        etag = headers.get("etag")
+        if etag is not None and etag.removeprefix("W/") in self._encoded_tags:
+            headers["ETag"] = encoded_etag(etag, self._encoding)
+        headers.add_vary_header("Accept-Encoding")
+
+    def _compress_whole(self, body: bytes, etag: str | None) -> bytes:
+        if etag is None or etag.startswith("W/"):
+            return compress(body, self._encoding)
+
+        key = ("compressed", self._path, self._encoding, etag)
+        compressed = self._cache.get(key)
+        if compressed is None:
+            compressed = compress(body, self._encoding)
+            self._cache.put(key, compressed, len(compressed))
+        return compressed
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if message["status"] == 304:
+                self._set_not_modified_etag(MutableHeaders(raw=message["headers"]))
+                self._passthrough = True
+                await self._send(message)
+                return
+            self._start_message = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is not None:
+            chunk = self._compressor.compress(body)
+            if not more_body:
+                chunk += self._compressor.finish()
+            if chunk or not more_body:
+                await self._send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": more_body,
+                    }
+                )
+            return
+
+        start_message = self._start_message
+        headers = MutableHeaders(raw=start_message["headers"])
+        if not is_compressible(headers) or (
+            not more_body and len(body) < self._minimum_size
+        ):
+            if is_compressible(headers):
+                headers.add_vary_header("Accept-Encoding")
+            self._passthrough = True
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        if not more_body:
+            compressed = self._compress_whole(body, headers.get("etag"))
+            self._set_encoding_headers(headers)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(start_message)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        self._compressor = stream_compressor(self._encoding)
+        self._set_encoding_headers(headers)
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        await self._send(start_message)
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": self._compressor.compress(body),
+                "more_body": True,
+            }
+        )
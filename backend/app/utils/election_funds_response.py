@@ -3,70 +3,50 @@
 public_ledgers と public_journals から ElectionFundsResponse を生成する。
 """
 
+import logging
 from datetime import datetime
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from supabase import Client
+from postgrest.exceptions import APIError
+from supabase import AsyncClient
 
 from app import schemas
-from app.models.public_journals import PublicJournal
-from app.models.public_ledgers import PublicLedger
-from app.utils.category import (
-    derive_category,
-    get_category_name,
-    get_election_type_name,
+from app.config import settings
+from app.utils.existence_index import (
+    election_definitely_missing,
+    election_known_present,
+    ledger_definitely_missing,
+)
+from app.utils.ledger_response import (
+    ELECTION_LEDGER_SELECT,
+    ConditionalLedgerResponse,
+    JournalFormat,
+    RenderFormat,
+    build_conditional_ledger_response,
+    build_election_meta_info,
+    fetch_ledger_or_raise,
+    fetch_ledger_row_coalesced,
+    render_body,
+    should_stream_ledger,
 )
 
+# 選挙資金レスポンスをサーバー側で組み立てる RPC 関数名
+# （db/migrate-add-election-funds-rpc.sql）
+ELECTION_FUNDS_RPC = "get_election_funds_response"
 
-def is_positive_public_expense(amount: int | None) -> bool:
-    """公費負担額が正の値かどうかを判定する
-
-    Args:
-        amount: 公費負担額
-
-    Returns:
-        bool: 正の値なら True
-    """
-    return amount is not None and amount > 0
-
-
-def normalize_public_expense_amount(amount: int | None) -> int | None:
-    """レスポンス用に公費負担額を正規化する
-
-    Args:
-        amount: 公費負担額
-
-    Returns:
-        int | None: 正の値のみ返却、それ以外は None
-    """
-    if is_positive_public_expense(amount):
-        return amount
-    return None
-
-
-def sum_public_expense_by_ledger(journals_data: list[dict]) -> dict[str, int]:
-    """仕訳データから台帳ごとの公費負担合計を算出する
+logger = logging.getLogger(__name__)
 
-    Args:
-        journals_data: public_journals の行リスト
 
-    Returns:
-        dict[str, int]: ledger_id をキーとした公費負担合計
-    """
-    totals: dict[str, int] = {}
-    for journal in journals_data:
-        ledger_id = journal.get("ledger_id")
-        amount = journal.get("public_expense_amount")
-        if not ledger_id or not is_positive_public_expense(amount):
-            continue
-        totals[ledger_id] = totals.get(ledger_id, 0) + amount
-    return totals
-
-
-def assert_election_exists(supabase: Client, election_id: UUID) -> None:
+async def assert_election_exists(
+    supabase: AsyncClient,
+    election_id: UUID,
+) -> None:
     """選挙が存在することを確認する
 
+    存在インデックスで存在を確認済みの選挙、および存在しないと判定できた選挙は
+    問い合わせない。
+
     Args:
         supabase: Supabaseクライアント
         election_id: 選挙ID
@@ -74,7 +54,17 @@ def assert_election_exists(supabase: Client, election_id: UUID) -> None:
     Raises:
         HTTPException: 選挙が見つからない場合（404）
     """
-    election_response = (
+    if await election_definitely_missing(supabase, election_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="選挙情報が見つかりません",
+        )
+
+    # ミス時の差分更新で取り込まれた選挙も、ここで問い合わせを省く
+    if election_known_present(election_id):
+        return
+
+    election_response = await (
         supabase.table("elections")
         .select("id")
         .eq("id", str(election_id))
@@ -82,21 +72,21 @@ def assert_election_exists(supabase: Client, election_id: UUID) -> None:
         .execute()
     )
 
-    if not election_response.data:
+    if election_response is None or not election_response.data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="選挙情報が見つかりません",
         )
 
 
-def fetch_election_ledger_or_raise(
-    supabase: Client,
+async def fetch_election_ledger_or_raise(
+    supabase: AsyncClient,
     ledger_id: UUID,
     *,
     not_found_detail: str = "台帳が見つかりません",
     non_election_detail: str = "選挙台帳以外は非対応です",
-) -> PublicLedger:
-    """台帳を取得し、選挙台帳であることを確認する
+) -> dict:
+    """台帳をメタ情報付きで取得し、選挙台帳であることを確認する
 
     Args:
         supabase: Supabaseクライアント
@@ -105,263 +95,161 @@ def fetch_election_ledger_or_raise(
         non_election_detail: 非選挙台帳時のエラーメッセージ
 
     Returns:
-        PublicLedger: 選挙台帳
+        dict: 選挙台帳の行（ELECTION_LEDGER_SELECT の埋め込みを含む）
 
     Raises:
         HTTPException: 台帳が存在しない（404）、または選挙台帳でない（400）
     """
-    ledger_response = (
-        supabase.table("public_ledgers")
-        .select("*")
-        .eq("id", str(ledger_id))
-        .maybe_single()
-        .execute()
+    if await ledger_definitely_missing(supabase, ledger_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found_detail,
+        )
+
+    ledger_data = await fetch_ledger_row_coalesced(
+        supabase, ledger_id, ELECTION_LEDGER_SELECT
     )
 
-    if not ledger_response.data:
+    if not ledger_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=not_found_detail,
         )
 
-    if ledger_response.data.get("election_id") is None:
+    if ledger_data.get("election_id") is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=non_election_detail,
         )
 
-    return PublicLedger(**ledger_response.data)
-
-
-def derive_type_from_classification(classification: str | None) -> str:
-    """classificationからtypeを導出する
-
-    Args:
-        classification: 活動区分（campaign/pre-campaign）
-
-    Returns:
-        str: 種別（選挙運動/立候補準備）
-    """
-    if classification == "campaign":
-        return "選挙運動"
-    if classification == "pre-campaign":
-        return "立候補準備"
-    return "選挙運動"
+    return ledger_data
 
 
-def build_election_funds_response_for_ledger(
-    supabase: Client,
+async def build_election_funds_response_via_rpc(
+    supabase: AsyncClient,
     ledger_id: UUID,
-    ledger: PublicLedger,
 ) -> schemas.ElectionFundsResponse:
-    """取得済みの選挙台帳から選挙資金レスポンスを組み立てる
+    """RPC 関数でサーバー側に組み立てさせた選挙資金レスポンスを取得する
+
+    カテゴリ導出・公費負担の正規化・並び順は Python 側の組み立てと同一の規則で
+    SQL 関数が行うため、ここではスキーマへの変換と404判定のみを行う。
 
     Args:
         supabase: Supabaseクライアント
         ledger_id: 台帳ID（public_ledgers.id）
-        ledger: 選挙台帳（election_id が設定済みであること）
 
     Returns:
         schemas.ElectionFundsResponse: 選挙資金データ
 
     Raises:
-        HTTPException: 関連データが見つからない場合（404）
+        HTTPException: 台帳・関連データが見つからない場合（404）
+        APIError: RPC 関数の呼び出しに失敗した場合
     """
-    politician_response = (
-        supabase.table("politicians")
-        .select("id, name, name_kana")
-        .eq("id", str(ledger.politician_id))
-        .maybe_single()
-        .execute()
-    )
+    rpc_response = await supabase.rpc(
+        ELECTION_FUNDS_RPC, {"p_ledger_id": str(ledger_id)}
+    ).execute()
 
-    if not politician_response.data:
+    payload = rpc_response.data
+    if not payload:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="政治家情報が見つかりません",
-        )
-
-    politician = schemas.PoliticianInfo(**politician_response.data)
-
-    election_response = (
-        supabase.table("elections")
-        .select("*")
-        .eq("id", str(ledger.election_id))
-        .maybe_single()
-        .execute()
-    )
-
-    if not election_response.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="選挙情報が見つかりません",
-        )
-
-    election_data = election_response.data
-
-    district_response = (
-        supabase.table("districts")
-        .select("id, name")
-        .eq("id", str(election_data["district_id"]))
-        .maybe_single()
-        .execute()
-    )
-
-    if not district_response.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="選挙区情報が見つかりません",
-        )
-
-    district_data = district_response.data
-
-    election_type_name = get_election_type_name(election_data["type"])
-    election_type_response = (
-        supabase.table("election_types")
-        .select("code, name")
-        .eq("code", election_data["type"])
-        .maybe_single()
-        .execute()
-    )
-
-    if election_type_response.data:
-        election_type_name = election_type_response.data.get("name", election_type_name)
-
-    election = schemas.ElectionInfo(
-        id=UUID(election_data["id"]),
-        name=election_data["name"],
-        type=election_data["type"],
-        type_name=election_type_name,
-        district_id=UUID(district_data["id"]),
-        district_name=district_data["name"],
-        election_date=election_data["election_date"],
-    )
-
-    journals_response = (
-        supabase.table("public_journals")
-        .select("*")
-        .eq("ledger_id", str(ledger_id))
-        .order("date", desc=False)
-        .execute()
-    )
-
-    journals_data = journals_response.data or []
-
-    account_codes_list = [
-        journal_data.get("account_code")
-        for journal_data in journals_data
-        if journal_data.get("account_code")
-    ]
-    account_codes_map: dict[str, str] = {}
-    if account_codes_list:
-        account_codes_response = (
-            supabase.table("account_codes")
-            .select("code, name")
-            .in_("code", account_codes_list)
-            .execute()
-        )
-        if account_codes_response.data:
-            account_codes_map = {
-                item["code"]: item["name"] for item in account_codes_response.data
-            }
-
-    data_items: list[schemas.ElectionFundsDataItem] = []
-    public_expense_totals = sum_public_expense_by_ledger(journals_data)
-    public_expense_total = public_expense_totals.get(str(ledger_id), 0)
-
-    for journal_data in journals_data:
-        journal = PublicJournal(**journal_data)
-
-        category = derive_category(journal.account_code)
-        category_name = get_category_name(category)
-
-        if journal.account_code and journal.account_code in account_codes_map:
-            category_name = account_codes_map[journal.account_code]
-
-        journal_type = derive_type_from_classification(journal.classification)
-        public_expense_amount = normalize_public_expense_amount(
-            journal.public_expense_amount
-        )
-
-        data_items.append(
-            schemas.ElectionFundsDataItem(
-                id=journal.id,
-                date=journal.date,
-                amount=journal.amount,
-                category=category,
-                category_name=category_name,
-                type=journal_type,
-                purpose=journal.description,
-                non_monetary_basis=journal.non_monetary_basis,
-                note=journal.note,
-                public_expense_amount=public_expense_amount,
-            )
+            detail="選挙資金の台帳が見つかりません",
         )
 
-    summary = schemas.ElectionFundsSummary(
-        total_income=ledger.total_income,
-        total_expense=ledger.total_expense,
-        balance=ledger.total_income - ledger.total_expense,
-        public_expense_total=public_expense_total,
-        journal_count=ledger.journal_count,
-    )
+    politician, election = build_election_meta_info(payload["ledger"])
 
     meta = schemas.ElectionFundsMeta(
         api_version="v1",
         politician=politician,
         election=election,
-        summary=summary,
+        summary=schemas.ElectionFundsSummary(**payload["summary"]),
         generated_at=datetime.now(),
     )
 
-    return schemas.ElectionFundsResponse(meta=meta, data=data_items)
+    return schemas.ElectionFundsResponse(meta=meta, data=payload["data"])
 
 
-def fetch_election_ledger_for_response(
-    supabase: Client,
+async def build_election_funds_conditional_response(
+    supabase: AsyncClient,
     ledger_id: UUID,
-) -> PublicLedger:
-    """選挙資金レスポンス用に台帳を取得する
-
-    存在しない台帳・非選挙台帳はいずれも404として扱う。
+    ledger_data: dict | None = None,
+    if_none_match: str | None = None,
+    render: RenderFormat | None = None,
+    response_format: JournalFormat = "rows",
+) -> ConditionalLedgerResponse:
+    """台帳IDから、条件付きリクエストを考慮して選挙資金レスポンスを組み立てる
+
+    ELECTION_FUNDS_RPC_ENABLED が有効な場合は RPC 関数による組み立てを優先し、
+    RPC 呼び出しに失敗した場合は Python 側の組み立てにフォールバックする。
+    RPC 関数は行形式のみを返すため、列形式は常に Python 側で組み立てる。
+    台帳がストリーミングの対象（should_stream_ledger）の場合も RPC は使わない。
+    RPC は仕訳をすべて1つの応答に含めるため、ledger_data が無い場合は先に台帳を
+    取得して仕訳件数を確認する。
+    ETag は Python 側で組み立てた場合のみ算出する。
 
     Args:
         supabase: Supabaseクライアント
-        ledger_id: 台帳ID
+        ledger_id: 台帳ID（public_ledgers.id）
+        ledger_data: 取得済みの選挙台帳の行（ELECTION_LEDGER_SELECT の形）。
+            指定した場合は Python 側の組み立てで台帳を再取得しない
+        if_none_match: リクエストの If-None-Match ヘッダー
+        render: レンダリング済みの本体を返す場合はその形式
+        response_format: 仕訳データの形式
 
     Returns:
-        PublicLedger: 選挙台帳
+        ConditionalLedgerResponse: ETag と選挙資金データ
 
     Raises:
-        HTTPException: 台帳が見つからない、または選挙台帳でない場合（404）
+        HTTPException: 台帳・関連データが見つからない場合（404）
     """
-    ledger_response = (
-        supabase.table("public_ledgers")
-        .select("*")
-        .eq("id", str(ledger_id))
-        .not_.is_("election_id", "null")
-        .maybe_single()
-        .execute()
-    )
-
-    if not ledger_response.data:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="選挙資金の台帳が見つかりません",
+    use_rpc = settings.election_funds_rpc_enabled and response_format == "rows"
+    if use_rpc:
+        # ストリーミングの対象の台帳は RPC で一括取得しない
+        if ledger_data is None:
+            ledger_data = await fetch_ledger_or_raise(supabase, ledger_id, "election")
+        use_rpc = not should_stream_ledger(
+            ledger_data.get("journal_count", 0), response_format, render
         )
 
-    return PublicLedger(**ledger_response.data)
+    if use_rpc:
+        try:
+            body = await build_election_funds_response_via_rpc(supabase, ledger_id)
+            return ConditionalLedgerResponse(
+                etag=None,
+                body=body,
+                content=render_body(body, render) if render is not None else None,
+            )
+        except APIError as exc:
+            logger.warning(
+                "Election funds RPC failed, falling back to Python builder: %s",
+                exc,
+            )
+
+    if ledger_data is None:
+        ledger_data = await fetch_ledger_or_raise(supabase, ledger_id, "election")
+    return await build_conditional_ledger_response(
+        supabase,
+        ledger_id,
+        ledger_data,
+        "election",
+        if_none_match,
+        render,
+        response_format,
+    )
 
 
-def build_election_funds_response(
-    supabase: Client,
+async def build_election_funds_response(
+    supabase: AsyncClient,
     ledger_id: UUID,
+    ledger_data: dict | None = None,
 ) -> schemas.ElectionFundsResponse:
     """台帳IDから選挙資金レスポンスを組み立てる
 
     Args:
         supabase: Supabaseクライアント
         ledger_id: 台帳ID（public_ledgers.id）
+        ledger_data: 取得済みの選挙台帳の行（ELECTION_LEDGER_SELECT の形）。
+            指定した場合は Python 側の組み立てで台帳を再取得しない
 
     Returns:
         schemas.ElectionFundsResponse: 選挙資金データ
@@ -369,5 +257,7 @@ def build_election_funds_response(
     Raises:
         HTTPException: 台帳・関連データが見つからない場合（404）
     """
-    ledger = fetch_election_ledger_for_response(supabase, ledger_id)
-    return build_election_funds_response_for_ledger(supabase, ledger_id, ledger)
+    result = await build_election_funds_conditional_response(
+        supabase, ledger_id, ledger_data
+    )
+    return result.body
@@ -0,0 +1,313 @@
+"""公開済み台帳・選挙の ID 存在インデックス
+
+存在しない UUID へのリクエストでも、404 を返すまでに Supabase への問い合わせが
+最低1回発生する。公開済みの台帳 ID と選挙 ID をプロセス内に保持し、
+インデックスに無い ID は問い合わせずに 404 を返す。
+
+インデックスは created_at を基準に差分で更新する。最後の更新より後に追加された ID を
+404 にしないよう、インデックスに無い ID は差分更新を行ってから判定し直す。
+この差分更新は同時に届いたリクエストで1回にまとめ、EXISTENCE_INDEX_MISS_REFRESH_INTERVAL
+秒に1回までに制限する。存在しない UUID が大量に届いても、Supabase への問い合わせは
+この間隔ごとの差分更新のみとなる。制限中に届いた ID は直前の更新結果で判定するため、
+追加直後の ID は最大でこの秒数の間 404 になりうる。
+
+削除は反映しない。インデックスに残った ID は従来どおり問い合わせて 404 になる。
+インデックスに含まれる選挙は存在確認のためだけの問い合わせも省くが、削除できる選挙には
+台帳が紐づかない（外部キー制約）ため、後続の台帳の問い合わせで 404 になる。
+最後の更新から EXISTENCE_INDEX_MAX_STALENESS 秒を超えた場合はインデックスを使わず問い合わせる。
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from supabase import AsyncClient
+
+from app.config import settings
+
+# インデックス対象のテーブル
+EXISTENCE_INDEX_TABLES = ("public_ledgers", "elections")
+
+# 1回の問い合わせで取得する行数（PostgREST の既定の上限に合わせる）
+EXISTENCE_INDEX_PAGE_SIZE = 1000
+
+# 差分取得時に遡る幅。長いトランザクションで created_at が
+# 前回の取得時点より前になった行を取りこぼさないようにする
+EXISTENCE_INDEX_OVERLAP = timedelta(minutes=10)
+
+logger = logging.getLogger(__name__)
+
+
+class ExistenceIndex:
+    """テーブルごとの ID 集合を保持し、差分で更新するインデックス
+
+    イベントループ上からのみ操作するため排他制御は行わない。
+
+    Attributes:
+        max_staleness: 最後の更新からインデックスを信頼する秒数
+        miss_refresh_interval: インデックスに無い ID による差分更新の最小間隔（秒）
+    """
+
+    def __init__(self, max_staleness: float, miss_refresh_interval: float):
+        self.max_staleness = max_staleness
+        self.miss_refresh_interval = miss_refresh_interval
+        self._ids: dict[str, set[str]] = {
+            table: set() for table in EXISTENCE_INDEX_TABLES
+        }
+        self._watermarks: dict[str, datetime | None] = {
+            table: None for table in EXISTENCE_INDEX_TABLES
+        }
+        self._refreshed_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+        self._miss_refresh_task: asyncio.Task | None = None
+        self._miss_refresh_started_at: float | None = None
+
+    def is_fresh(self) -> bool:
+        """インデックスが読み込み済みで、十分に新しいかを判定する
+
+        Returns:
+            bool: インデックスで判定してよい場合は True
+        """
+        return (
+            self._refreshed_at is not None
+            and time.monotonic() - self._refreshed_at < self.max_staleness
+        )
+
+    def known_present(self, table: str, id: UUID | str) -> bool:
+        """ID が存在することを確認済みかを判定する
+
+        インデックスが古い・未読み込みの場合や、最後の更新より後に追加された ID は
+        判定できないため False を返す。
+
+        Args:
+            table: テーブル名（EXISTENCE_INDEX_TABLES のいずれか）
+            id: 判定する ID
+
+        Returns:
+            bool: インデックスが新しく、かつ ID が含まれる場合は True
+        """
+        return self.is_fresh() and str(id) in self._ids[table]
+
+    async def definitely_missing(
+        self,
+        supabase: AsyncClient,
+        table: str,
+        id: UUID | str,
+    ) -> bool:
+        """ID が確実に存在しないかを判定する
+
+        インデックスに無い ID は、差分更新を行ってから判定し直す。
+        インデックスが古い・未読み込みの場合は判定できないため False を返す。
+
+        Args:
+            supabase: Supabaseクライアント（差分更新に使う）
+            table: テーブル名（EXISTENCE_INDEX_TABLES のいずれか）
+            id: 判定する ID
+
+        Returns:
+            bool: 差分更新後もインデックスが新しく、かつ ID が含まれない場合は True
+        """
+        if self._refreshed_at is None or str(id) in self._ids[table]:
+            return False
+
+        await self._refresh_on_miss(supabase)
+        return self.is_fresh() and str(id) not in self._ids[table]
+
+    async def _refresh_on_miss(self, supabase: AsyncClient) -> None:
+        task = self._miss_refresh_task
+        if task is None or task.done():
+            last_attempt = max(
+                started_at
+                for started_at in (self._refreshed_at, self._miss_refresh_started_at)
+                if started_at is not None
+            )
+            now = time.monotonic()
+            if now - last_attempt < self.miss_refresh_interval:
+                return
+            self._miss_refresh_started_at = now
+            task = asyncio.create_task(self.refresh(supabase))
+            task.add_done_callback(self._log_miss_refresh_failure)
+            self._miss_refresh_task = task
+
+        try:
+            # 待機側のキャンセルで、他のリクエストと共有する更新が中断されないようにする
+            await asyncio.shield(task)
+        except Exception:
+            # 失敗は _log_miss_refresh_failure で記録し、直前の更新結果で判定する
+            pass
+
+    @staticmethod
+    def _log_miss_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to refresh existence index: %s", task.exception())
+
+    async def _fetch_ids(
+        self,
+        supabase: AsyncClient,
+        table: str,
+        since: datetime | None,
+    ) -> list[dict]:
+        rows: list[dict] = []
+        offset = 0
+        while True:
+            query = supabase.table(table).select("id, created_at")
+            if since is not None:
+                query = query.gte("created_at", since.isoformat())
+            response = await (
+                query.order("created_at")
+                .order("id")
+                .range(offset, offset + EXISTENCE_INDEX_PAGE_SIZE - 1)
+                .execute()
+            )
+            page = response.data or []
+            rows.extend(page)
+            if len(page) < EXISTENCE_INDEX_PAGE_SIZE:
+                return rows
+            offset += EXISTENCE_INDEX_PAGE_SIZE
+
+    async def _refresh_table(self, supabase: AsyncClient, table: str) -> None:
+        watermark = self._watermarks[table]
+        since = None if watermark is None else watermark - EXISTENCE_INDEX_OVERLAP
+        rows = await self._fetch_ids(supabase, table, since)
+
+        self._ids[table].update(row["id"] for row in rows)
+        created = [
+            datetime.fromisoformat(row["created_at"])
+            for row in rows
+            if row.get("created_at")
+        ]
+        if created:
+            latest = max(created)
+            if watermark is None or latest > watermark:
+                self._watermarks[table] = latest
+
+    async def refresh(self, supabase: AsyncClient) -> None:
+        """前回以降に追加された ID を取り込む（初回は全件を読み込む）
+
+        Args:
+            supabase: Supabaseクライアント
+        """
+        await asyncio.gather(
+            *(self._refresh_table(supabase, table) for table in EXISTENCE_INDEX_TABLES)
+        )
+        self._refreshed_at = time.monotonic()
+
+    async def _refresh_loop(self, supabase: AsyncClient, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh(supabase)
+            except Exception:
+                # 更新できない間は max_staleness の経過後に問い合わせへ戻る
+                logger.exception("Failed to refresh existence index")
+
+    def start_refresh(self, supabase: AsyncClient, interval: float) -> None:
+        """バックグラウンドでの定期的な差分更新を開始する
+
+        Args:
+            supabase: Supabaseクライアント
+            interval: 差分更新の間隔（秒）
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(
+                self._refresh_loop(supabase, interval)
+            )
+
+    async def stop_refresh(self) -> None:
+        """バックグラウンドでの差分更新を停止する"""
+        if self._refresh_task is not None:
+            task = self._refresh_task
+            self._refresh_task = None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def clear(self) -> None:
+        """保持している ID と更新時刻を破棄する"""
+        for table in EXISTENCE_INDEX_TABLES:
+            self._ids[table].clear()
+            self._watermarks[table] = None
+        self._refreshed_at = None
+        self._miss_refresh_task = None
+        self._miss_refresh_started_at = None
+
+
+existence_index = ExistenceIndex(
+    settings.existence_index_max_staleness,
+    settings.existence_index_miss_refresh_interval,
+)
+
+
+def election_known_present(election_id: UUID) -> bool:
+    """選挙が存在することを確認済みかを判定する
+
+    Args:
+        election_id: 選挙ID
+
+    Returns:
+        bool: 存在確認の問い合わせを省いてよい場合は True
+    """
+    return existence_index.known_present("elections", election_id)
+
+
+async def ledger_definitely_missing(supabase: AsyncClient, ledger_id: UUID) -> bool:
+    """公開済みの台帳に ID が確実に存在しないかを判定する
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID
+
+    Returns:
+        bool: 問い合わせずに 404 としてよい場合は True
+    """
+    return await existence_index.definitely_missing(
+        supabase, "public_ledgers", ledger_id
+    )
+
+
+async def election_definitely_missing(
+    supabase: AsyncClient,
+    election_id: UUID,
+) -> bool:
+    """選挙に ID が確実に存在しないかを判定する
+
+    Args:
+        supabase: Supabaseクライアント
+        election_id: 選挙ID
+
+    Returns:
+        bool: 問い合わせずに 404 としてよい場合は True
+    """
+    return await existence_index.definitely_missing(supabase, "elections", election_id)
+
+
+async def start_existence_index(supabase: AsyncClient) -> None:
+    """ID を読み込み、バックグラウンドでの差分更新を開始する
+
+    アプリケーションの lifespan 開始時に呼び出す。EXISTENCE_INDEX_ENABLED が
+    無効な場合や読み込みに失敗した場合は、各処理は従来どおり問い合わせる。
+
+    Args:
+        supabase: Supabaseクライアント
+    """
+    if not settings.existence_index_enabled:
+        return
+
+    try:
+        await existence_index.refresh(supabase)
+    except Exception:
+        logger.exception("Failed to load existence index; falling back to queries")
+
+    existence_index.start_refresh(supabase, settings.existence_index_refresh_interval)
+
+
+async def stop_existence_index() -> None:
+    """バックグラウンドでの差分更新を停止する
+
+    アプリケーションの lifespan 終了時に呼び出す。
+    """
+    await existence_index.stop_refresh()
@@ -0,0 +1,115 @@
+"""HTTP の条件付きリクエスト（ETag / If-None-Match）のユーティリティ"""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from fastapi import Response, status
+from fastapi.responses import StreamingResponse
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match ヘッダーが ETag に一致するかを判定する
+
+    If-None-Match の比較は弱い比較（W/ 接頭辞を無視）で行う（RFC 9110 13.1.2）。
+
+    Args:
+        if_none_match: リクエストの If-None-Match ヘッダー
+        etag: 現在の ETag
+
+    Returns:
+        bool: 一致する場合は True
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    """304 Not Modified のレスポンスを作成する
+
+    Args:
+        etag: 現在の ETag
+
+    Returns:
+        Response: 本体を持たない 304 レスポンス
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag},
+    )
+
+
+def rendered_response(
+    etag: str | None,
+    content: bytes,
+    media_type: str = "application/json",
+) -> Response:
+    """レンダリング済みの本体をそのまま返すレスポンスを作成する
+
+    Response を直接返すと FastAPI は response_model による検証と変換を行わないため、
+    content は response_model と同じ形でレンダリングしておくこと。
+
+    Args:
+        etag: 強い ETag（算出していない場合は None）
+        content: レンダリング済みの本体
+        media_type: 本体のメディアタイプ
+
+    Returns:
+        Response: レンダリング済みの本体のレスポンス
+    """
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"ETag": etag} if etag is not None else None,
+    )
+
+
+def conditional_response(
+    etag: str | None,
+    body: Any | None,
+    response: Response,
+    content: bytes | None = None,
+    media_type: str = "application/json",
+    stream: AsyncIterator[bytes] | None = None,
+) -> Any:
+    """ETag と本体から、ルーターが返す値を決める
+
+    逐次出力する本体がある場合はストリーミングのレスポンスを返す。
+    レンダリング済みの本体がある場合はそれをそのまま返す。
+    本体も無い（If-None-Match が一致）場合は 304 を返し、
+    それ以外は ETag ヘッダーを付けて本体をそのまま返す。
+    Response を直接返す場合は、ルーターが response に設定したヘッダーを引き継ぐ。
+
+    Args:
+        etag: 強い ETag（算出していない場合は None）
+        body: レスポンス本体
+        response: ヘッダーを設定する FastAPI のレスポンス
+        content: レンダリング済みの本体
+        media_type: レンダリング済み・逐次出力する本体のメディアタイプ
+        stream: 本体を逐次出力するイテレーター
+
+    Returns:
+        Any: ストリーミングのレスポンス、レンダリング済みの本体のレスポンス、
+            304 レスポンス、またはレスポンス本体
+    """
+    if stream is not None:
+        raw_response = StreamingResponse(stream, media_type=media_type)
+    elif content is not None:
+        raw_response = rendered_response(etag, content, media_type)
+    elif body is None and etag is not None:
+        raw_response = not_modified_response(etag)
+    else:
+        if etag is not None:
+            response.headers["ETag"] = etag
+        return body
+
+    raw_response.headers.update(response.headers)
+    return raw_response
@@ -0,0 +1,132 @@
+"""台帳の仕訳の CSV 出力
+
+表計算ソフトで開くことを想定し、UTF-8（BOM 付き）・全フィールドを
+ダブルクオートで囲んだ CSV を出力する。文字列の先頭が = + - @ などの場合は
+数式として解釈されないよう先頭に ' を付ける。
+仕訳は JOURNAL_PAGE_SIZE 件ずつ取得して1ページごとに出力し、全件をまとめて保持しない。
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from supabase import AsyncClient
+
+from app.config import settings
+from app.utils.journal_stream import iter_journal_pages
+from app.utils.ledger_response import (
+    JOURNAL_RESPONSE_SELECT,
+    LEDGER_KIND_SPECS,
+    AccountCodeNames,
+    LedgerKind,
+    build_journal_data_rows,
+)
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+
+# OpenAPI に CSV の応答を記載するための responses
+CSV_OPENAPI_RESPONSES = {
+    200: {
+        "content": {
+            "text/csv": {
+                "schema": {
+                    "type": "string",
+                    "description": "format=csv の場合の仕訳データ（UTF-8 BOM 付き）",
+                }
+            }
+        }
+    }
+}
+
+# 表計算ソフトが数式として解釈する先頭文字
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# 台帳種別ごとのダウンロード時のファイル名の接頭辞
+CSV_FILENAME_PREFIXES: dict[LedgerKind, str] = {
+    "organization": "political-funds",
+    "election": "election-funds",
+}
+
+
+def escape_csv_value(value) -> str:
+    """値を CSV のフィールドに変換する
+
+    Args:
+        value: データ項目の値
+
+    Returns:
+        str: None は空文字、数式として解釈される文字列は先頭に ' を付けた文字列
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        if value.startswith(CSV_FORMULA_PREFIXES):
+            return "'" + value
+        return value
+    return str(value)
+
+
+async def iter_ledger_csv(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    kind: LedgerKind,
+) -> AsyncIterator[bytes]:
+    """台帳の仕訳を CSV として逐次出力する
+
+    列は台帳の収支データの各項目と同じ名前・順序とする。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        kind: 台帳種別
+
+    Yields:
+        bytes: CSV の断片（最初の断片は BOM とヘッダー行）
+    """
+    field_names = [
+        field.alias or name
+        for name, field in LEDGER_KIND_SPECS[kind].data_item_model.model_fields.items()
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+
+    writer.writerow(field_names)
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    account_code_names = AccountCodeNames()
+    async for journals_data in iter_journal_pages(
+        supabase, [ledger_id], JOURNAL_RESPONSE_SELECT, settings.journal_page_size
+    ):
+        account_codes_map = await account_code_names.resolve(supabase, journals_data)
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [escape_csv_value(row[field_name]) for field_name in field_names]
+            for row in build_journal_data_rows(journals_data, account_codes_map, kind)
+        )
+        yield buffer.getvalue().encode()
+
+
+def ledger_csv_response(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    kind: LedgerKind,
+) -> StreamingResponse:
+    """台帳の仕訳を CSV で逐次出力するレスポンスを作成する
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        kind: 台帳種別
+
+    Returns:
+        StreamingResponse: text/csv のレスポンス（添付ファイルとして保存される）
+    """
+    filename = f"{CSV_FILENAME_PREFIXES[kind]}-{ledger_id}.csv"
+    return StreamingResponse(
+        iter_ledger_csv(supabase, ledger_id, kind),
+        media_type=CSV_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
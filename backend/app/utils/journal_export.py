@@ -0,0 +1,141 @@
+"""仕訳の一括エクスポート（NDJSON）
+
+選挙または政治家に紐づくすべての台帳の仕訳を、1リクエストで1行1仕訳の
+NDJSON として出力する。対象の台帳を1回の問い合わせで求めたのち、
+(ledger_id, date, id) のキーセットで全台帳の仕訳をまとめてページング取得するため、
+台帳ごとのメタ情報の取得は行わず、保持する仕訳は1ページ分に収まる。
+各ページは public_journals(ledger_id, date, id) の複合インデックス
+（db/migrate-add-journals-keyset-index.sql）の範囲走査で取得できる。
+"""
+
+from collections.abc import AsyncIterator
+from itertools import groupby
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from supabase import AsyncClient
+
+from app import schemas
+from app.config import settings
+from app.utils.existence_index import election_definitely_missing
+from app.utils.journal_stream import iter_journal_pages
+from app.utils.ledger_response import (
+    JOURNAL_RESPONSE_SELECT,
+    AccountCodeNames,
+    LedgerKind,
+    build_journal_data_rows,
+)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# OpenAPI に NDJSON の応答を記載するための responses
+NDJSON_OPENAPI_RESPONSES = {
+    200: {
+        "content": {
+            NDJSON_MEDIA_TYPE: {
+                "schema": {
+                    "type": "string",
+                    "description": "1行に1件の JournalExportItem の JSON",
+                }
+            }
+        }
+    }
+}
+
+journal_export_items_adapter = TypeAdapter(list[schemas.JournalExportItem])
+
+
+async def fetch_export_ledger_kinds(
+    supabase: AsyncClient,
+    election_id: UUID | None,
+    politician_id: UUID | None,
+) -> dict[str, LedgerKind]:
+    """エクスポート対象の台帳と、その種別を取得する
+
+    election_id と politician_id の両方を指定した場合は両方に該当する台帳を対象にする。
+
+    Args:
+        supabase: Supabaseクライアント
+        election_id: 選挙ID
+        politician_id: 政治家ID
+
+    Returns:
+        dict[str, LedgerKind]: 台帳IDをキーとした台帳種別（台帳IDの昇順）
+
+    Raises:
+        HTTPException: どちらも指定されていない場合（400）、
+            対象の台帳が無い場合（404）
+    """
+    if election_id is None and politician_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="election_id または politician_id を指定してください",
+        )
+
+    if election_id is not None and await election_definitely_missing(
+        supabase, election_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="対象の台帳が見つかりません",
+        )
+
+    query = supabase.table("public_ledgers").select("id, election_id")
+    if election_id is not None:
+        query = query.eq("election_id", str(election_id))
+    if politician_id is not None:
+        query = query.eq("politician_id", str(politician_id))
+    ledgers_response = await query.order("id").execute()
+
+    ledgers = ledgers_response.data or []
+    if not ledgers:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="対象の台帳が見つかりません",
+        )
+
+    return {
+        ledger["id"]: "election" if ledger.get("election_id") else "organization"
+        for ledger in ledgers
+    }
+
+
+async def iter_journals_ndjson(
+    supabase: AsyncClient,
+    ledger_kinds: dict[str, LedgerKind],
+) -> AsyncIterator[bytes]:
+    """台帳の仕訳を NDJSON として逐次出力する
+
+    仕訳は台帳IDの順、台帳の中では収支データと同じ順（日付・ID）に並ぶ。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_kinds: 台帳IDをキーとした台帳種別
+
+    Yields:
+        bytes: 1ページ分の NDJSON の行
+    """
+    account_code_names = AccountCodeNames()
+    async for journals_data in iter_journal_pages(
+        supabase,
+        [UUID(ledger_id) for ledger_id in ledger_kinds],
+        JOURNAL_RESPONSE_SELECT,
+        settings.journal_page_size,
+    ):
+        account_codes_map = await account_code_names.resolve(supabase, journals_data)
+
+        # ページ内の仕訳は台帳ごとに連続するため、台帳の種別ごとに導出する
+        rows = []
+        for ledger_id, ledger_journals in groupby(
+            journals_data, key=lambda journal_data: journal_data["ledger_id"]
+        ):
+            for row in build_journal_data_rows(
+                list(ledger_journals), account_codes_map, ledger_kinds[ledger_id]
+            ):
+                row["ledger_id"] = ledger_id
+                rows.append(row)
+
+        items = journal_export_items_adapter.validate_python(rows)
+        yield b"".join(to_json(item, by_alias=True) + b"\n" for item in items)
@@ -0,0 +1,82 @@
+"""仕訳のキーセットページング取得
+
+仕訳の多い台帳を一括で取得すると、取得結果・変換後のモデル・エンコード後の本体が
+同時にメモリに載る。(date, id) のキーセットで public_journals を一定件数ずつ取得し、
+ページ単位で処理できるようにする。並び順は一括取得時と同じく日付の昇順
+（日付が無い仕訳は最後）、同じ日付の中では id の昇順とする。
+複数の台帳をまとめて取得する場合は ledger_id を先頭のキーに加え、台帳ごとに並べる。
+"""
+
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from supabase import AsyncClient
+
+
+def journal_keyset_filter(last_journal: dict, by_ledger: bool = False) -> str:
+    """直前のページの最後の仕訳より後ろを取得する or フィルターを作成する
+
+    Args:
+        last_journal: 直前のページの最後の仕訳（date と id、by_ledger の場合は
+            ledger_id も含む）
+        by_ledger: ledger_id を先頭のキーにする場合は True
+
+    Returns:
+        str: PostgREST の or フィルターの条件
+    """
+    journal_id = last_journal["id"]
+    date = last_journal.get("date")
+    if date is None:
+        # 日付の無い仕訳は最後に並ぶため、残りは日付が無く id が大きいもののみ
+        undated = f"date.is.null,id.gt.{journal_id}"
+        after = f"and({undated})"
+    else:
+        after = f"date.gt.{date},and(date.eq.{date},id.gt.{journal_id}),date.is.null"
+    if not by_ledger:
+        return after
+
+    ledger_id = last_journal["ledger_id"]
+    within_ledger = undated if date is None else f"or({after})"
+    return f"ledger_id.gt.{ledger_id},and(ledger_id.eq.{ledger_id},{within_ledger})"
+
+
+async def iter_journal_pages(
+    supabase: AsyncClient,
+    ledger_ids: list[UUID],
+    select: str,
+    page_size: int,
+) -> AsyncIterator[list[dict]]:
+    """台帳の仕訳を表示順にページ単位で取得する
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_ids: 台帳ID（public_ledgers.id）のリスト
+        select: 取得する列（date と id、複数の台帳の場合は ledger_id も含むこと）
+        page_size: 1ページの最大件数
+
+    Yields:
+        list[dict]: 空でない public_journals の行リスト
+    """
+    by_ledger = len(ledger_ids) > 1
+    last_journal: dict | None = None
+    while True:
+        query = supabase.table("public_journals").select(select)
+        if by_ledger:
+            query = query.in_("ledger_id", [str(ledger_id) for ledger_id in ledger_ids])
+        else:
+            query = query.eq("ledger_id", str(ledger_ids[0]))
+        if last_journal is not None:
+            query = query.or_(journal_keyset_filter(last_journal, by_ledger))
+        if by_ledger:
+            query = query.order("ledger_id")
+        response = await (
+            query.order("date", nullsfirst=False).order("id").limit(page_size).execute()
+        )
+
+        # PostgREST の max-rows により page_size より少ない件数で打ち切られる場合が
+        # あるため、件数ではなく空のページが返るまで取得する
+        page = response.data or []
+        if not page:
+            return
+        yield page
+        last_journal = page[-1]
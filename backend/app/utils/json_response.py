@@ -0,0 +1,35 @@
+"""JSON レスポンスクラスの選択
+
+ORJSON_RESPONSE_ENABLED が有効で orjson がインストールされている場合は、
+アプリケーション既定のレスポンスクラスを ORJSONResponse にする。
+response_model による変換（別名でのフィールド名・日時の文字列化）はどちらでも
+同じで、変換後の値を JSON のバイト列にする部分のみが orjson に置き換わる。
+"""
+
+import importlib.util
+import logging
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_default_response_class() -> type[JSONResponse]:
+    """アプリケーション既定のレスポンスクラスを取得する
+
+    Returns:
+        type[JSONResponse]: ORJSONResponse、または標準の JSONResponse
+    """
+    if not settings.orjson_response_enabled:
+        return JSONResponse
+
+    if importlib.util.find_spec("orjson") is None:
+        logger.warning(
+            "ORJSON_RESPONSE_ENABLED is set but orjson is not installed; "
+            "falling back to JSONResponse"
+        )
+        return JSONResponse
+
+    return ORJSONResponse
@@ -0,0 +1,1098 @@
+"""台帳レスポンス組み立てエンジン
+
+政治資金（政治団体の台帳）と選挙資金（選挙の台帳）のレスポンスを
+共通の手順で組み立てる。仕訳・勘定科目の取得、カテゴリ導出、行変換、
+サマリー・メタ情報の生成はここに集約し、各ルーターはこれを呼び出す。
+"""
+
+import hashlib
+import json
+import logging
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from supabase import AsyncClient
+
+from app import schemas
+from app.config import settings
+from app.models.public_ledgers import PublicLedger
+from app.utils.category import (
+    derive_category,
+    get_category_name,
+    get_election_type_name,
+)
+from app.utils.existence_index import ledger_definitely_missing
+from app.utils.http_cache import etag_matches
+from app.utils.journal_stream import iter_journal_pages
+from app.utils.master_data import get_master_data, get_master_data_version
+from app.utils.msgpack_response import MSGPACK_MEDIA_TYPE, pack_model
+from app.utils.response_cache import ledger_response_cache
+from app.utils.single_flight import SingleFlight
+
+LedgerKind = Literal["organization", "election"]
+
+# 仕訳データの形式（rows: 仕訳ごとのオブジェクトの配列、columnar: 列形式）
+JournalFormat = Literal["rows", "columnar"]
+
+# 台帳系エンドポイントの format（csv は仕訳のみを CSV で返す）
+LedgerResponseFormat = Literal["rows", "columnar", "csv"]
+
+# レンダリング済みの本体の形式とメディアタイプ
+RenderFormat = Literal["json", "msgpack"]
+RENDER_MEDIA_TYPES: dict[RenderFormat, str] = {
+    "json": "application/json",
+    "msgpack": MSGPACK_MEDIA_TYPE,
+}
+
+# 列形式で辞書符号化する、値の種類が少ない列
+COLUMNAR_DICTIONARY_FIELDS = ("category", "category_name", "type")
+
+# 台帳と、メタ情報に必要な政治家・政治団体を1回で取得する select
+POLITICAL_LEDGER_SELECT = """
+    *,
+    politicians:politician_id(id, name, name_kana),
+    organizations:organization_id(id, name, type)
+"""
+
+# 台帳と、メタ情報に必要な政治家・選挙・選挙区・選挙タイプを1回で取得する select
+# election_type は elections.type から election_types を引く computed relationship
+# （db/migrate-add-election-type-relationship.sql）を利用する
+ELECTION_LEDGER_SELECT = """
+    *,
+    politicians:politician_id(id, name, name_kana),
+    elections:election_id(
+        id,
+        name,
+        type,
+        election_date,
+        district:districts(id, name),
+        election_type(code, name)
+    )
+"""
+
+# レスポンスの組み立てに使う仕訳の列のみを取得する
+# （ledger_id は公費負担合計の集計、content_hash は ETag の算出に使用）
+JOURNAL_RESPONSE_SELECT = (
+    "id, ledger_id, date, description, amount, account_code, classification, "
+    "non_monetary_basis, note, public_expense_amount, content_hash"
+)
+
+# 仕訳から組み立てた部分の推定サイズを、取得した仕訳の JSON 表現の長さから求める倍率。
+# 5,000 件の仕訳で保持されるメモリ（データ項目の Pydantic モデルと文字列）を
+# tracemalloc で計測すると JSON 表現の 2.9〜3.9 倍（摘要が短いほど大きい）だったため、
+# 上限側に合わせる
+LEDGER_JOURNALS_SIZE_FACTOR = 4
+
+logger = logging.getLogger(__name__)
+
+# キャッシュミス時の仕訳の取得を同時リクエスト間で共有する
+ledger_journals_flight = SingleFlight(settings.single_flight_timeout)
+
+# 仕訳の取得に先立つ台帳の行の取得を同時リクエスト間で共有する
+ledger_lookup_flight = SingleFlight(settings.single_flight_timeout)
+
+
+@dataclass(frozen=True)
+class LedgerKindSpec:
+    """台帳種別ごとの取得条件
+
+    Attributes:
+        ledger_select: 台帳取得時の select（メタ情報の埋め込みを含む）
+        owner_column: 種別を判定する列（NULL でないことを条件にする）
+        not_found_detail: 台帳が見つからない場合のエラーメッセージ
+        data_item_model: データ項目のスキーマ
+        data_items_adapter: データ項目のリストをまとめて検証するアダプタ
+    """
+
+    ledger_select: str
+    owner_column: str
+    not_found_detail: str
+    data_item_model: type[
+        schemas.PoliticalFundsDataItem | schemas.ElectionFundsDataItem
+    ]
+    data_items_adapter: TypeAdapter
+
+
+LEDGER_KIND_SPECS: dict[LedgerKind, LedgerKindSpec] = {
+    "organization": LedgerKindSpec(
+        ledger_select=POLITICAL_LEDGER_SELECT,
+        owner_column="organization_id",
+        not_found_detail="政治資金の台帳が見つかりません",
+        data_item_model=schemas.PoliticalFundsDataItem,
+        data_items_adapter=TypeAdapter(list[schemas.PoliticalFundsDataItem]),
+    ),
+    "election": LedgerKindSpec(
+        ledger_select=ELECTION_LEDGER_SELECT,
+        owner_column="election_id",
+        not_found_detail="選挙資金の台帳が見つかりません",
+        data_item_model=schemas.ElectionFundsDataItem,
+        data_items_adapter=TypeAdapter(list[schemas.ElectionFundsDataItem]),
+    ),
+}
+
+
+def is_positive_public_expense(amount: int | None) -> bool:
+    """公費負担額が正の値かどうかを判定する
+
+    Args:
+        amount: 公費負担額
+
+    Returns:
+        bool: 正の値なら True
+    """
+    return amount is not None and amount > 0
+
+
+def normalize_public_expense_amount(amount: int | None) -> int | None:
+    """レスポンス用に公費負担額を正規化する
+
+    Args:
+        amount: 公費負担額
+
+    Returns:
+        int | None: 正の値のみ返却、それ以外は None
+    """
+    if is_positive_public_expense(amount):
+        return amount
+    return None
+
+
+def sum_public_expense_by_ledger(journals_data: list[dict]) -> dict[str, int]:
+    """仕訳データから台帳ごとの公費負担合計を算出する
+
+    Args:
+        journals_data: public_journals の行リスト
+
+    Returns:
+        dict[str, int]: ledger_id をキーとした公費負担合計
+    """
+    totals: dict[str, int] = {}
+    for journal in journals_data:
+        ledger_id = journal.get("ledger_id")
+        amount = journal.get("public_expense_amount")
+        if not ledger_id or not is_positive_public_expense(amount):
+            continue
+        totals[ledger_id] = totals.get(ledger_id, 0) + amount
+    return totals
+
+
+def derive_type_from_classification(classification: str | None) -> str:
+    """classificationからtypeを導出する
+
+    Args:
+        classification: 活動区分（campaign/pre-campaign）
+
+    Returns:
+        str: 種別（選挙運動/立候補準備）
+    """
+    if classification == "campaign":
+        return "選挙運動"
+    if classification == "pre-campaign":
+        return "立候補準備"
+    return "選挙運動"
+
+
+async def fetch_ledger_or_raise(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    kind: LedgerKind,
+) -> dict:
+    """指定した種別の台帳をメタ情報付きで取得する
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        kind: 台帳種別
+
+    Returns:
+        dict: 台帳の行（種別ごとの select の埋め込みを含む）
+
+    Raises:
+        HTTPException: 台帳が存在しない、または種別が異なる場合（404）
+    """
+    spec = LEDGER_KIND_SPECS[kind]
+    if await ledger_definitely_missing(supabase, ledger_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=spec.not_found_detail,
+        )
+
+    ledger_data = await fetch_ledger_row_coalesced(
+        supabase, ledger_id, spec.ledger_select, spec.owner_column
+    )
+
+    if not ledger_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=spec.not_found_detail,
+        )
+
+    return ledger_data
+
+
+async def fetch_ledger_row_coalesced(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    select: str,
+    owner_column: str | None = None,
+) -> dict | None:
+    """台帳の行の取得を、同じ台帳・select の同時リクエストで共有する
+
+    キャッシュミス時に同じ台帳へのリクエストが集中した場合も、仕訳の取得
+    （fetch_ledger_journals_coalesced）に先立つ台帳の問い合わせは1回になる。
+    返す行は共有されるため、呼び出し側で変更しないこと。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        select: 台帳の select
+        owner_column: 指定した場合は、この列が null でない台帳のみを対象にする
+
+    Returns:
+        dict | None: 台帳の行（見つからない場合は None）
+
+    Raises:
+        HTTPException: 待機が SINGLE_FLIGHT_TIMEOUT を超えた場合（504）
+    """
+
+    async def fetch() -> dict | None:
+        query = supabase.table("public_ledgers").select(select).eq("id", str(ledger_id))
+        if owner_column is not None:
+            query = query.not_.is_(owner_column, "null")
+        ledger_response = await query.maybe_single().execute()
+        return None if ledger_response is None else ledger_response.data
+
+    try:
+        return await ledger_lookup_flight.do(
+            (select, owner_column, str(ledger_id)), fetch
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="台帳データの取得がタイムアウトしました",
+        )
+
+
+async def fetch_journals_with_account_names(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+) -> tuple[list[dict], dict[str, str]]:
+    """台帳の仕訳と、仕訳が参照する勘定科目名を取得する
+
+    勘定科目は仕訳に依存するため、仕訳の取得後に必要なコードのみを一括取得する。
+    マスタデータキャッシュが読み込み済みの場合は勘定科目の問い合わせを行わない。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+
+    Returns:
+        tuple[list[dict], dict[str, str]]: 日付順の仕訳データと、
+            account_code をキーとした勘定科目名
+    """
+    journals_response = await (
+        supabase.table("public_journals")
+        .select(JOURNAL_RESPONSE_SELECT)
+        .eq("ledger_id", str(ledger_id))
+        .order("date", desc=False)
+        .order("id", desc=False)
+        .execute()
+    )
+
+    journals_data = journals_response.data or []
+
+    account_codes_map = await fetch_account_code_names(
+        supabase,
+        {
+            journal_data["account_code"]
+            for journal_data in journals_data
+            if journal_data.get("account_code")
+        },
+    )
+    return journals_data, account_codes_map
+
+
+async def fetch_account_code_names(
+    supabase: AsyncClient,
+    account_codes: set[str],
+) -> dict[str, str]:
+    """勘定科目コードに対応する勘定科目名を取得する
+
+    マスタデータキャッシュが読み込み済みの場合は問い合わせを行わない。
+
+    Args:
+        supabase: Supabaseクライアント
+        account_codes: 勘定科目コード
+
+    Returns:
+        dict[str, str]: account_code をキーとした勘定科目名（見つかったもののみ）
+    """
+    account_codes_list = sorted(account_codes)
+    master_data = get_master_data()
+    if master_data is not None:
+        # 起動時に読み込んだマスタデータがあれば問い合わせを省略する
+        return {
+            code: master_data.account_code_names[code]
+            for code in account_codes_list
+            if code in master_data.account_code_names
+        }
+    if not account_codes_list:
+        return {}
+
+    account_codes_response = await (
+        supabase.table("account_codes")
+        .select("code, name")
+        .in_("code", account_codes_list)
+        .execute()
+    )
+    return {item["code"]: item["name"] for item in account_codes_response.data or []}
+
+
+class AccountCodeNames:
+    """ページ単位で取得する仕訳の勘定科目名を蓄積する
+
+    ページに初めて現れた勘定科目コードのみを問い合わせる。
+
+    Attributes:
+        names: account_code をキーとした勘定科目名
+    """
+
+    def __init__(self):
+        self.names: dict[str, str] = {}
+        self._resolved: set[str] = set()
+
+    async def resolve(
+        self,
+        supabase: AsyncClient,
+        journals_data: list[dict],
+    ) -> dict[str, str]:
+        """仕訳が参照する勘定科目名を取得済みにする
+
+        Args:
+            supabase: Supabaseクライアント
+            journals_data: public_journals の行リスト
+
+        Returns:
+            dict[str, str]: これまでに取得した勘定科目名
+        """
+        new_codes = {
+            journal_data["account_code"]
+            for journal_data in journals_data
+            if journal_data.get("account_code")
+        } - self._resolved
+        if new_codes:
+            self.names.update(await fetch_account_code_names(supabase, new_codes))
+            self._resolved |= new_codes
+        return self.names
+
+
+def build_organization_meta_info(
+    ledger_data: dict,
+) -> tuple[schemas.PoliticianInfo, schemas.OrganizationInfo]:
+    """埋め込み取得した台帳データから政治家情報と政治団体情報を組み立てる
+
+    Args:
+        ledger_data: POLITICAL_LEDGER_SELECT で取得した public_ledgers の行
+
+    Returns:
+        tuple[schemas.PoliticianInfo, schemas.OrganizationInfo]: 政治家情報と政治団体情報
+
+    Raises:
+        HTTPException: 政治家・政治団体が見つからない場合（404）
+    """
+    politician_data = ledger_data.get("politicians")
+    if not politician_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="政治家情報が見つかりません",
+        )
+
+    organization_data = ledger_data.get("organizations")
+    if not organization_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="政治団体情報が見つかりません",
+        )
+
+    politician = schemas.PoliticianInfo(**politician_data)
+    organization = schemas.OrganizationInfo(**organization_data)
+    return politician, organization
+
+
+def build_election_meta_info(
+    ledger_data: dict,
+) -> tuple[schemas.PoliticianInfo, schemas.ElectionInfo]:
+    """埋め込み取得した台帳データから政治家情報と選挙情報を組み立てる
+
+    Args:
+        ledger_data: ELECTION_LEDGER_SELECT で取得した public_ledgers の行
+
+    Returns:
+        tuple[schemas.PoliticianInfo, schemas.ElectionInfo]: 政治家情報と選挙情報
+
+    Raises:
+        HTTPException: 政治家・選挙・選挙区が見つからない場合（404）
+    """
+    politician_data = ledger_data.get("politicians")
+    if not politician_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="政治家情報が見つかりません",
+        )
+
+    election_data = ledger_data.get("elections")
+    if not election_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="選挙情報が見つかりません",
+        )
+
+    district_data = election_data.get("district")
+    if not district_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="選挙区情報が見つかりません",
+        )
+
+    election_type_name = get_election_type_name(election_data["type"])
+    election_type_data = election_data.get("election_type")
+    if election_type_data:
+        election_type_name = election_type_data.get("name", election_type_name)
+
+    politician = schemas.PoliticianInfo(**politician_data)
+    election = schemas.ElectionInfo(
+        id=UUID(election_data["id"]),
+        name=election_data["name"],
+        type=election_data["type"],
+        type_name=election_type_name,
+        district_id=UUID(district_data["id"]),
+        district_name=district_data["name"],
+        election_date=election_data["election_date"],
+    )
+    return politician, election
+
+
+def build_journal_data_rows(
+    journals_data: list[dict],
+    account_codes_map: dict[str, str],
+    kind: LedgerKind,
+) -> list[dict]:
+    """仕訳データからデータ項目のフィールドを導出する
+
+    行ごとにモデルを作らず dict のまま導出し、検証は呼び出し側でまとめて行う。
+
+    Args:
+        journals_data: public_journals の行リスト
+        account_codes_map: account_code をキーとした勘定科目名
+        kind: 台帳種別
+
+    Returns:
+        list[dict]: データ項目の別名をキーとした dict のリスト
+    """
+    # 勘定科目ごとのカテゴリとカテゴリ名（同じ勘定科目の仕訳が多いため使い回す）
+    categories: dict[str | None, tuple[str, str]] = {}
+    is_election = kind == "election"
+
+    rows = []
+    for journal_data in journals_data:
+        account_code = journal_data.get("account_code")
+        category_pair = categories.get(account_code)
+        if category_pair is None:
+            # account_codeからcategoryを導出し、勘定科目名があれば優先する
+            category = derive_category(account_code)
+            category_name = get_category_name(category)
+            if account_code and account_code in account_codes_map:
+                category_name = account_codes_map[account_code]
+            category_pair = categories[account_code] = (category, category_name)
+
+        public_expense_amount = journal_data.get("public_expense_amount")
+        if is_election:
+            entry_type = derive_type_from_classification(
+                journal_data.get("classification")
+            )
+            public_expense_amount = normalize_public_expense_amount(
+                public_expense_amount
+            )
+        else:
+            entry_type = "政治活動"
+            # 政治資金では公費負担額が0の場合のみNoneにする
+            if public_expense_amount == 0:
+                public_expense_amount = None
+
+        rows.append(
+            {
+                "id": journal_data["id"],
+                "date": journal_data.get("date"),
+                "amount": journal_data["amount"],
+                "category": category_pair[0],
+                "category_name": category_pair[1],
+                "type": entry_type,
+                "purpose": journal_data.get("description"),
+                "non_monetary_basis": journal_data.get("non_monetary_basis"),
+                "note": journal_data.get("note"),
+                "public_expense_amount": public_expense_amount,
+            }
+        )
+    return rows
+
+
+def build_journal_data_items(
+    journals_data: list[dict],
+    account_codes_map: dict[str, str],
+    kind: LedgerKind,
+) -> list[schemas.PoliticalFundsDataItem] | list[schemas.ElectionFundsDataItem]:
+    """仕訳データをレスポンス用のデータ項目に変換する
+
+    Args:
+        journals_data: public_journals の行リスト
+        account_codes_map: account_code をキーとした勘定科目名
+        kind: 台帳種別
+
+    Returns:
+        list[schemas.PoliticalFundsDataItem] | list[schemas.ElectionFundsDataItem]:
+            種別に応じたデータ項目
+    """
+    rows = build_journal_data_rows(journals_data, account_codes_map, kind)
+    return LEDGER_KIND_SPECS[kind].data_items_adapter.validate_python(rows)
+
+
+def build_columnar_journal_data(
+    data_items: (
+        list[schemas.PoliticalFundsDataItem] | list[schemas.ElectionFundsDataItem]
+    ),
+    kind: LedgerKind,
+) -> schemas.ColumnarJournalData:
+    """データ項目を列形式に変換する
+
+    COLUMNAR_DICTIONARY_FIELDS の列は、出現順の値の一覧と添字の配列に符号化する。
+
+    Args:
+        data_items: 種別に応じたデータ項目
+        kind: 台帳種別
+
+    Returns:
+        schemas.ColumnarJournalData: 列形式の仕訳データ
+    """
+    spec = LEDGER_KIND_SPECS[kind]
+    rows = spec.data_items_adapter.dump_python(data_items, mode="json", by_alias=True)
+    # 仕訳が無い場合も列の一覧は行形式のフィールド名と揃える
+    field_names = [
+        field.alias or name for name, field in spec.data_item_model.model_fields.items()
+    ]
+
+    columns: dict[str, list] = {}
+    dictionaries: dict[str, list[str]] = {}
+    for field_name in field_names:
+        values = [row[field_name] for row in rows]
+        if field_name in COLUMNAR_DICTIONARY_FIELDS:
+            indexes: dict[str, int] = {}
+            columns[field_name] = [
+                indexes.setdefault(value, len(indexes)) for value in values
+            ]
+            dictionaries[field_name] = list(indexes)
+        else:
+            columns[field_name] = values
+
+    return schemas.ColumnarJournalData(
+        count=len(rows),
+        columns=columns,
+        dictionaries=dictionaries,
+    )
+
+
+def compute_public_expense_total(
+    ledger: PublicLedger,
+    journals_data: list[dict],
+) -> int:
+    """仕訳から公費負担合計を求め、台帳の集計列との乖離を記録する
+
+    Args:
+        ledger: 台帳
+        journals_data: 台帳の public_journals の行リスト
+
+    Returns:
+        int: 公費負担合計
+    """
+    public_expense_totals = sum_public_expense_by_ledger(journals_data)
+    public_expense_total = public_expense_totals.get(str(ledger.id), 0)
+    if public_expense_total != ledger.public_expense_total:
+        # 集計列はトリガーで維持される。仕訳から求めた値を正としつつ乖離を記録する
+        logger.warning(
+            "public_expense_total mismatch for ledger %s: stored=%s, computed=%s",
+            ledger.id,
+            ledger.public_expense_total,
+            public_expense_total,
+        )
+    return public_expense_total
+
+
+@dataclass(frozen=True)
+class LedgerJournals:
+    """台帳の仕訳から組み立てたレスポンスの部分
+
+    Attributes:
+        data_items: レスポンス用のデータ項目
+        public_expense_total: 公費負担合計（選挙台帳のみ）
+        digest: last_updated_at と仕訳の content_hash から求めたダイジェスト
+        generated_at: 組み立てた日時
+        master_data_version: 勘定科目名を引いたマスタデータのバージョン
+            （未読み込みの場合は None）
+    """
+
+    data_items: (
+        list[schemas.PoliticalFundsDataItem] | list[schemas.ElectionFundsDataItem]
+    )
+    public_expense_total: int | None
+    digest: str
+    generated_at: datetime
+    master_data_version: tuple[tuple[str, str], ...] | None = None
+
+
+@dataclass(frozen=True)
+class ConditionalLedgerResponse:
+    """条件付きリクエストを考慮した台帳レスポンス
+
+    body・content・stream がすべて None の場合は If-None-Match が一致したことを表す。
+
+    Attributes:
+        etag: 強い ETag（組み立てていない場合は None）
+        body: レスポンス本体。レンダリング済みの JSON を返す場合は None のことがある
+        content: レンダリング済みの本体（render を指定しなかった場合は None）
+        stream: 本体を逐次出力するイテレーター（ストリーミングする場合のみ）
+    """
+
+    etag: str | None
+    body: (
+        schemas.PoliticalFundsResponse
+        | schemas.ElectionFundsResponse
+        | schemas.PoliticalFundsColumnarResponse
+        | schemas.ElectionFundsColumnarResponse
+        | None
+    )
+    content: bytes | None = None
+    stream: AsyncIterator[bytes] | None = None
+
+
+def compute_journals_digest(last_updated_at: str, journals_data: list[dict]) -> str:
+    """台帳の更新日時と仕訳の content_hash からダイジェストを求める
+
+    Args:
+        last_updated_at: 台帳の最終更新日時
+        journals_data: 表示順の public_journals の行リスト
+
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    digest = hashlib.sha256(last_updated_at.encode())
+    for journal_data in journals_data:
+        digest.update(b"\0")
+        digest.update((journal_data.get("content_hash") or "").encode())
+    return digest.hexdigest()
+
+
+def compute_ledger_etag(
+    ledger_data: dict,
+    journals: LedgerJournals,
+    response_format: JournalFormat = "rows",
+    render_format: RenderFormat = "json",
+) -> str:
+    """台帳レスポンスの強い ETag を求める
+
+    仕訳のダイジェストに加え、台帳の行（埋め込んだメタ情報を含む）と
+    マスタデータのバージョンも対象にするため、政治家名などのメタ情報や
+    勘定科目名だけが変わった場合も ETag が変わる。
+    行形式の JSON 以外は表現が異なるため、形式も対象にする。
+
+    Args:
+        ledger_data: 種別ごとの select で取得した台帳の行
+        journals: 台帳の仕訳から組み立てたレスポンスの部分
+        response_format: 仕訳データの形式
+        render_format: 本体の形式
+
+    Returns:
+        str: ダブルクオートで囲んだ ETag
+    """
+    digest = hashlib.sha256(journals.digest.encode())
+    digest.update(json.dumps(ledger_data, sort_keys=True, default=str).encode())
+    digest.update(json.dumps(journals.master_data_version).encode())
+    if response_format != "rows":
+        digest.update(response_format.encode())
+    if render_format != "json":
+        digest.update(render_format.encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def ledger_journals_cache_key(
+    kind: LedgerKind,
+    ledger_id: UUID,
+    ledger: PublicLedger,
+) -> tuple:
+    """仕訳から組み立てた部分のキャッシュのキーを求める
+
+    勘定科目名はマスタデータから引くため、マスタデータのバージョンもキーに含める。
+
+    Args:
+        kind: 台帳種別
+        ledger_id: 台帳ID（public_ledgers.id）
+        ledger: 取得済みの台帳
+
+    Returns:
+        tuple: (台帳種別, 台帳ID, last_updated_at, マスタデータのバージョン)
+    """
+    return (kind, str(ledger_id), ledger.last_updated_at, get_master_data_version())
+
+
+async def fetch_ledger_journals(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    ledger: PublicLedger,
+    kind: LedgerKind,
+) -> LedgerJournals:
+    """台帳の仕訳を取得してレスポンスの部分を組み立て、キャッシュに格納する
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        ledger: 取得済みの台帳
+        kind: 台帳種別
+
+    Returns:
+        LedgerJournals: 仕訳から組み立てたデータ項目と公費負担合計
+    """
+    cache_key = ledger_journals_cache_key(kind, ledger_id, ledger)
+    journals_data, account_codes_map = await fetch_journals_with_account_names(
+        supabase, ledger_id
+    )
+    journals = LedgerJournals(
+        data_items=build_journal_data_items(journals_data, account_codes_map, kind),
+        public_expense_total=(
+            compute_public_expense_total(ledger, journals_data)
+            if kind == "election"
+            else None
+        ),
+        digest=compute_journals_digest(ledger.last_updated_at, journals_data),
+        generated_at=datetime.now(),
+        master_data_version=cache_key[-1],
+    )
+    ledger_response_cache.put(
+        cache_key,
+        journals,
+        len(to_json(journals_data)) * LEDGER_JOURNALS_SIZE_FACTOR,
+    )
+    return journals
+
+
+async def fetch_ledger_journals_coalesced(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    ledger: PublicLedger,
+    kind: LedgerKind,
+) -> LedgerJournals:
+    """キャッシュミス時の仕訳の取得を、同じ台帳・更新日時の同時リクエストで共有する
+
+    キーはキャッシュと同じ（ledger_journals_cache_key）のため、
+    同じ台帳を参照する別のエンドポイントとも1回の取得を共有する。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        ledger: 取得済みの台帳
+        kind: 台帳種別
+
+    Returns:
+        LedgerJournals: 仕訳から組み立てたデータ項目と公費負担合計
+
+    Raises:
+        HTTPException: 待機が SINGLE_FLIGHT_TIMEOUT を超えた場合（504）
+    """
+    try:
+        return await ledger_journals_flight.do(
+            ledger_journals_cache_key(kind, ledger_id, ledger),
+            lambda: fetch_ledger_journals(supabase, ledger_id, ledger, kind),
+        )
+    except TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="台帳データの取得がタイムアウトしました",
+        )
+
+
+def build_ledger_meta(
+    ledger: PublicLedger,
+    politician: schemas.PoliticianInfo,
+    owner: schemas.ElectionInfo | schemas.OrganizationInfo,
+    kind: LedgerKind,
+    public_expense_total: int | None,
+    generated_at: datetime,
+) -> schemas.ElectionFundsMeta | schemas.PoliticalFundsMeta:
+    """台帳と埋め込みのメタ情報からレスポンスのメタ情報を組み立てる
+
+    Args:
+        ledger: 台帳
+        politician: 政治家情報
+        owner: 選挙情報（選挙台帳）または政治団体情報（政治団体の台帳）
+        kind: 台帳種別
+        public_expense_total: 公費負担合計（選挙台帳のみ）
+        generated_at: 生成日時
+
+    Returns:
+        schemas.ElectionFundsMeta | schemas.PoliticalFundsMeta: 種別に応じたメタ情報
+    """
+    balance = ledger.total_income - ledger.total_expense
+    if kind == "election":
+        return schemas.ElectionFundsMeta(
+            api_version="v1",
+            politician=politician,
+            election=owner,
+            summary=schemas.ElectionFundsSummary(
+                total_income=ledger.total_income,
+                total_expense=ledger.total_expense,
+                balance=balance,
+                public_expense_total=public_expense_total,
+                journal_count=ledger.journal_count,
+            ),
+            generated_at=generated_at,
+        )
+    return schemas.PoliticalFundsMeta(
+        api_version="v1",
+        politician=politician,
+        organization=owner,
+        summary=schemas.PoliticalFundsSummary(
+            total_income=ledger.total_income,
+            total_expense=ledger.total_expense,
+            balance=balance,
+            journal_count=ledger.journal_count,
+        ),
+        generated_at=generated_at,
+    )
+
+
+def should_stream_ledger(
+    journal_count: int,
+    response_format: JournalFormat,
+    render: RenderFormat | None,
+) -> bool:
+    """台帳のレスポンスをストリーミングで返すかを判定する
+
+    ストリーミングは行形式の JSON をレンダリングして返す場合のみ行う。
+
+    Args:
+        journal_count: 台帳の仕訳件数（public_ledgers.journal_count）
+        response_format: 仕訳データの形式
+        render: レンダリング済みの本体を返す場合はその形式
+
+    Returns:
+        bool: 件数が LEDGER_STREAM_THRESHOLD を超える場合は True
+    """
+    threshold = settings.ledger_stream_threshold
+    return (
+        threshold > 0
+        and journal_count > threshold
+        and response_format == "rows"
+        and render == "json"
+    )
+
+
+async def iter_ledger_json(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    meta: schemas.ElectionFundsMeta | schemas.PoliticalFundsMeta,
+    kind: LedgerKind,
+) -> AsyncIterator[bytes]:
+    """台帳のレスポンスを行形式の JSON として逐次出力する
+
+    meta を先に出力し、data の配列は仕訳を JOURNAL_PAGE_SIZE 件ずつ取得・変換して
+    出力するため、1リクエストが保持する仕訳は1ページ分に収まる。
+    出力は一括で組み立てた場合の JSON と同じ形になる。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        meta: レスポンスのメタ情報
+        kind: 台帳種別
+
+    Yields:
+        bytes: JSON の断片
+    """
+    adapter = LEDGER_KIND_SPECS[kind].data_items_adapter
+    account_code_names = AccountCodeNames()
+
+    yield b'{"meta":' + to_json(meta, by_alias=True) + b',"data":['
+    separator = b""
+    async for journals_data in iter_journal_pages(
+        supabase, [ledger_id], JOURNAL_RESPONSE_SELECT, settings.journal_page_size
+    ):
+        account_codes_map = await account_code_names.resolve(supabase, journals_data)
+        data_items = build_journal_data_items(journals_data, account_codes_map, kind)
+        # 配列の角括弧を除き、ページをまたいで1つの配列として連結する
+        yield separator + adapter.dump_json(data_items, by_alias=True)[1:-1]
+        separator = b","
+    yield b"]}"
+
+
+def render_body(body: BaseModel, render_format: RenderFormat) -> bytes:
+    """レスポンス本体をバイト列にレンダリングする
+
+    Args:
+        body: レスポンス本体
+        render_format: 本体の形式
+
+    Returns:
+        bytes: JSON または MessagePack のバイト列
+    """
+    if render_format == "msgpack":
+        return pack_model(body)
+    # ルーターの response_model による変換と同じく別名で出力する
+    return to_json(body, by_alias=True)
+
+
+async def build_conditional_ledger_response(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    ledger_data: dict,
+    kind: LedgerKind,
+    if_none_match: str | None = None,
+    render: RenderFormat | None = None,
+    response_format: JournalFormat = "rows",
+) -> ConditionalLedgerResponse:
+    """取得済みの台帳から、条件付きリクエストを考慮してレスポンスを組み立てる
+
+    メタ情報は台帳取得時に埋め込み済みのため、追加で問い合わせるのは
+    仕訳と勘定科目のみ。仕訳由来の部分は (台帳種別, 台帳ID, last_updated_at,
+    マスタデータのバージョン) をキーにキャッシュされるため、台帳かマスタデータが
+    更新されるまでは問い合わせも変換も行わない。
+    キャッシュ済みで If-None-Match が ETag と一致する場合は本体を組み立てない。
+
+    仕訳がキャッシュに無く、件数が LEDGER_STREAM_THRESHOLD を超える台帳は
+    行形式の JSON を stream で逐次出力する（should_stream_ledger を参照）。
+    この場合は仕訳をすべて読むまで求まらない ETag は付与しない。
+
+    render を指定した場合は本体を JSON または MessagePack にレンダリングし、
+    (台帳種別, 形式, ETag) をキーにキャッシュする。ETag は台帳の行と仕訳の両方から
+    求めるため、同じ ETag のレンダリング結果は再利用でき、ヒット時は本体を組み立てない。
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        ledger_data: 種別ごとの select で取得した台帳の行
+        kind: 台帳種別
+        if_none_match: リクエストの If-None-Match ヘッダー
+        render: レンダリング済みの本体を返す場合はその形式
+        response_format: 仕訳データの形式
+
+    Returns:
+        ConditionalLedgerResponse: ETag と、種別・形式に応じたレスポンス本体、
+            またはストリーミングする本体
+
+    Raises:
+        HTTPException: 関連データが見つからない場合（404）
+    """
+    ledger = PublicLedger(**ledger_data)
+    if kind == "election":
+        politician, owner = build_election_meta_info(ledger_data)
+    else:
+        politician, owner = build_organization_meta_info(ledger_data)
+
+    journals = ledger_response_cache.get(
+        ledger_journals_cache_key(kind, ledger_id, ledger)
+    )
+    if journals is not None:
+        etag = compute_ledger_etag(
+            ledger_data, journals, response_format, render or "json"
+        )
+        if etag_matches(if_none_match, etag):
+            return ConditionalLedgerResponse(etag=etag, body=None)
+    elif should_stream_ledger(ledger.journal_count, response_format, render):
+        # 仕訳をすべて読み込まずに出力するため、公費負担合計は台帳の集計列を使う
+        meta = build_ledger_meta(
+            ledger,
+            politician,
+            owner,
+            kind,
+            ledger.public_expense_total if kind == "election" else None,
+            datetime.now(),
+        )
+        return ConditionalLedgerResponse(
+            etag=None,
+            body=None,
+            stream=iter_ledger_json(supabase, ledger_id, meta, kind),
+        )
+    else:
+        journals = await fetch_ledger_journals_coalesced(
+            supabase, ledger_id, ledger, kind
+        )
+        etag = compute_ledger_etag(
+            ledger_data, journals, response_format, render or "json"
+        )
+        if etag_matches(if_none_match, etag):
+            return ConditionalLedgerResponse(etag=etag, body=None)
+
+    if render:
+        content = ledger_response_cache.get(("rendered", kind, render, etag))
+        if content is not None:
+            return ConditionalLedgerResponse(etag=etag, body=None, content=content)
+
+    if response_format == "columnar":
+        data = build_columnar_journal_data(journals.data_items, kind)
+    else:
+        data = journals.data_items
+
+    # generated_at は仕訳から組み立てた日時とし、同じ ETag の本体を同一に保つ
+    meta = build_ledger_meta(
+        ledger,
+        politician,
+        owner,
+        kind,
+        journals.public_expense_total,
+        journals.generated_at,
+    )
+    if kind == "election":
+        if response_format == "columnar":
+            body = schemas.ElectionFundsColumnarResponse(meta=meta, data=data)
+        else:
+            body = schemas.ElectionFundsResponse(meta=meta, data=data)
+    else:
+        if response_format == "columnar":
+            body = schemas.PoliticalFundsColumnarResponse(meta=meta, data=data)
+        else:
+            body = schemas.PoliticalFundsResponse(meta=meta, data=data)
+
+    if render is None:
+        return ConditionalLedgerResponse(etag=etag, body=body)
+
+    content = render_body(body, render)
+    ledger_response_cache.put(("rendered", kind, render, etag), content, len(content))
+    return ConditionalLedgerResponse(etag=etag, body=body, content=content)
+
+
+async def build_ledger_response(
+    supabase: AsyncClient,
+    ledger_id: UUID,
+    ledger_data: dict,
+    kind: LedgerKind,
+) -> schemas.PoliticalFundsResponse | schemas.ElectionFundsResponse:
+    """取得済みの台帳から種別に応じたレスポンスを組み立てる
+
+    Args:
+        supabase: Supabaseクライアント
+        ledger_id: 台帳ID（public_ledgers.id）
+        ledger_data: 種別ごとの select で取得した台帳の行
+        kind: 台帳種別
+
+    Returns:
+        schemas.PoliticalFundsResponse | schemas.ElectionFundsResponse:
+            種別に応じたレスポンス
+
+    Raises:
+        HTTPException: 関連データが見つからない場合（404）
+    """
+    result = await build_conditional_ledger_response(
+        supabase, ledger_id, ledger_data, kind
+    )
+    return result.body
@@ -0,0 +1,207 @@
+"""マスタデータのプロセス内キャッシュ
+
+account_codes と election_types はほぼ更新されないため、lifespan 開始時に
+一括で読み込み、レスポンス組み立て時の問い合わせを省略する。
+更新は master_metadata の last_updated_at（バージョン）で検知し、
+バックグラウンドで再読み込みする。再読み込み中も直前のスナップショットを返す。
+
+districts は台帳取得時のリソース埋め込みで同じ問い合わせ内に解決されるため、
+キャッシュの対象に含めない。
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from supabase import AsyncClient
+
+from app.config import settings
+
+# キャッシュ対象のマスタテーブル（master_metadata.table_name）
+MASTER_DATA_TABLES = ("account_codes", "election_types")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MasterDataSnapshot:
+    """ある時点のマスタデータ
+
+    Attributes:
+        version: master_metadata の table_name をキーとした最終更新日時
+        account_code_names: 勘定科目コードをキーとした勘定科目名
+        election_type_names: 選挙タイプコードをキーとした選挙タイプ名
+    """
+
+    version: dict[str, str]
+    account_code_names: dict[str, str]
+    election_type_names: dict[str, str]
+
+
+class MasterDataCache:
+    """マスタデータのスナップショットを保持し、バージョン変更時に差し替えるキャッシュ
+
+    スナップショットは不変で、再読み込みが完了した時点で参照を差し替えるため、
+    読み取り側はロックなしで常に一貫したデータを参照できる。
+    """
+
+    def __init__(self):
+        self._snapshot: MasterDataSnapshot | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def snapshot(self) -> MasterDataSnapshot | None:
+        """現在のスナップショット（未読み込みの場合は None）"""
+        return self._snapshot
+
+    async def fetch_version(self, supabase: AsyncClient) -> dict[str, str]:
+        """master_metadata からキャッシュ対象テーブルの最終更新日時を取得する
+
+        Args:
+            supabase: Supabaseクライアント
+
+        Returns:
+            dict[str, str]: table_name をキーとした最終更新日時
+        """
+        response = await (
+            supabase.table("master_metadata")
+            .select("table_name, last_updated_at")
+            .in_("table_name", list(MASTER_DATA_TABLES))
+            .execute()
+        )
+        return {
+            row["table_name"]: row["last_updated_at"] for row in response.data or []
+        }
+
+    async def load(self, supabase: AsyncClient) -> MasterDataSnapshot:
+        """マスタテーブルを読み込み、スナップショットを差し替える
+
+        Args:
+            supabase: Supabaseクライアント
+
+        Returns:
+            MasterDataSnapshot: 読み込んだスナップショット
+        """
+        version, account_codes_response, election_types_response = await asyncio.gather(
+            self.fetch_version(supabase),
+            supabase.table("account_codes").select("code, name").execute(),
+            supabase.table("election_types").select("code, name").execute(),
+        )
+
+        snapshot = MasterDataSnapshot(
+            version=version,
+            account_code_names={
+                row["code"]: row["name"] for row in account_codes_response.data or []
+            },
+            election_type_names={
+                row["code"]: row["name"] for row in election_types_response.data or []
+            },
+        )
+        self._snapshot = snapshot
+        logger.info(
+            "Loaded master data: %d account codes, %d election types",
+            len(snapshot.account_code_names),
+            len(snapshot.election_type_names),
+        )
+        return snapshot
+
+    async def refresh_if_changed(self, supabase: AsyncClient) -> bool:
+        """バージョンが変わっていればマスタデータを再読み込みする
+
+        Args:
+            supabase: Supabaseクライアント
+
+        Returns:
+            bool: 再読み込みした場合は True
+        """
+        current = self._snapshot
+        if (
+            current is not None
+            and await self.fetch_version(supabase) == current.version
+        ):
+            return False
+
+        await self.load(supabase)
+        return True
+
+    async def _refresh_loop(self, supabase: AsyncClient, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_if_changed(supabase)
+            except Exception:
+                # 取得に失敗しても直前のスナップショットを使い続ける
+                logger.exception("Failed to refresh master data")
+
+    def start_refresh(self, supabase: AsyncClient, interval: float) -> None:
+        """バックグラウンドでの定期的なバージョン確認を開始する
+
+        Args:
+            supabase: Supabaseクライアント
+            interval: バージョン確認の間隔（秒）
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(
+                self._refresh_loop(supabase, interval)
+            )
+
+    async def stop_refresh(self) -> None:
+        """バックグラウンドでのバージョン確認を停止する"""
+        if self._refresh_task is not None:
+            task = self._refresh_task
+            self._refresh_task = None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+master_data_cache = MasterDataCache()
+
+
+def get_master_data() -> MasterDataSnapshot | None:
+    """現在のマスタデータのスナップショットを取得する
+
+    Returns:
+        MasterDataSnapshot | None: 未読み込みの場合は None
+    """
+    return master_data_cache.snapshot
+
+
+def get_master_data_version() -> tuple[tuple[str, str], ...] | None:
+    """現在のマスタデータのバージョンを、キャッシュのキーに使える形で取得する
+
+    Returns:
+        tuple[tuple[str, str], ...] | None: (table_name, 最終更新日時) の組。
+            未読み込みの場合は None
+    """
+    master_data = master_data_cache.snapshot
+    if master_data is None:
+        return None
+    return tuple(sorted(master_data.version.items()))
+
+
+async def start_master_data_cache(supabase: AsyncClient) -> None:
+    """マスタデータを読み込み、バックグラウンドでの再読み込みを開始する
+
+    アプリケーションの lifespan 開始時に呼び出す。読み込みに失敗しても
+    起動は継続し、各処理は従来どおり問い合わせで補う。
+
+    Args:
+        supabase: Supabaseクライアント
+    """
+    try:
+        await master_data_cache.load(supabase)
+    except Exception:
+        logger.exception("Failed to load master data; falling back to queries")
+
+    master_data_cache.start_refresh(supabase, settings.master_data_refresh_interval)
+
+
+async def stop_master_data_cache() -> None:
+    """バックグラウンドでの再読み込みを停止する
+
+    アプリケーションの lifespan 終了時に呼び出す。
+    """
+    await master_data_cache.stop_refresh()
@@ -0,0 +1,121 @@
+"""MessagePack レスポンスのユーティリティ
+
+Accept ヘッダーで application/msgpack を求めるクライアントには、JSON と同じ
+レスポンスモデルを MessagePack にエンコードして返す。整数はそのまま整数型、
+UUID は16バイトのバイナリ（bin 8）としてエンコードする。
+msgpack がインストールされていない場合は常に JSON を返す。
+"""
+
+import importlib
+from datetime import date, datetime
+from uuid import UUID
+
+from fastapi import Response
+from pydantic import BaseModel
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Accept で MessagePack を表すメディアタイプ
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+# OpenAPI に MessagePack の応答を記載するための responses
+MSGPACK_OPENAPI_RESPONSES = {
+    200: {
+        "content": {
+            MSGPACK_MEDIA_TYPE: {
+                "schema": {
+                    "type": "string",
+                    "format": "binary",
+                    "description": "application/json と同じ構造の MessagePack "
+                    "（UUID は16バイトのバイナリ）",
+                }
+            }
+        }
+    }
+}
+
+try:
+    msgpack = importlib.import_module("msgpack")
+except ImportError:
+    msgpack = None
+
+
+def _media_type_weights(accept: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for item in accept.split(","):
+        media_type, *params = item.strip().split(";")
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[media_type.strip().lower()] = weight
+    return weights
+
+
+def accepts_msgpack(accept: str | None) -> bool:
+    """Accept ヘッダーが JSON より MessagePack を優先しているかを判定する
+
+    Args:
+        accept: リクエストの Accept ヘッダー
+
+    Returns:
+        bool: MessagePack で返す場合は True
+    """
+    if msgpack is None or not accept:
+        return False
+
+    weights = _media_type_weights(accept)
+    msgpack_weight = max(
+        weights.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES
+    )
+    json_weight = max(
+        weights.get("application/json", 0.0),
+        weights.get("application/*", 0.0),
+        weights.get("*/*", 0.0),
+    )
+    return msgpack_weight > 0 and msgpack_weight >= json_weight
+
+
+def _encode_extension(value):
+    if isinstance(value, UUID):
+        return value.bytes
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} as MessagePack")
+
+
+def pack_model(body: BaseModel) -> bytes:
+    """レスポンスモデルを MessagePack にエンコードする
+
+    フィールド名は JSON と同じく別名を使う。
+
+    Args:
+        body: レスポンスモデル
+
+    Returns:
+        bytes: MessagePack のバイト列
+    """
+    return msgpack.packb(
+        body.model_dump(mode="python", by_alias=True),
+        default=_encode_extension,
+        use_bin_type=True,
+    )
+
+
+def msgpack_response(body: BaseModel, response: Response) -> Response:
+    """レスポンスモデルから MessagePack のレスポンスを作成する
+
+    Args:
+        body: レスポンスモデル
+        response: ルーターがヘッダーを設定したレスポンス（ヘッダーを引き継ぐ）
+
+    Returns:
+        Response: application/msgpack のレスポンス
+    """
+    packed = Response(content=pack_model(body), media_type=MSGPACK_MEDIA_TYPE)
+    packed.headers.update(response.headers)
+    return packed
@@ -6,13 +6,28 @@
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from supabase import Client
+from supabase import AsyncClient
 
 from app import schemas
-from app.utils.election_funds_response import (
-    assert_election_exists,
-    sum_public_expense_by_ledger,
-)
+from app.config import settings
+from app.utils.election_funds_response import assert_election_exists
+from app.utils.existence_index import election_definitely_missing
+from app.utils.swr_cache import StaleWhileRevalidateCache
+
+# 選挙と、その選挙の台帳（政治家の埋め込み付き）を1回で取得する select
+# 台帳の行に elections を戻すと ELECTION_LEDGER_SELECT と同じ形になる
+ELECTION_WITH_LEDGERS_SELECT = """
+    id,
+    name,
+    type,
+    election_date,
+    district:districts(id, name),
+    election_type(code, name),
+    public_ledgers(
+        *,
+        politicians:politician_id(id, name, name_kana)
+    )
+"""
 
 
 class MultipleCandidatesException(Exception):
@@ -27,17 +42,15 @@ class MultipleCandidatesException(Exception):
 
 
 def build_election_list_item(election_data: dict) -> schemas.ElectionListItem:
-    """Supabaseの選挙データを一覧用レスポンスに変換する
+    """公開済み選挙ビューの行を一覧用レスポンスに変換する
 
     Args:
-        election_data: elections テーブルの行（district ネスト含む）
+        election_data: published_elections ビューの行
 
     Returns:
         schemas.ElectionListItem: 選挙一覧の1件
     """
-    district = election_data.get("district") or {}
-    district_id = district.get("id")
-    district_name = district.get("name")
+    district_id = election_data.get("district_id")
 
     return schemas.ElectionListItem(
         id=UUID(election_data["id"]),
@@ -45,7 +58,7 @@ def build_election_list_item(election_data: dict) -> schemas.ElectionListItem:
         type=election_data["type"],
         election_date=election_data["election_date"],
         district_id=UUID(district_id) if district_id else None,
-        district_name=district_name,
+        district_name=election_data.get("district_name"),
     )
 
 
@@ -82,9 +95,14 @@ def build_candidate_list_item(
     )
 
 
-def build_elections_list_response(supabase: Client) -> schemas.ElectionsListResponse:
+async def build_elections_list_response(
+    supabase: AsyncClient,
+) -> schemas.ElectionsListResponse:
     """公開済み選挙一覧レスポンスを組み立てる
 
+    published_elections ビューが選挙ごとに1件・選挙日の降順で返すため、
+    台帳の走査や重複除去は行わない。
+
     Args:
         supabase: Supabaseクライアント
 
@@ -94,41 +112,24 @@ def build_elections_list_response(supabase: Client) -> schemas.ElectionsListResp
     Raises:
         HTTPException: データ取得に失敗した場合
     """
-    ledgers_response = (
-        supabase.table("public_ledgers")
-        .select(
-            """
-            election_id,
-            elections:election_id(
-                id,
-                name,
-                type,
-                election_date,
-                district:districts(id, name)
-            )
-            """
-        )
-        .not_.is_("election_id", "null")
+    elections_response = await (
+        supabase.table("published_elections")
+        .select("id, name, type, election_date, district_id, district_name")
+        .order("election_date", desc=True)
+        .order("id", desc=False)
         .execute()
     )
 
-    if ledgers_response.data is None:
+    if elections_response.data is None:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="選挙一覧の取得に失敗しました",
         )
 
-    election_map: dict[str, dict] = {}
-    for ledger in ledgers_response.data:
-        election_data = ledger.get("elections")
-        if election_data and election_data["id"] not in election_map:
-            election_map[election_data["id"]] = election_data
-
     elections = [
         build_election_list_item(election_data)
-        for election_data in election_map.values()
+        for election_data in elections_response.data
     ]
-    elections.sort(key=lambda e: e.election_date, reverse=True)
 
     return schemas.ElectionsListResponse(
         data=elections,
@@ -136,12 +137,46 @@ def build_elections_list_response(supabase: Client) -> schemas.ElectionsListResp
     )
 
 
-def resolve_ledger_for_election(
-    supabase: Client,
+elections_list_cache: StaleWhileRevalidateCache[schemas.ElectionsListResponse] = (
+    StaleWhileRevalidateCache(
+        settings.elections_list_cache_ttl,
+        settings.elections_list_stale_while_revalidate,
+    )
+)
+
+
+async def get_elections_list_response(
+    supabase: AsyncClient,
+) -> schemas.ElectionsListResponse:
+    """公開済み選挙一覧レスポンスをスナップショットから取得する
+
+    TTL（ELECTIONS_LIST_CACHE_TTL）を過ぎたスナップショットは古いまま返し、
+    バックグラウンドで再取得する。さらに ELECTIONS_LIST_STALE_WHILE_REVALIDATE 秒を
+    過ぎたスナップショットは返さず、データベースへの問い合わせを待つ。
+
+    Args:
+        supabase: Supabaseクライアント
+
+    Returns:
+        schemas.ElectionsListResponse: 公開済み選挙一覧
+
+    Raises:
+        HTTPException: 問い合わせを待った場合に、データ取得に失敗したとき
+    """
+    return await elections_list_cache.get(
+        lambda: build_elections_list_response(supabase)
+    )
+
+
+async def resolve_election_ledger(
+    supabase: AsyncClient,
     election_id: UUID,
     politician_id: UUID | None,
-) -> UUID:
-    """選挙IDから対象台帳IDを解決する
+) -> dict:
+    """選挙IDから対象台帳をメタ情報付きで解決する
+
+    選挙の存在確認・候補者の絞り込み・台帳の取得を、選挙を起点とした
+    リソース埋め込みの1回の問い合わせで行う。
 
     Args:
         supabase: Supabaseクライアント
@@ -149,32 +184,40 @@ def resolve_ledger_for_election(
         politician_id: 政治家ID（複数候補時は必須）
 
     Returns:
-        UUID: 解決された台帳ID
+        dict: 解決された台帳の行（ELECTION_LEDGER_SELECT と同じ形）
 
     Raises:
         HTTPException: 選挙・台帳が見つからない場合（404）
         MultipleCandidatesException: 複数候補者かつ politician_id 未指定（400）
     """
-    assert_election_exists(supabase, election_id)
+    if await election_definitely_missing(supabase, election_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="選挙情報が見つかりません",
+        )
 
-    ledger_query = (
-        supabase.table("public_ledgers")
-        .select("id, politician_id")
-        .eq("election_id", str(election_id))
+    election_query = (
+        supabase.table("elections")
+        .select(ELECTION_WITH_LEDGERS_SELECT)
+        .eq("id", str(election_id))
     )
 
     if politician_id is not None:
-        ledger_query = ledger_query.eq("politician_id", str(politician_id))
+        # 埋め込み側のみを絞り込む（選挙の行は候補者がいなくても返る）
+        election_query = election_query.eq(
+            "public_ledgers.politician_id", str(politician_id)
+        )
 
-    ledgers_response = ledger_query.execute()
+    election_response = await election_query.maybe_single().execute()
 
-    if ledgers_response.data is None:
+    if election_response is None or not election_response.data:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="選挙収支データの取得に失敗しました",
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="選挙情報が見つかりません",
         )
 
-    ledgers = ledgers_response.data
+    election_data = dict(election_response.data)
+    ledgers = election_data.pop("public_ledgers", None) or []
 
     if len(ledgers) == 0:
         raise HTTPException(
@@ -196,11 +239,11 @@ def resolve_ledger_for_election(
             )
         )
 
-    return UUID(ledgers[0]["id"])
+    return {**ledgers[0], "elections": election_data}
 
 
-def build_election_candidates_response(
-    supabase: Client,
+async def build_election_candidates_response(
+    supabase: AsyncClient,
     election_id: UUID,
 ) -> schemas.ElectionCandidatesResponse:
     """選挙候補者一覧レスポンスを組み立てる
@@ -215,9 +258,9 @@ def build_election_candidates_response(
     Raises:
         HTTPException: 候補者が見つからない、またはデータ取得に失敗した場合
     """
-    assert_election_exists(supabase, election_id)
+    await assert_election_exists(supabase, election_id)
 
-    ledgers_response = (
+    ledgers_response = await (
         supabase.table("public_ledgers")
         .select(
             """
@@ -226,6 +269,7 @@ def build_election_candidates_response(
             total_income,
             total_expense,
             journal_count,
+            public_expense_total,
             politicians:politician_id(id, name, name_kana)
             """
         )
@@ -246,27 +290,11 @@ def build_election_candidates_response(
             detail="該当選挙の候補者が見つかりません",
         )
 
-    ledger_ids = [ledger["id"] for ledger in ledgers]
-    journals_response = (
-        supabase.table("public_journals")
-        .select("ledger_id, public_expense_amount")
-        .in_("ledger_id", ledger_ids)
-        .execute()
-    )
-
-    if journals_response.data is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="候補者一覧の取得に失敗しました",
-        )
-
-    public_expense_totals = sum_public_expense_by_ledger(journals_response.data)
-
     candidates: list[schemas.CandidateListItem] = []
     for ledger in ledgers:
         item = build_candidate_list_item(
             ledger,
-            public_expense_totals.get(ledger["id"], 0),
+            ledger.get("public_expense_total") or 0,
         )
         if item is not None:
             candidates.append(item)
@@ -0,0 +1,121 @@
+"""台帳レスポンスのプロセス内キャッシュ
+
+台帳の仕訳は同期時にのみ変わり、その際 public_ledgers.last_updated_at が更新される
+（仕訳の変更は db/migrate-touch-ledger-on-journal-change.sql のトリガーで反映）。
+そのため (台帳種別, 台帳ID, last_updated_at) をキーにすれば、古いエントリを
+明示的に無効化しなくても、更新後のリクエストは新しいキーで組み立て直される。
+勘定科目名を引くマスタデータのバージョンも同様にキーへ含める。
+レンダリング済みの JSON も ETag をキーに同じキャッシュへ格納する。
+"""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """キャッシュの統計情報
+
+    Attributes:
+        hits: ヒット数
+        misses: ミス数
+        evictions: 容量超過による追い出し数
+        entries: 保持しているエントリ数
+        size_bytes: 保持しているエントリの推定サイズ合計（バイト）
+        max_bytes: 推定サイズの上限（バイト）
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class LRUResponseCache:
+    """推定サイズの合計で上限を設けた LRU キャッシュ
+
+    イベントループ上からのみ操作するため排他制御は行わない。
+
+    Attributes:
+        max_bytes: 推定サイズの上限（0 以下でキャッシュ無効）
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """キーに対応する値を取得する
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            Any | None: キャッシュされた値。無い場合は None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, size_bytes: int) -> None:
+        """値を格納し、上限を超えた分を古い順に追い出す
+
+        上限より大きい値は格納しない。
+
+        Args:
+            key: キャッシュキー
+            value: 格納する値
+            size_bytes: 値の推定サイズ（バイト）
+        """
+        if size_bytes > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= previous[1]
+
+        self._entries[key] = (value, size_bytes)
+        self._size_bytes += size_bytes
+
+        while self._size_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            self._evictions += 1
+
+    def clear(self) -> None:
+        """すべてのエントリを削除する（統計情報は保持する）"""
+        self._entries.clear()
+        self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        """統計情報を取得する
+
+        Returns:
+            CacheStats: 統計情報
+        """
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+            max_bytes=self.max_bytes,
+        )
+
+
+ledger_response_cache = LRUResponseCache(settings.ledger_response_cache_max_bytes)
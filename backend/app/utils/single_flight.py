@@ -0,0 +1,65 @@
+"""同一キーの同時実行をまとめる single-flight
+
+キャッシュミス時に同じ台帳へのリクエストが集中すると、それぞれが Supabase への
+問い合わせと変換を行ってしまう。同じキーの処理が実行中であれば新たに始めず、
+実行中の処理の結果（または例外）を全員で共有する。
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """キーごとに実行中の処理を1つに保つ
+
+    実行中の処理は待機側とは独立したタスクとして動くため、待機側が
+    タイムアウトやキャンセルで離脱しても処理は継続し、他の待機側に結果が届く。
+    イベントループ上からのみ操作するため排他制御は行わない。
+
+    Attributes:
+        timeout: 待機側が結果を待つ最大秒数
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # 全員がタイムアウトで離脱した場合に例外が未回収のまま残らないようにする
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """キーに対応する処理を実行し、同時に呼ばれた場合は結果を共有する
+
+        Args:
+            key: 処理を識別するキー
+            fn: 処理を行うコルーチン関数
+
+        Returns:
+            T: 処理の結果
+
+        Raises:
+            TimeoutError: timeout 秒以内に結果が得られなかった場合
+            Exception: 処理で発生した例外（同じキーの待機側すべてに伝わる）
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+
+    def in_flight(self) -> int:
+        """実行中の処理の数を取得する
+
+        Returns:
+            int: 実行中のキーの数
+        """
+        return len(self._in_flight)
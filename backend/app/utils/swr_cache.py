@@ -0,0 +1,85 @@
+"""stale-while-revalidate 方式のスナップショットキャッシュ
+
+値が TTL を過ぎても直ちには破棄せず、古い値を返しながらバックグラウンドで
+再取得する。利用者が上流の問い合わせを待つのは、スナップショットが無い場合と、
+再取得が失敗し続けて TTL と猶予期間（stale_while_revalidate）を過ぎた場合のみ。
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class StaleWhileRevalidateCache(Generic[T]):
+    """単一の値を保持し、TTL 経過後は古い値を返しつつ再取得するキャッシュ
+
+    同時に再取得が走らないよう、取得中のタスクは1つだけ保持する。
+    イベントループ上からのみ操作するため排他制御は行わない。
+
+    Attributes:
+        ttl: 値を新しいとみなす秒数
+        stale_while_revalidate: TTL を過ぎた値を返してよい秒数
+    """
+
+    def __init__(self, ttl: float, stale_while_revalidate: float):
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._value: T | None = None
+        self._loaded_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+
+    async def _load(self, loader: Callable[[], Awaitable[T]]) -> T:
+        value = await loader()
+        self._value = value
+        self._loaded_at = time.monotonic()
+        return value
+
+    def _start_refresh(self, loader: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._load(loader))
+            self._refresh_task.add_done_callback(self._log_refresh_failure)
+        return self._refresh_task
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to refresh cached snapshot: %s", task.exception())
+
+    async def get(self, loader: Callable[[], Awaitable[T]]) -> T:
+        """値を取得する
+
+        スナップショットが無い場合は取得を待つ。TTL を過ぎている場合は
+        古い値をそのまま返し、バックグラウンドで再取得を開始する。
+        TTL と stale_while_revalidate を合わせた秒数を過ぎた値は返さず、取得を待つ。
+
+        Args:
+            loader: 値を取得するコルーチン関数
+
+        Returns:
+            T: キャッシュされた値
+
+        Raises:
+            Exception: 取得を待った場合に、取得に失敗したときは loader の例外
+        """
+        age = time.monotonic() - self._loaded_at
+        if self._value is None or age >= self.ttl + self.stale_while_revalidate:
+            # 同時に届いたリクエストは同じ取得を待つ。待機側のキャンセルで
+            # 取得自体が中断されないよう shield する
+            return await asyncio.shield(self._start_refresh(loader))
+
+        if age >= self.ttl:
+            self._start_refresh(loader)
+
+        return self._value
+
+    def clear(self) -> None:
+        """保持している値と取得中のタスクへの参照を破棄する"""
+        self._value = None
+        self._loaded_at = 0.0
+        self._refresh_task = None
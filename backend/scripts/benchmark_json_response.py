@@ -0,0 +1,108 @@
+"""JSON レスポンスのエンコード速度の比較
+
+仕訳を多数含む ElectionFundsResponse を、FastAPI と同じ手順（response_model による
+JSON 互換の値への変換 → レスポンスクラスでのバイト列化）でエンコードし、
+JSONResponse と ORJSONResponse の所要時間を比較する。出力が一致することも確認する。
+
+使い方（backend ディレクトリで実行）:
+    python -m scripts.benchmark_json_response --items 5000 --repeat 20
+"""
+
+import argparse
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from app import schemas
+
+
+def build_response(items: int) -> schemas.ElectionFundsResponse:
+    """ベンチマーク用の選挙資金レスポンスを作成する
+
+    Args:
+        items: 仕訳の件数
+
+    Returns:
+        schemas.ElectionFundsResponse: 選挙資金データ
+    """
+    meta = schemas.ElectionFundsMeta(
+        api_version="v1",
+        politician=schemas.PoliticianInfo(
+            id=uuid4(), name="候補者A", name_kana="コウホシャエー"
+        ),
+        election=schemas.ElectionInfo(
+            id=uuid4(),
+            name="テスト市議会議員選挙",
+            type="GM",
+            type_name="市区町村議会議員選挙",
+            district_id=uuid4(),
+            district_name="テスト市",
+            election_date="2026-02-01",
+        ),
+        summary=schemas.ElectionFundsSummary(
+            total_income=500000,
+            total_expense=321000,
+            balance=179000,
+            public_expense_total=110605,
+            journal_count=items,
+        ),
+        generated_at=datetime.now(),
+    )
+    data = [
+        schemas.ElectionFundsDataItem(
+            id=uuid4(),
+            date=f"2026-01-{1 + index % 28:02d}",
+            amount=12000 + index,
+            category="printing",
+            category_name="印刷費",
+            type="expense",
+            purpose=f"ポスター印刷 {index}",
+            public_expense_amount=1000 if index % 3 == 0 else None,
+        )
+        for index in range(items)
+    ]
+    return schemas.ElectionFundsResponse(meta=meta, data=data)
+
+
+def measure(response_class: type[JSONResponse], content, repeat: int) -> float:
+    """response_model の変換とバイト列化の平均所要時間を測る
+
+    Args:
+        response_class: レスポンスクラス
+        content: レスポンス本体
+        repeat: 繰り返し回数
+
+    Returns:
+        float: 1回あたりの平均秒数
+    """
+    adapter = TypeAdapter(schemas.ElectionFundsResponse)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        value = adapter.dump_python(content, mode="json", by_alias=True)
+        response_class(value)
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    content = build_response(args.items)
+    adapter = TypeAdapter(schemas.ElectionFundsResponse)
+    value = adapter.dump_python(content, mode="json", by_alias=True)
+    assert JSONResponse(value).body == ORJSONResponse(value).body
+
+    baseline = measure(JSONResponse, content, args.repeat)
+    fast = measure(ORJSONResponse, content, args.repeat)
+    print(f"items={args.items} repeat={args.repeat}")
+    print(f"JSONResponse   : {baseline * 1000:8.2f} ms")
+    print(f"ORJSONResponse : {fast * 1000:8.2f} ms ({baseline / fast:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -70,6 +70,22 @@ def test_settings():
 #         session.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    """Clear the in-process response caches between tests"""
+    from app.utils.existence_index import existence_index
+    from app.utils.polimoney_response import elections_list_cache
+    from app.utils.response_cache import ledger_response_cache
+
+    ledger_response_cache.clear()
+    elections_list_cache.clear()
+    existence_index.clear()
+    yield
+    ledger_response_cache.clear()
+    elections_list_cache.clear()
+    existence_index.clear()
+
+
 @pytest.fixture
 def client():
     """Synchronous test client"""
@@ -0,0 +1,252 @@
+"""テスト用の Supabase クライアントのモックとテストデータ
+
+各テストで共通して使う PostgREST のクエリのモック、テーブルごとの応答、
+モックを注入したテスト用アプリケーションをまとめる。
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+from fastapi import APIRouter, FastAPI, status
+from fastapi.responses import JSONResponse
+
+from app.database.supabase import get_supabase_client_dep
+from app.utils.polimoney_response import MultipleCandidatesException
+
+# 選挙台帳のテストデータ
+ELECTION_ID = UUID("11111111-1111-1111-1111-111111111111")
+ELECTION_ID_2 = UUID("22222222-2222-2222-2222-222222222222")
+POLITICIAN_ID_1 = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+POLITICIAN_ID_2 = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
+LEDGER_ID_1 = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+LEDGER_ID_2 = UUID("dddddddd-dddd-dddd-dddd-dddddddddddd")
+NON_ELECTION_LEDGER_ID = UUID("eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee")
+MISSING_ELECTION_ID = UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
+DISTRICT_ID = UUID("99999999-9999-9999-9999-999999999999")
+JOURNAL_ID_1 = UUID("12121212-1212-1212-1212-121212121212")
+JOURNAL_ID_2 = UUID("34343434-3434-3434-3434-343434343434")
+
+ELECTION_LEDGER_ROW = {
+    "id": str(LEDGER_ID_1),
+    "election_id": str(ELECTION_ID),
+    "politician_id": str(POLITICIAN_ID_1),
+    "organization_id": None,
+    "fiscal_year": 2026,
+    "total_income": 1000,
+    "total_expense": 400,
+    "journal_count": 2,
+    "ledger_source_id": str(uuid4()),
+    "last_updated_at": "2026-01-01T00:00:00+00:00",
+    "first_synced_at": "2026-01-01T00:00:00+00:00",
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "is_test": False,
+}
+
+ELECTION_LEDGER_WITH_META = {
+    **ELECTION_LEDGER_ROW,
+    "politicians": {
+        "id": str(POLITICIAN_ID_1),
+        "name": "候補者A",
+        "name_kana": "コウホシャエー",
+    },
+    "elections": {
+        "id": str(ELECTION_ID),
+        "name": "テスト市議会議員選挙",
+        "type": "GM",
+        "election_date": "2026-02-01",
+        "district": {"id": str(DISTRICT_ID), "name": "テスト市"},
+        "election_type": {"code": "GM", "name": "市区町村議会議員選挙"},
+    },
+}
+
+ELECTION_WITH_META = ELECTION_LEDGER_WITH_META["elections"]
+
+ELECTION_FUNDS_TABLES = {
+    "public_ledgers": ELECTION_LEDGER_WITH_META,
+    "public_journals": [
+        {
+            "id": str(JOURNAL_ID_1),
+            "ledger_id": str(LEDGER_ID_1),
+            "journal_source_id": str(uuid4()),
+            "date": "2026-01-10",
+            "description": "車上運動員報酬",
+            "amount": 300,
+            "account_code": "EXP_PERSONNEL_ELEC",
+            "classification": "campaign",
+            "public_expense_amount": 100,
+            "content_hash": "hash-1",
+            "synced_at": "2026-01-11T00:00:00+00:00",
+            "created_at": "2026-01-11T00:00:00+00:00",
+        },
+        {
+            "id": str(JOURNAL_ID_2),
+            "ledger_id": str(LEDGER_ID_1),
+            "journal_source_id": str(uuid4()),
+            "date": None,
+            "description": "ポスター印刷",
+            "amount": 100,
+            "account_code": "EXP_PRINTING_ELEC",
+            "classification": "pre-campaign",
+            "public_expense_amount": 0,
+            "content_hash": "hash-2",
+            "synced_at": "2026-01-11T00:00:00+00:00",
+            "created_at": "2026-01-11T00:00:00+00:00",
+        },
+    ],
+    "account_codes": [{"code": "EXP_PERSONNEL_ELEC", "name": "人件費（選挙）"}],
+}
+
+
+# 政治団体の台帳のテストデータ
+ORGANIZATION_LEDGER_ID = UUID("abababab-abab-abab-abab-abababababab")
+ORGANIZATION_ID = UUID("cdcdcdcd-cdcd-cdcd-cdcd-cdcdcdcdcdcd")
+ORGANIZATION_POLITICIAN_ID = UUID("efefefef-efef-efef-efef-efefefefefef")
+ORGANIZATION_JOURNAL_ID = UUID("56565656-5656-5656-5656-565656565656")
+
+ORGANIZATION_LEDGER_WITH_META = {
+    "id": str(ORGANIZATION_LEDGER_ID),
+    "election_id": None,
+    "politician_id": str(ORGANIZATION_POLITICIAN_ID),
+    "organization_id": str(ORGANIZATION_ID),
+    "fiscal_year": 2025,
+    "total_income": 5000,
+    "total_expense": 1200,
+    "journal_count": 1,
+    "ledger_source_id": str(uuid4()),
+    "last_updated_at": "2026-01-01T00:00:00+00:00",
+    "first_synced_at": "2026-01-01T00:00:00+00:00",
+    "created_at": "2026-01-01T00:00:00+00:00",
+    "is_test": False,
+    "politicians": {
+        "id": str(ORGANIZATION_POLITICIAN_ID),
+        "name": "政治家A",
+        "name_kana": "セイジカエー",
+    },
+    "organizations": {
+        "id": str(ORGANIZATION_ID),
+        "name": "テスト後援会",
+        "type": "support_group",
+    },
+}
+
+ORGANIZATION_TABLES = {
+    "public_journals": [
+        {
+            "id": str(ORGANIZATION_JOURNAL_ID),
+            "ledger_id": str(ORGANIZATION_LEDGER_ID),
+            "journal_source_id": str(uuid4()),
+            "date": "2025-06-01",
+            "description": "事務所家賃",
+            "amount": 1200,
+            "account_code": "EXP_OFFICE",
+            "classification": None,
+            "public_expense_amount": 0,
+            "content_hash": "hash-1",
+            "synced_at": "2026-01-01T00:00:00+00:00",
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+    ],
+    "account_codes": [{"code": "EXP_OFFICE", "name": "事務所費"}],
+}
+
+
+def chainable_query(final_data) -> MagicMock:
+    """メソッドチェーンの末尾の execute() で final_data を返すクエリを作成する
+
+    Args:
+        final_data: execute() の結果の data
+
+    Returns:
+        MagicMock: select / eq / not_.is_ / in_ / order / maybe_single / single を
+            連結できるクエリ
+    """
+    query = MagicMock()
+    for method_name in (
+        "select",
+        "eq",
+        "is_",
+        "in_",
+        "order",
+        "maybe_single",
+        "single",
+    ):
+        setattr(query, method_name, MagicMock(return_value=query))
+    query.not_.is_ = MagicMock(return_value=query)
+    response = MagicMock()
+    response.data = final_data
+    query.execute = AsyncMock(return_value=response)
+    return query
+
+
+def paged_query(pages: list[list[dict]]) -> MagicMock:
+    """execute() のたびに pages を先頭から1ページずつ返すクエリを作成する
+
+    Args:
+        pages: 各回の execute() の結果の data
+
+    Returns:
+        MagicMock: select / eq / in_ / or_ / order / limit を連結できるクエリ
+    """
+    query = MagicMock()
+    for method_name in ("select", "eq", "in_", "or_", "order", "limit"):
+        setattr(query, method_name, MagicMock(return_value=query))
+    responses = []
+    for page in pages:
+        response = MagicMock()
+        response.data = page
+        responses.append(response)
+    query.execute = AsyncMock(side_effect=responses)
+    return query
+
+
+def create_mock_supabase(
+    tables: dict,
+    queried_tables: list[str] | None = None,
+    queries: dict[str, MagicMock] | None = None,
+) -> MagicMock:
+    """テーブルごとの応答を返す Supabase クライアントのモックを作成する
+
+    Args:
+        tables: テーブル名をキーとした execute() の結果の data
+        queried_tables: 指定した場合は、問い合わせたテーブル名を順に追加する
+        queries: テーブル名をキーとした、tables より優先して返すクエリ
+
+    Returns:
+        MagicMock: table() でテーブルごとのクエリを返すクライアント
+    """
+
+    def table_side_effect(name):
+        if queried_tables is not None:
+            queried_tables.append(name)
+        if queries is not None and name in queries:
+            return queries[name]
+        return chainable_query(tables[name])
+
+    mock_supabase = MagicMock()
+    mock_supabase.table.side_effect = table_side_effect
+    return mock_supabase
+
+
+def create_test_app(mock_supabase: MagicMock, *routers: APIRouter) -> FastAPI:
+    """モックのクライアントを注入したテスト用アプリケーションを作成する
+
+    Args:
+        mock_supabase: 依存関数の代わりに渡すクライアント
+        *routers: /api/v1 に登録するルーター
+
+    Returns:
+        FastAPI: テスト用アプリケーション
+    """
+    test_app = FastAPI()
+
+    @test_app.exception_handler(MultipleCandidatesException)
+    async def multiple_candidates_exception_handler(_request, exc):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content=exc.error.model_dump(mode="json"),
+        )
+
+    for router in routers:
+        test_app.include_router(router, prefix="/api/v1")
+    test_app.dependency_overrides[get_supabase_client_dep] = lambda: mock_supabase
+    return test_app
@@ -0,0 +1,215 @@
+"""レスポンス圧縮のテスト"""
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Header
+from fastapi.responses import Response, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.utils import compression
+from app.utils.compression import (
+    CompressionMiddleware,
+    available_encodings,
+    negotiate_encoding,
+    stream_compressor,
+    strip_encoded_etags,
+)
+from app.utils.http_cache import etag_matches, not_modified_response
+from app.utils.response_cache import LRUResponseCache
+
+LARGE_BODY = ('{"purpose":"' + "ポスター印刷" * 500 + '"}').encode()
+
+
+def _create_test_app(cache: LRUResponseCache) -> FastAPI:
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=1024, cache=cache)
+
+    @test_app.get("/large")
+    async def large(if_none_match: str | None = Header(default=None)):
+        if etag_matches(if_none_match, '"large-v1"'):
+            return not_modified_response('"large-v1"')
+        return Response(
+            content=LARGE_BODY,
+            media_type="application/json",
+            headers={"ETag": '"large-v1"'},
+        )
+
+    @test_app.get("/small")
+    async def small():
+        return Response(content=b'{"ok":true}', media_type="application/json")
+
+    @test_app.get("/stream")
+    async def stream():
+        async def chunks():
+            for index in range(3):
+                yield f'{{"index":{index}}}\n'.encode()
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return test_app
+
+
+async def _get(
+    app: FastAPI,
+    path: str,
+    accept_encoding: str | None,
+    if_none_match: str | None = None,
+):
+    headers = {"Accept-Encoding": accept_encoding or "identity"}
+    if if_none_match is not None:
+        headers["If-None-Match"] = if_none_match
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as client:
+        return await client.get(path, headers=headers)
+
+
+class TestNegotiateEncoding:
+    """negotiate_encoding のテスト"""
+
+    def test_prefers_server_order_for_equal_weights(self):
+        preferred = available_encodings()[0]
+        assert negotiate_encoding("gzip, deflate, br, zstd") == preferred
+
+    def test_respects_q_values(self):
+        assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+        assert negotiate_encoding("br;q=0, zstd;q=0, gzip;q=0") is None
+        assert negotiate_encoding("*") == available_encodings()[0]
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding(None) is None
+
+
+class TestStripEncodedEtags:
+    """strip_encoded_etags のテスト"""
+
+    def test_strips_only_negotiated_encoding(self):
+        assert strip_encoded_etags('"a-gzip", W/"b-gzip", "c-br", "d"', "gzip") == (
+            '"a", W/"b", "c-br", "d"',
+            {'"a"', '"b"'},
+        )
+
+
+def _stream_decompressor(encoding: str):
+    if encoding == "br":
+        decompressor = compression.brotli.Decompressor()
+        return decompressor.process
+    if encoding == "zstd":
+        decompressor = compression.zstandard.ZstdDecompressor().decompressobj()
+        return decompressor.decompress
+    return zlib.decompressobj(31).decompress
+
+
+class TestStreamCompressor:
+    """stream_compressor のテスト"""
+
+    @pytest.mark.parametrize("encoding", ["br", "zstd", "gzip"])
+    def test_flushes_each_chunk(self, encoding):
+        if encoding not in available_encodings():
+            pytest.skip(f"{encoding} is not installed")
+        compressor = stream_compressor(encoding)
+        decompress = _stream_decompressor(encoding)
+
+        # 各断片の圧縮結果だけで、その断片まで展開できる
+        for index in range(3):
+            chunk = f'{{"index":{index}}}\n'.encode()
+            assert decompress(compressor.compress(chunk)) == chunk
+
+        assert compressor.compress(b"") == b""
+        assert decompress(compressor.finish()) == b""
+
+
+class TestCompressionMiddleware:
+    """CompressionMiddleware のテスト"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding", ["br", "zstd", "gzip"])
+    async def test_compresses_large_responses(self, encoding):
+        if encoding not in available_encodings():
+            pytest.skip(f"{encoding} is not installed")
+        response = await _get(
+            _create_test_app(LRUResponseCache(1 << 20)), "/large", encoding
+        )
+
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == f'"large-v1-{encoding}"'
+        assert int(response.headers["content-length"]) < len(LARGE_BODY)
+        # httpx が Content-Encoding に従って展開する
+        assert response.content == LARGE_BODY
+
+    @pytest.mark.asyncio
+    async def test_reuses_compressed_variant_for_same_etag(self, monkeypatch):
+        calls: list[str] = []
+        original = compression.compress
+
+        def counting_compress(content, encoding):
+            calls.append(encoding)
+            return original(content, encoding)
+
+        monkeypatch.setattr(compression, "compress", counting_compress)
+        test_app = _create_test_app(LRUResponseCache(1 << 20))
+
+        first = await _get(test_app, "/large", "gzip")
+        second = await _get(test_app, "/large", "gzip")
+
+        assert calls == ["gzip"]
+        assert first.content == second.content == LARGE_BODY
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding", ["br", "zstd", "gzip"])
+    async def test_not_modified_etag_matches_compressed_response(self, encoding):
+        if encoding not in available_encodings():
+            pytest.skip(f"{encoding} is not installed")
+        test_app = _create_test_app(LRUResponseCache(1 << 20))
+
+        first = await _get(test_app, "/large", encoding)
+        revalidated = await _get(test_app, "/large", encoding, first.headers["etag"])
+
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == first.headers["etag"]
+        assert revalidated.headers["vary"] == "Accept-Encoding"
+
+    @pytest.mark.asyncio
+    async def test_encoded_etag_does_not_match_other_encodings(self):
+        test_app = _create_test_app(LRUResponseCache(1 << 20))
+
+        first = await _get(test_app, "/large", "gzip")
+        identity = await _get(test_app, "/large", None, first.headers["etag"])
+        uncompressed_tag = await _get(test_app, "/large", "gzip", '"large-v1"')
+
+        # 圧縮後の ETag は、圧縮しないレスポンスの ETag とは一致しない
+        assert identity.status_code == 200
+        assert identity.headers["etag"] == '"large-v1"'
+        assert uncompressed_tag.status_code == 304
+        assert uncompressed_tag.headers["etag"] == '"large-v1"'
+
+    @pytest.mark.asyncio
+    async def test_skips_small_responses_and_identity(self):
+        test_app = _create_test_app(LRUResponseCache(1 << 20))
+
+        small = await _get(test_app, "/small", "gzip")
+        identity = await _get(test_app, "/large", None)
+
+        assert "content-encoding" not in small.headers
+        assert small.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] == '"large-v1"'
+
+    @pytest.mark.asyncio
+    async def test_compresses_streaming_responses(self):
+        test_app = _create_test_app(LRUResponseCache(1 << 20))
+        async with (
+            AsyncClient(
+                transport=ASGITransport(app=test_app), base_url="http://testserver"
+            ) as client,
+            client.stream(
+                "GET", "/stream", headers={"Accept-Encoding": "gzip"}
+            ) as response,
+        ):
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw) == b'{"index":0}\n{"index":1}\n{"index":2}\n'
@@ -0,0 +1,108 @@
+"""選挙資金レスポンス組み立てのテスト"""
+
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+import pytest
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from app.config import settings
+from app.utils.election_funds_response import (
+    build_election_funds_conditional_response,
+    build_election_funds_response,
+)
+from tests.supabase_mock import chainable_query, create_mock_supabase
+
+# tables は Python 側の組み立てに渡す PostgREST 応答、rpc_response は同じデータに対して
+# db/migrate-add-election-funds-rpc.sql の関数を PostgreSQL で実行した結果
+GOLDEN_PATH = Path(__file__).parent / "fixtures" / "election_funds_golden.json"
+
+
+def _load_golden() -> dict:
+    with GOLDEN_PATH.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _create_mock_supabase(golden: dict) -> MagicMock:
+    mock_supabase = create_mock_supabase(golden["tables"])
+    mock_supabase.rpc.return_value = chainable_query(golden["rpc_response"])
+    return mock_supabase
+
+
+def _dump_without_generated_at(response) -> dict:
+    body = response.model_dump(mode="json")
+    del body["meta"]["generated_at"]
+    return body
+
+
+class TestElectionFundsRpcGolden:
+    """RPC による組み立てと Python による組み立ての同一性テスト"""
+
+    @pytest.mark.asyncio
+    async def test_rpc_and_python_builders_match(self, monkeypatch):
+        golden = _load_golden()
+        ledger_id = UUID(golden["ledger_id"])
+        mock_supabase = _create_mock_supabase(golden)
+
+        monkeypatch.setattr(settings, "election_funds_rpc_enabled", False)
+        python_response = await build_election_funds_response(mock_supabase, ledger_id)
+        monkeypatch.setattr(settings, "election_funds_rpc_enabled", True)
+        rpc_response = await build_election_funds_response(mock_supabase, ledger_id)
+
+        mock_supabase.rpc.assert_called_once_with(
+            "get_election_funds_response", {"p_ledger_id": str(ledger_id)}
+        )
+        assert _dump_without_generated_at(rpc_response) == _dump_without_generated_at(
+            python_response
+        )
+
+    @pytest.mark.asyncio
+    async def test_rpc_returns_404_when_ledger_missing(self, monkeypatch):
+        golden = _load_golden()
+        mock_supabase = _create_mock_supabase(golden)
+        mock_supabase.rpc.return_value = chainable_query(None)
+        monkeypatch.setattr(settings, "election_funds_rpc_enabled", True)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await build_election_funds_response(
+                mock_supabase, UUID(golden["ledger_id"])
+            )
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == "選挙資金の台帳が見つかりません"
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_python_builder_when_rpc_fails(self, monkeypatch):
+        golden = _load_golden()
+        mock_supabase = _create_mock_supabase(golden)
+        failing_query = chainable_query(None)
+        failing_query.execute = AsyncMock(
+            side_effect=APIError({"code": "PGRST202", "message": "not found"})
+        )
+        mock_supabase.rpc.return_value = failing_query
+        monkeypatch.setattr(settings, "election_funds_rpc_enabled", True)
+
+        response = await build_election_funds_response(
+            mock_supabase, UUID(golden["ledger_id"])
+        )
+
+        assert response.meta.summary.public_expense_total == 110605
+        assert len(response.data) == 7
+
+    @pytest.mark.asyncio
+    async def test_streams_large_ledger_without_rpc(self, monkeypatch):
+        golden = _load_golden()
+        mock_supabase = _create_mock_supabase(golden)
+        monkeypatch.setattr(settings, "election_funds_rpc_enabled", True)
+        monkeypatch.setattr(settings, "ledger_stream_threshold", 1)
+
+        # 台帳の行を渡さない場合も、仕訳件数で RPC より先にストリーミングを選ぶ
+        result = await build_election_funds_conditional_response(
+            mock_supabase, UUID(golden["ledger_id"]), render="json"
+        )
+
+        assert result.stream is not None
+        mock_supabase.rpc.assert_not_called()
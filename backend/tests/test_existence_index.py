@@ -0,0 +1,390 @@
+"""ID 存在インデックスのテスト"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.routers import election_funds, polimoney
+from app.utils import existence_index as existence_index_module
+from app.utils.existence_index import ExistenceIndex, existence_index
+from tests.supabase_mock import (
+    ELECTION_ID,
+    LEDGER_ID_1,
+    MISSING_ELECTION_ID,
+    POLITICIAN_ID_1,
+    create_mock_supabase,
+    create_test_app,
+)
+
+KNOWN_ELECTION_ID = "22222222-2222-2222-2222-222222222222"
+UNKNOWN_ID = "99999999-9999-9999-9999-999999999999"
+
+CANDIDATES_PATH = f"/api/v1/polimoney/elections/{ELECTION_ID}/candidates"
+
+CANDIDATE_LEDGERS = [
+    {
+        "id": str(LEDGER_ID_1),
+        "politician_id": str(POLITICIAN_ID_1),
+        "total_income": 1000,
+        "total_expense": 400,
+        "journal_count": 2,
+        "public_expense_total": 150,
+        "politicians": {
+            "id": str(POLITICIAN_ID_1),
+            "name": "候補者A",
+            "name_kana": "コウホシャエー",
+        },
+    }
+]
+
+
+def _range_query(rows: list[dict], calls: list[dict]):
+    query = MagicMock()
+    call: dict = {}
+    calls.append(call)
+
+    def gte(column, value):
+        call["gte"] = (column, value)
+        return query
+
+    def range_(start, end):
+        call["range"] = (start, end)
+        response = MagicMock()
+        response.data = rows[start : end + 1]
+        query.execute = AsyncMock(return_value=response)
+        return query
+
+    query.select = MagicMock(return_value=query)
+    query.order = MagicMock(return_value=query)
+    query.gte = MagicMock(side_effect=gte)
+    query.range = MagicMock(side_effect=range_)
+    return query
+
+
+def _create_index_supabase(tables: dict, calls: dict) -> MagicMock:
+    def table_side_effect(name):
+        return _range_query(tables.get(name, []), calls.setdefault(name, []))
+
+    mock_supabase = MagicMock()
+    mock_supabase.table.side_effect = table_side_effect
+    return mock_supabase
+
+
+def _create_indexed_supabase(
+    tables: dict,
+    index_tables: dict,
+    queried_tables: list[str],
+    index_calls: dict,
+) -> MagicMock:
+    """インデックスの差分更新とエンドポイントの問い合わせを記録するモック"""
+    app_supabase = create_mock_supabase(tables, queried_tables)
+
+    def table_side_effect(name):
+        def select(columns):
+            if columns == "id, created_at":
+                index_query = _range_query(
+                    index_tables.get(name, []), index_calls.setdefault(name, [])
+                )
+                return index_query.select(columns)
+            return app_supabase.table(name).select(columns)
+
+        query = MagicMock()
+        query.select = MagicMock(side_effect=select)
+        return query
+
+    mock_supabase = MagicMock()
+    mock_supabase.table.side_effect = table_side_effect
+    return mock_supabase
+
+
+def _rows(ids: list[str], created_at: str = "2026-01-01T00:00:00+00:00"):
+    return [{"id": id, "created_at": created_at} for id in ids]
+
+
+class TestExistenceIndex:
+    """ExistenceIndex のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_full_load_pages_through_all_rows(self, monkeypatch):
+        monkeypatch.setattr(existence_index_module, "EXISTENCE_INDEX_PAGE_SIZE", 2)
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        election_ids = [f"0000000{n}-0000-0000-0000-000000000000" for n in range(5)]
+        calls: dict = {}
+        mock_supabase = _create_index_supabase(
+            {"elections": _rows(election_ids)}, calls
+        )
+
+        await index.refresh(mock_supabase)
+
+        assert [call["range"] for call in calls["elections"]] == [
+            (0, 1),
+            (2, 3),
+            (4, 5),
+        ]
+        assert all("gte" not in call for call in calls["elections"])
+        assert index.known_present("elections", election_ids[4])
+        assert not index.known_present("elections", UNKNOWN_ID)
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_from_watermark(self):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        tables = {"elections": _rows([KNOWN_ELECTION_ID], "2026-01-01T12:00:00+00:00")}
+        await index.refresh(_create_index_supabase(tables, {}))
+
+        calls: dict = {}
+        tables["elections"] = _rows([UNKNOWN_ID], "2026-01-01T12:05:00+00:00")
+        await index.refresh(_create_index_supabase(tables, calls))
+
+        # 取りこぼし防止のため、前回の最大 created_at から遡って取得する
+        assert calls["elections"][0]["gte"] == (
+            "created_at",
+            "2026-01-01T11:50:00+00:00",
+        )
+        assert index.known_present("elections", KNOWN_ELECTION_ID)
+        assert index.known_present("elections", UNKNOWN_ID)
+
+    @pytest.mark.asyncio
+    async def test_stale_or_unloaded_index_never_reports_present(self, monkeypatch):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        assert not index.known_present("elections", KNOWN_ELECTION_ID)
+
+        await index.refresh(
+            _create_index_supabase({"elections": _rows([KNOWN_ELECTION_ID])}, {})
+        )
+        assert index.known_present("elections", KNOWN_ELECTION_ID)
+
+        monkeypatch.setattr(index, "_refreshed_at", index._refreshed_at - 61)
+        assert not index.known_present("elections", KNOWN_ELECTION_ID)
+
+    @pytest.mark.asyncio
+    async def test_miss_within_interval_makes_no_queries(self):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        tables = {"public_ledgers": [], "elections": _rows([KNOWN_ELECTION_ID])}
+        await index.refresh(_create_index_supabase(tables, {}))
+
+        mock_supabase = _create_index_supabase(tables, {})
+        assert await index.definitely_missing(mock_supabase, "elections", UNKNOWN_ID)
+        assert not await index.definitely_missing(
+            mock_supabase, "elections", KNOWN_ELECTION_ID
+        )
+        mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_refresh(self, monkeypatch):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        tables = {"public_ledgers": [], "elections": _rows([KNOWN_ELECTION_ID])}
+        await index.refresh(_create_index_supabase(tables, {}))
+        monkeypatch.setattr(index, "_refreshed_at", index._refreshed_at - 2)
+
+        calls: dict = {}
+        missing = await asyncio.gather(
+            *(
+                index.definitely_missing(
+                    _create_index_supabase(tables, calls), "elections", UNKNOWN_ID
+                )
+                for _ in range(5)
+            )
+        )
+
+        assert missing == [True] * 5
+        assert len(calls["elections"]) == 1
+        assert len(calls["public_ledgers"]) == 1
+
+        # 直後のミスは間隔内のため、差分更新せずに判定する
+        assert await index.definitely_missing(
+            _create_index_supabase(tables, calls), "elections", UNKNOWN_ID
+        )
+        assert len(calls["elections"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_refresh_picks_up_new_id(self, monkeypatch):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        tables = {"public_ledgers": [], "elections": _rows([KNOWN_ELECTION_ID])}
+        await index.refresh(_create_index_supabase(tables, {}))
+        monkeypatch.setattr(index, "_refreshed_at", index._refreshed_at - 2)
+
+        tables["elections"] = _rows([UNKNOWN_ID])
+        assert not await index.definitely_missing(
+            _create_index_supabase(tables, {}), "elections", UNKNOWN_ID
+        )
+        assert index.known_present("elections", UNKNOWN_ID)
+
+    @pytest.mark.asyncio
+    async def test_stale_or_unloaded_index_never_reports_missing(self):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        mock_supabase = _create_index_supabase({}, {})
+
+        assert not await index.definitely_missing(
+            mock_supabase, "elections", UNKNOWN_ID
+        )
+        mock_supabase.table.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_miss_refresh_falls_back_to_previous_result(self, monkeypatch):
+        index = ExistenceIndex(max_staleness=60, miss_refresh_interval=1)
+        tables = {"public_ledgers": [], "elections": _rows([KNOWN_ELECTION_ID])}
+        await index.refresh(_create_index_supabase(tables, {}))
+        monkeypatch.setattr(index, "_refreshed_at", index._refreshed_at - 2)
+
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = RuntimeError("connection lost")
+
+        assert await index.definitely_missing(mock_supabase, "elections", UNKNOWN_ID)
+
+
+class TestElectionExistenceCheck:
+    """存在インデックスを使った選挙の存在確認のテスト"""
+
+    async def _get_candidates(self, indexed_ids: list[str]):
+        await existence_index.refresh(
+            _create_index_supabase(
+                {"public_ledgers": [], "elections": _rows(indexed_ids)}, {}
+            )
+        )
+        queried_tables: list[str] = []
+        mock_supabase = create_mock_supabase(
+            {
+                "elections": {"id": str(ELECTION_ID)},
+                "public_ledgers": CANDIDATE_LEDGERS,
+            },
+            queried_tables,
+        )
+
+        async with AsyncClient(
+            transport=ASGITransport(
+                app=create_test_app(mock_supabase, polimoney.router)
+            ),
+            base_url="http://testserver",
+        ) as client:
+            response = await client.get(CANDIDATES_PATH)
+        return response, queried_tables
+
+    @pytest.mark.asyncio
+    async def test_skips_existence_query_for_indexed_election(self):
+        response, queried_tables = await self._get_candidates([str(ELECTION_ID)])
+
+        assert response.status_code == 200
+        assert queried_tables == ["public_ledgers"]
+
+
+class TestMissingIdShortCircuit:
+    """インデックスに無い ID を問い合わせずに 404 にするテスト"""
+
+    @pytest.fixture
+    def indexed_supabase(self):
+        index_tables = {
+            "public_ledgers": _rows([str(LEDGER_ID_1)]),
+            "elections": _rows([str(ELECTION_ID)]),
+        }
+        queried_tables: list[str] = []
+        index_calls: dict = {}
+        mock_supabase = _create_indexed_supabase(
+            {
+                "elections": {"id": str(ELECTION_ID)},
+                "public_ledgers": CANDIDATE_LEDGERS,
+            },
+            index_tables,
+            queried_tables,
+            index_calls,
+        )
+        return mock_supabase, index_tables, queried_tables, index_calls
+
+    async def _get(self, mock_supabase: MagicMock, path: str):
+        app = create_test_app(mock_supabase, polimoney.router, election_funds.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://testserver",
+        ) as client:
+            return await client.get(path)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("rpc_enabled", [False, True])
+    @pytest.mark.parametrize(
+        ("path", "detail"),
+        [
+            (f"/api/v1/election-funds/{UNKNOWN_ID}", "選挙資金の台帳が見つかりません"),
+            (
+                f"/api/v1/polimoney/ledgers/{UNKNOWN_ID}/journals",
+                "台帳が見つかりません",
+            ),
+            (
+                f"/api/v1/polimoney/elections/{MISSING_ELECTION_ID}/journals",
+                "選挙情報が見つかりません",
+            ),
+            (
+                f"/api/v1/polimoney/elections/{MISSING_ELECTION_ID}/candidates",
+                "選挙情報が見つかりません",
+            ),
+            (
+                f"/api/v1/polimoney/journals/export?election_id={MISSING_ELECTION_ID}",
+                "対象の台帳が見つかりません",
+            ),
+        ],
+    )
+    async def test_miss_returns_404_without_queries(
+        self, monkeypatch, indexed_supabase, path, detail, rpc_enabled
+    ):
+        monkeypatch.setattr(settings, "election_funds_rpc_enabled", rpc_enabled)
+        mock_supabase, index_tables, _, _ = indexed_supabase
+        await existence_index.refresh(_create_index_supabase(index_tables, {}))
+
+        response = await self._get(mock_supabase, path)
+
+        assert response.status_code == 404
+        assert response.json() == {"detail": detail}
+        mock_supabase.table.assert_not_called()
+        mock_supabase.rpc.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_refresh_once_then_return_404(
+        self, monkeypatch, indexed_supabase
+    ):
+        mock_supabase, index_tables, queried_tables, index_calls = indexed_supabase
+        await existence_index.refresh(_create_index_supabase(index_tables, {}))
+        monkeypatch.setattr(
+            existence_index,
+            "_refreshed_at",
+            existence_index._refreshed_at
+            - settings.existence_index_miss_refresh_interval,
+        )
+
+        responses = await asyncio.gather(
+            *(
+                self._get(
+                    mock_supabase, f"/api/v1/polimoney/ledgers/{UNKNOWN_ID}/journals"
+                )
+                for _ in range(5)
+            )
+        )
+
+        assert [response.status_code for response in responses] == [404] * 5
+        assert len(index_calls["public_ledgers"]) == 1
+        assert len(index_calls["elections"]) == 1
+        assert queried_tables == []
+
+    @pytest.mark.asyncio
+    async def test_election_created_after_last_refresh_is_found(
+        self, monkeypatch, indexed_supabase
+    ):
+        mock_supabase, index_tables, queried_tables, _ = indexed_supabase
+        await existence_index.refresh(
+            _create_index_supabase(
+                {"public_ledgers": [], "elections": _rows([KNOWN_ELECTION_ID])}, {}
+            )
+        )
+        monkeypatch.setattr(
+            existence_index,
+            "_refreshed_at",
+            existence_index._refreshed_at
+            - settings.existence_index_miss_refresh_interval,
+        )
+
+        # ミス時の差分更新で、最後の更新より後に追加された選挙を取り込む
+        response = await self._get(mock_supabase, CANDIDATES_PATH)
+
+        assert response.status_code == 200
+        assert response.json()["data"][0]["summary"]["public_expense_total"] == 150
+        assert queried_tables == ["public_ledgers"]
@@ -0,0 +1,124 @@
+"""ETag / If-None-Match のテスト"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.routers import political_funds
+from app.utils.http_cache import etag_matches
+from app.utils.response_cache import ledger_response_cache
+from tests.supabase_mock import (
+    ORGANIZATION_LEDGER_ID,
+    ORGANIZATION_LEDGER_WITH_META,
+    ORGANIZATION_TABLES,
+    create_mock_supabase,
+    create_test_app,
+)
+
+LEDGER_PATH = f"/api/v1/political-funds/{ORGANIZATION_LEDGER_ID}"
+
+
+class TestEtagMatches:
+    """etag_matches のテスト"""
+
+    def test_matches_listed_and_weak_tags(self):
+        assert etag_matches('"a", "b"', '"b"')
+        assert etag_matches('W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+
+    def test_does_not_match_missing_or_different_tags(self):
+        assert not etag_matches(None, '"b"')
+        assert not etag_matches('"a"', '"b"')
+
+
+class TestPoliticalFundsConditionalRequest:
+    """政治資金APIの条件付きリクエストのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_returns_304_without_fetching_journals(self):
+        queried_tables: list[str] = []
+        tables = {
+            **ORGANIZATION_TABLES,
+            "public_ledgers": ORGANIZATION_LEDGER_WITH_META,
+        }
+        mock_supabase = create_mock_supabase(tables, queried_tables)
+
+        async with AsyncClient(
+            transport=ASGITransport(
+                app=create_test_app(mock_supabase, political_funds.router)
+            ),
+            base_url="http://testserver",
+        ) as client:
+            first = await client.get(LEDGER_PATH)
+            etag = first.headers["etag"]
+            queried_tables.clear()
+
+            second = await client.get(
+                LEDGER_PATH,
+                headers={"If-None-Match": etag},
+            )
+            third = await client.get(LEDGER_PATH)
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+        assert third.status_code == 200
+        assert third.headers["etag"] == etag
+        assert third.content == first.content
+        assert queried_tables == ["public_ledgers", "public_ledgers"]
+
+    @pytest.mark.asyncio
+    async def test_returns_304_after_cache_eviction(self):
+        tables = {
+            **ORGANIZATION_TABLES,
+            "public_ledgers": ORGANIZATION_LEDGER_WITH_META,
+        }
+        mock_supabase = create_mock_supabase(tables)
+
+        async with AsyncClient(
+            transport=ASGITransport(
+                app=create_test_app(mock_supabase, political_funds.router)
+            ),
+            base_url="http://testserver",
+        ) as client:
+            first = await client.get(LEDGER_PATH)
+            ledger_response_cache.clear()
+            second = await client.get(
+                LEDGER_PATH,
+                headers={"If-None-Match": first.headers["etag"]},
+            )
+
+        assert second.status_code == 304
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.content == b""
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_when_meta_changes(self):
+        tables = {
+            **ORGANIZATION_TABLES,
+            "public_ledgers": ORGANIZATION_LEDGER_WITH_META,
+        }
+        mock_supabase = create_mock_supabase(tables)
+
+        async with AsyncClient(
+            transport=ASGITransport(
+                app=create_test_app(mock_supabase, political_funds.router)
+            ),
+            base_url="http://testserver",
+        ) as client:
+            first = await client.get(LEDGER_PATH)
+            tables["public_ledgers"] = {
+                **ORGANIZATION_LEDGER_WITH_META,
+                "organizations": {
+                    **ORGANIZATION_LEDGER_WITH_META["organizations"],
+                    "name": "改称後援会",
+                },
+            }
+            second = await client.get(
+                LEDGER_PATH,
+                headers={"If-None-Match": first.headers["etag"]},
+            )
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert second.json()["meta"]["organization"]["name"] == "改称後援会"
@@ -0,0 +1,117 @@
+"""台帳の仕訳の CSV 出力のテスト"""
+
+import csv
+import io
+from unittest.mock import MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.routers import election_funds
+from app.utils.journal_csv import escape_csv_value
+from tests.supabase_mock import (
+    ELECTION_FUNDS_TABLES,
+    JOURNAL_ID_1,
+    LEDGER_ID_1,
+    create_mock_supabase,
+    create_test_app,
+    paged_query,
+)
+
+JOURNALS = ELECTION_FUNDS_TABLES["public_journals"]
+CSV_PATH = f"/api/v1/election-funds/{LEDGER_ID_1}"
+
+
+def _create_csv_app(journals_query: MagicMock, tables: dict = ELECTION_FUNDS_TABLES):
+    mock_supabase = create_mock_supabase(
+        tables, queries={"public_journals": journals_query}
+    )
+    return create_test_app(mock_supabase, election_funds.router)
+
+
+class TestEscapeCsvValue:
+    """CSV のフィールド変換のテスト"""
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (None, ""),
+            (300, "300"),
+            (-300, "-300"),
+            ("車上運動員報酬", "車上運動員報酬"),
+            ('=HYPERLINK("http://example.com")', '\'=HYPERLINK("http://example.com")'),
+            ("+1", "'+1"),
+            ("-1", "'-1"),
+            ("@SUM(A1)", "'@SUM(A1)"),
+        ],
+    )
+    def test_escapes_formula_prefixes_of_strings(self, value, expected):
+        assert escape_csv_value(value) == expected
+
+
+class TestLedgerCsvAPI:
+    """台帳の仕訳の CSV 出力APIのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_streams_csv_with_bom_and_quoted_fields(self, monkeypatch):
+        monkeypatch.setattr(settings, "journal_page_size", 1)
+        injected = {**JOURNALS[1], "description": "=1+1"}
+        journals_query = paged_query([[JOURNALS[0]], [injected], []])
+
+        test_app = _create_csv_app(journals_query)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            response = await client.get(CSV_PATH, params={"format": "csv"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+        assert response.headers["content-disposition"] == (
+            f'attachment; filename="election-funds-{LEDGER_ID_1}.csv"'
+        )
+        assert "etag" not in response.headers
+        assert journals_query.execute.await_count == 3
+
+        text = response.content.decode("utf-8")
+        assert text.startswith('\ufeff"id","date","amount"')
+        assert text.endswith("\r\n")
+        rows = list(csv.DictReader(io.StringIO(text.removeprefix("\ufeff"))))
+        assert [row["id"] for row in rows] == [str(JOURNAL_ID_1), JOURNALS[1]["id"]]
+        assert rows[0]["category_name"] == "人件費（選挙）"
+        assert rows[0]["public_expense_amount"] == "100"
+        assert rows[1]["date"] == ""
+        assert rows[1]["purpose"] == "'=1+1"
+        assert rows[1]["type"] == "立候補準備"
+
+    @pytest.mark.asyncio
+    async def test_outputs_all_journals_when_pages_are_truncated(self, monkeypatch):
+        # PostgREST の max-rows が JOURNAL_PAGE_SIZE より小さい場合
+        monkeypatch.setattr(settings, "journal_page_size", 1000)
+        journals_query = paged_query([[JOURNALS[0]], [JOURNALS[1]], []])
+
+        test_app = _create_csv_app(journals_query)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            response = await client.get(CSV_PATH, params={"format": "csv"})
+
+        assert response.status_code == 200
+        text = response.content.decode("utf-8").removeprefix("\ufeff")
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert [row["id"] for row in rows] == [str(JOURNAL_ID_1), JOURNALS[1]["id"]]
+        assert journals_query.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_returns_404_before_streaming(self):
+        journals_query = paged_query([])
+        test_app = _create_csv_app(
+            journals_query, {**ELECTION_FUNDS_TABLES, "public_ledgers": None}
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            response = await client.get(CSV_PATH, params={"format": "csv"})
+
+        assert response.status_code == 404
+        journals_query.execute.assert_not_awaited()
@@ -0,0 +1,146 @@
+"""仕訳の一括エクスポート（NDJSON）のテスト"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.routers import polimoney
+from tests.supabase_mock import (
+    ELECTION_FUNDS_TABLES,
+    ELECTION_ID,
+    JOURNAL_ID_1,
+    LEDGER_ID_1,
+    LEDGER_ID_2,
+    POLITICIAN_ID_1,
+    create_mock_supabase,
+    create_test_app,
+    paged_query,
+)
+
+EXPORT_PATH = "/api/v1/polimoney/journals/export"
+
+JOURNALS = ELECTION_FUNDS_TABLES["public_journals"]
+
+# 政治団体の台帳の仕訳（LEDGER_ID_2 は LEDGER_ID_1 より後ろに並ぶ）
+ORGANIZATION_JOURNAL = {
+    **JOURNALS[0],
+    "id": "56565656-5656-5656-5656-565656565656",
+    "ledger_id": str(LEDGER_ID_2),
+    "account_code": "EXP_PRINTING_ELEC",
+    "public_expense_amount": 0,
+}
+
+
+def _mock_export_supabase(
+    ledgers: list[dict],
+    journals_query: MagicMock,
+) -> MagicMock:
+    return create_mock_supabase(
+        {**ELECTION_FUNDS_TABLES, "public_ledgers": ledgers},
+        queries={"public_journals": journals_query},
+    )
+
+
+async def _get(mock_supabase: MagicMock, params: dict):
+    test_app = create_test_app(mock_supabase, polimoney.router)
+    async with AsyncClient(
+        transport=ASGITransport(app=test_app), base_url="http://testserver"
+    ) as client:
+        return await client.get(EXPORT_PATH, params=params)
+
+
+class TestJournalExportAPI:
+    """仕訳の一括エクスポートAPIのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_exports_journals_of_all_ledgers_in_one_request(self, monkeypatch):
+        monkeypatch.setattr(settings, "journal_page_size", 2)
+        ledgers = [
+            {"id": str(LEDGER_ID_1), "election_id": str(ELECTION_ID)},
+            {"id": str(LEDGER_ID_2), "election_id": None},
+        ]
+        journals_query = paged_query(
+            [[JOURNALS[0], JOURNALS[1]], [ORGANIZATION_JOURNAL], []]
+        )
+
+        response = await _get(
+            _mock_export_supabase(ledgers, journals_query),
+            {"politician_id": str(POLITICIAN_ID_1)},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["ledger_id"] for line in lines] == [
+            str(LEDGER_ID_1),
+            str(LEDGER_ID_1),
+            str(LEDGER_ID_2),
+        ]
+        assert lines[0]["id"] == str(JOURNAL_ID_1)
+        assert lines[0]["category_name"] == "人件費（選挙）"
+        assert lines[0]["type"] == "選挙運動"
+        assert lines[1]["type"] == "立候補準備"
+        assert lines[2]["type"] == "政治活動"
+        assert lines[2]["public_expense_amount"] is None
+
+        journals_query.in_.assert_called_with(
+            "ledger_id", [str(LEDGER_ID_1), str(LEDGER_ID_2)]
+        )
+        assert journals_query.or_.call_args_list[0].args[0] == (
+            f"ledger_id.gt.{LEDGER_ID_1},"
+            f"and(ledger_id.eq.{LEDGER_ID_1},date.is.null,id.gt.{JOURNALS[1]['id']})"
+        )
+        # 複合インデックス idx_public_journals_ledger_date_id と同じ列順で並べる
+        assert [call.args[0] for call in journals_query.order.call_args_list[:3]] == [
+            "ledger_id",
+            "date",
+            "id",
+        ]
+        assert journals_query.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_exports_all_journals_when_pages_are_truncated(self, monkeypatch):
+        # PostgREST の max-rows が JOURNAL_PAGE_SIZE より小さい場合
+        monkeypatch.setattr(settings, "journal_page_size", 1000)
+        ledgers = [
+            {"id": str(LEDGER_ID_1), "election_id": str(ELECTION_ID)},
+            {"id": str(LEDGER_ID_2), "election_id": None},
+        ]
+        journals_query = paged_query(
+            [[JOURNALS[0]], [JOURNALS[1]], [ORGANIZATION_JOURNAL], []]
+        )
+
+        response = await _get(
+            _mock_export_supabase(ledgers, journals_query),
+            {"politician_id": str(POLITICIAN_ID_1)},
+        )
+
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["id"] for line in lines] == [
+            str(JOURNAL_ID_1),
+            JOURNALS[1]["id"],
+            ORGANIZATION_JOURNAL["id"],
+        ]
+        assert journals_query.execute.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_returns_400_without_scope(self):
+        response = await _get(_mock_export_supabase([], paged_query([])), {})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_returns_404_when_scope_has_no_ledgers(self):
+        journals_query = paged_query([])
+
+        response = await _get(
+            _mock_export_supabase([], journals_query),
+            {"election_id": str(ELECTION_ID)},
+        )
+
+        assert response.status_code == 404
+        journals_query.execute.assert_not_awaited()
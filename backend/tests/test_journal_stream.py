@@ -0,0 +1,162 @@
+"""仕訳のキーセットページング取得と台帳のストリーミングのテスト"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config import settings
+from app.routers import polimoney
+from app.utils.journal_stream import iter_journal_pages, journal_keyset_filter
+from tests.supabase_mock import (
+    ELECTION_FUNDS_TABLES,
+    ELECTION_LEDGER_WITH_META,
+    JOURNAL_ID_1,
+    JOURNAL_ID_2,
+    LEDGER_ID_1,
+    create_mock_supabase,
+    create_test_app,
+    paged_query,
+)
+
+JOURNALS = ELECTION_FUNDS_TABLES["public_journals"]
+LEDGER_PATH = f"/api/v1/polimoney/ledgers/{LEDGER_ID_1}/journals"
+
+# 集計列の公費負担合計を、仕訳から求めた値と揃えた台帳
+STREAMED_LEDGER = {**ELECTION_LEDGER_WITH_META, "public_expense_total": 100}
+STREAMED_TABLES = {**ELECTION_FUNDS_TABLES, "public_ledgers": STREAMED_LEDGER}
+
+
+class TestJournalKeysetFilter:
+    """キーセットの条件のテスト"""
+
+    def test_continues_after_dated_journal(self):
+        assert journal_keyset_filter({"id": "j1", "date": "2026-01-10"}) == (
+            "date.gt.2026-01-10,and(date.eq.2026-01-10,id.gt.j1),date.is.null"
+        )
+
+    def test_continues_within_undated_journals(self):
+        assert journal_keyset_filter({"id": "j2", "date": None}) == (
+            "and(date.is.null,id.gt.j2)"
+        )
+
+    def test_continues_after_journal_across_ledgers(self):
+        last_journal = {"ledger_id": "l1", "id": "j1", "date": "2026-01-10"}
+        assert journal_keyset_filter(last_journal, by_ledger=True) == (
+            "ledger_id.gt.l1,and(ledger_id.eq.l1,or(date.gt.2026-01-10,"
+            "and(date.eq.2026-01-10,id.gt.j1),date.is.null))"
+        )
+
+        undated = {"ledger_id": "l1", "id": "j2", "date": None}
+        assert journal_keyset_filter(undated, by_ledger=True) == (
+            "ledger_id.gt.l1,and(ledger_id.eq.l1,date.is.null,id.gt.j2)"
+        )
+
+
+class TestIterJournalPages:
+    """仕訳のページング取得のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_pages_until_empty_page(self):
+        query = paged_query([[JOURNALS[0]], [JOURNALS[1]], []])
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value = query
+
+        pages = [
+            page
+            async for page in iter_journal_pages(
+                mock_supabase, [LEDGER_ID_1], "id, date", page_size=1
+            )
+        ]
+
+        assert pages == [[JOURNALS[0]], [JOURNALS[1]]]
+        assert query.execute.await_count == 3
+        query.order.assert_any_call("date", nullsfirst=False)
+        query.limit.assert_called_with(1)
+        assert [call.args[0] for call in query.or_.call_args_list] == [
+            ",".join(
+                [
+                    "date.gt.2026-01-10",
+                    f"and(date.eq.2026-01-10,id.gt.{JOURNAL_ID_1})",
+                    "date.is.null",
+                ]
+            ),
+            f"and(date.is.null,id.gt.{JOURNAL_ID_2})",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_continues_after_page_truncated_by_max_rows(self):
+        # PostgREST の max-rows が page_size より小さく、1件ずつ返る場合
+        query = paged_query([[JOURNALS[0]], [JOURNALS[1]], []])
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value = query
+
+        pages = [
+            page
+            async for page in iter_journal_pages(
+                mock_supabase, [LEDGER_ID_1], "id, date", page_size=1000
+            )
+        ]
+
+        assert pages == [[JOURNALS[0]], [JOURNALS[1]]]
+        assert query.execute.await_count == 3
+        query.limit.assert_called_with(1000)
+
+
+class TestLedgerStreaming:
+    """仕訳の多い台帳のストリーミングのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_streams_same_json_as_buffered_response(self, monkeypatch):
+        monkeypatch.setattr(settings, "journal_page_size", 1)
+        monkeypatch.setattr(settings, "ledger_stream_threshold", 1)
+        streamed_query = paged_query([[JOURNALS[0]], [JOURNALS[1]], []])
+        stream_app = create_test_app(
+            create_mock_supabase(
+                STREAMED_TABLES, queries={"public_journals": streamed_query}
+            ),
+            polimoney.router,
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=stream_app), base_url="http://testserver"
+        ) as client:
+            streamed = await client.get(LEDGER_PATH)
+
+        monkeypatch.setattr(settings, "ledger_stream_threshold", 0)
+        buffered_app = create_test_app(
+            create_mock_supabase(STREAMED_TABLES), polimoney.router
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=buffered_app), base_url="http://testserver"
+        ) as client:
+            buffered = await client.get(LEDGER_PATH)
+
+        assert streamed.status_code == 200
+        assert streamed.headers["content-type"] == "application/json"
+        assert "etag" not in streamed.headers
+        assert "etag" in buffered.headers
+        assert streamed_query.execute.await_count == 3
+
+        streamed_body = streamed.json()
+        buffered_body = buffered.json()
+        assert streamed_body["data"] == buffered_body["data"]
+        del streamed_body["meta"]["generated_at"]
+        del buffered_body["meta"]["generated_at"]
+        assert streamed_body["meta"] == buffered_body["meta"]
+
+    @pytest.mark.asyncio
+    async def test_streams_empty_data_array(self, monkeypatch):
+        monkeypatch.setattr(settings, "ledger_stream_threshold", 1)
+        test_app = create_test_app(
+            create_mock_supabase(
+                STREAMED_TABLES, queries={"public_journals": paged_query([[]])}
+            ),
+            polimoney.router,
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            response = await client.get(LEDGER_PATH)
+
+        assert response.status_code == 200
+        assert response.json()["data"] == []
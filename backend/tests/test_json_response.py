@@ -0,0 +1,29 @@
+"""JSON レスポンスクラス選択のテスト"""
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.config import settings
+from app.utils.json_response import get_default_response_class
+
+
+class TestGetDefaultResponseClass:
+    """get_default_response_class のテスト"""
+
+    def test_uses_json_response_by_default(self, monkeypatch):
+        monkeypatch.setattr(settings, "orjson_response_enabled", False)
+        assert get_default_response_class() is JSONResponse
+
+    def test_uses_orjson_response_when_enabled(self, monkeypatch):
+        monkeypatch.setattr(settings, "orjson_response_enabled", True)
+        assert get_default_response_class() is ORJSONResponse
+
+    def test_orjson_output_matches_json_response(self):
+        content = {
+            "id": "cccccccc-cccc-cccc-cccc-cccccccccccc",
+            "date": "2026-01-15",
+            "purpose": "ポスター印刷",
+            "amount": 12000,
+            "public_expense_amount": None,
+            "generated_at": "2026-02-02T10:00:00",
+        }
+        assert ORJSONResponse(content).body == JSONResponse(content).body
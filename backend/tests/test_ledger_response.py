@@ -0,0 +1,81 @@
+"""台帳レスポンス組み立てエンジンのテスト"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+
+from app import schemas
+from app.utils.ledger_response import JOURNAL_RESPONSE_SELECT, build_ledger_response
+from tests.supabase_mock import (
+    ORGANIZATION_LEDGER_ID,
+    ORGANIZATION_LEDGER_WITH_META,
+    ORGANIZATION_TABLES,
+    chainable_query,
+    create_mock_supabase,
+)
+
+
+class TestBuildLedgerResponseForOrganization:
+    """政治団体の台帳に対するレスポンス組み立てのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_builds_political_funds_response(self):
+        mock_supabase = create_mock_supabase(ORGANIZATION_TABLES)
+
+        response = await build_ledger_response(
+            mock_supabase,
+            ORGANIZATION_LEDGER_ID,
+            ORGANIZATION_LEDGER_WITH_META,
+            "organization",
+        )
+
+        assert isinstance(response, schemas.PoliticalFundsResponse)
+        assert response.meta.organization.name == "テスト後援会"
+        assert response.meta.summary.balance == 3800
+        item = response.data[0]
+        assert item.type == "政治活動"
+        assert item.category_name == "事務所費"
+        assert item.public_expense_amount is None
+
+    @pytest.mark.asyncio
+    async def test_raises_404_when_organization_missing(self):
+        mock_supabase = create_mock_supabase(ORGANIZATION_TABLES)
+        ledger_data = {**ORGANIZATION_LEDGER_WITH_META, "organizations": None}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await build_ledger_response(
+                mock_supabase, ORGANIZATION_LEDGER_ID, ledger_data, "organization"
+            )
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.detail == "政治団体情報が見つかりません"
+        mock_supabase.table.assert_not_called()
+
+
+class TestFetchJournalsProjection:
+    """仕訳取得の列指定のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_selects_only_response_columns(self):
+        queries: dict[str, MagicMock] = {}
+
+        def table_side_effect(name):
+            queries[name] = chainable_query(ORGANIZATION_TABLES[name])
+            return queries[name]
+
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = table_side_effect
+
+        await build_ledger_response(
+            mock_supabase,
+            ORGANIZATION_LEDGER_ID,
+            ORGANIZATION_LEDGER_WITH_META,
+            "organization",
+        )
+
+        queries["public_journals"].select.assert_called_once_with(
+            JOURNAL_RESPONSE_SELECT
+        )
+        assert "*" not in JOURNAL_RESPONSE_SELECT
+        assert "synced_at" not in JOURNAL_RESPONSE_SELECT
@@ -0,0 +1,96 @@
+"""マスタデータキャッシュのテスト"""
+
+from uuid import UUID
+
+import pytest
+
+from app.utils import master_data
+from app.utils.category import get_election_type_name
+from app.utils.ledger_response import fetch_journals_with_account_names
+from app.utils.master_data import MasterDataCache, MasterDataSnapshot
+from tests.supabase_mock import create_mock_supabase
+
+LEDGER_ID = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
+
+MASTER_TABLES = {
+    "master_metadata": [
+        {"table_name": "account_codes", "last_updated_at": "2026-01-01T00:00:00"},
+        {"table_name": "election_types", "last_updated_at": "2026-01-01T00:00:00"},
+    ],
+    "account_codes": [{"code": "EXP_PERSONNEL_ELEC", "name": "人件費（選挙）"}],
+    "election_types": [{"code": "GM", "name": "市区町村議会議員選挙（マスタ）"}],
+}
+
+
+@pytest.fixture
+def loaded_snapshot(monkeypatch):
+    snapshot = MasterDataSnapshot(
+        version={"account_codes": "v1", "election_types": "v1"},
+        account_code_names={"EXP_PERSONNEL_ELEC": "人件費（選挙）"},
+        election_type_names={"GM": "市区町村議会議員選挙（マスタ）"},
+    )
+    monkeypatch.setattr(master_data.master_data_cache, "_snapshot", snapshot)
+    return snapshot
+
+
+class TestMasterDataCache:
+    """MasterDataCache のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_load_builds_snapshot(self):
+        cache = MasterDataCache()
+        mock_supabase = create_mock_supabase(MASTER_TABLES, [])
+
+        snapshot = await cache.load(mock_supabase)
+
+        assert cache.snapshot is snapshot
+        assert snapshot.account_code_names == {"EXP_PERSONNEL_ELEC": "人件費（選挙）"}
+        assert snapshot.version["election_types"] == "2026-01-01T00:00:00"
+
+    @pytest.mark.asyncio
+    async def test_refresh_only_when_version_changes(self):
+        cache = MasterDataCache()
+        queried_tables: list[str] = []
+        tables = dict(MASTER_TABLES)
+        mock_supabase = create_mock_supabase(tables, queried_tables)
+        await cache.load(mock_supabase)
+        previous = cache.snapshot
+
+        queried_tables.clear()
+        assert await cache.refresh_if_changed(mock_supabase) is False
+        assert queried_tables == ["master_metadata"]
+        assert cache.snapshot is previous
+
+        tables["master_metadata"] = [
+            {"table_name": "account_codes", "last_updated_at": "2026-02-01T00:00:00"},
+            {"table_name": "election_types", "last_updated_at": "2026-01-01T00:00:00"},
+        ]
+        assert await cache.refresh_if_changed(mock_supabase) is True
+        assert cache.snapshot is not previous
+
+
+class TestMasterDataLookups:
+    """マスタデータキャッシュを参照する処理のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_account_names_served_without_query(self, loaded_snapshot):
+        queried_tables: list[str] = []
+        mock_supabase = create_mock_supabase(
+            {
+                "public_journals": [
+                    {"id": "j1", "account_code": "EXP_PERSONNEL_ELEC"},
+                ]
+            },
+            queried_tables,
+        )
+
+        _, account_codes_map = await fetch_journals_with_account_names(
+            mock_supabase, LEDGER_ID
+        )
+
+        assert account_codes_map == {"EXP_PERSONNEL_ELEC": "人件費（選挙）"}
+        assert queried_tables == ["public_journals"]
+
+    def test_election_type_name_prefers_master_data(self, loaded_snapshot):
+        assert get_election_type_name("GM") == "市区町村議会議員選挙（マスタ）"
+        assert get_election_type_name("HR") == "衆議院議員選挙"
@@ -0,0 +1,130 @@
+"""MessagePack レスポンスのテスト"""
+
+from unittest.mock import MagicMock
+from uuid import UUID
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.routers import polimoney
+from app.utils.msgpack_response import MSGPACK_MEDIA_TYPE, accepts_msgpack
+from tests.supabase_mock import (
+    DISTRICT_ID,
+    ELECTION_FUNDS_TABLES,
+    ELECTION_ID,
+    ELECTION_ID_2,
+    LEDGER_ID_1,
+    chainable_query,
+    create_mock_supabase,
+    create_test_app,
+)
+
+msgpack = pytest.importorskip("msgpack")
+
+LEDGER_PATH = f"/api/v1/polimoney/ledgers/{LEDGER_ID_1}/journals"
+
+
+class TestAcceptsMsgpack:
+    """Accept ヘッダーの判定のテスト"""
+
+    @pytest.mark.parametrize(
+        "accept, expected",
+        [
+            (None, False),
+            ("application/json", False),
+            ("*/*", False),
+            ("application/msgpack", True),
+            ("application/x-msgpack", True),
+            ("application/msgpack, application/json;q=0.5", True),
+            ("application/json, application/msgpack;q=0.5", False),
+            ("application/msgpack;q=0", False),
+        ],
+    )
+    def test_negotiates_by_quality(self, accept, expected):
+        assert accepts_msgpack(accept) is expected
+
+
+class TestMsgpackLedgerJournals:
+    """台帳の収支データの MessagePack 応答のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_encodes_same_body_with_native_integers_and_uuids(self):
+        test_app = create_test_app(
+            create_mock_supabase(ELECTION_FUNDS_TABLES), polimoney.router
+        )
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            as_json = await client.get(LEDGER_PATH)
+            as_msgpack = await client.get(
+                LEDGER_PATH, headers={"Accept": MSGPACK_MEDIA_TYPE}
+            )
+            not_modified = await client.get(
+                LEDGER_PATH,
+                headers={
+                    "Accept": MSGPACK_MEDIA_TYPE,
+                    "If-None-Match": as_msgpack.headers["etag"],
+                },
+            )
+
+        assert as_json.headers["content-type"] == "application/json"
+        assert as_msgpack.status_code == 200
+        assert as_msgpack.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert as_msgpack.headers["vary"] == "Accept"
+        assert as_msgpack.headers["etag"] != as_json.headers["etag"]
+        assert not_modified.status_code == 304
+
+        body = msgpack.unpackb(as_msgpack.content)
+        expected = as_json.json()
+        item = body["data"][0]
+        assert UUID(bytes=item["id"]) == UUID(expected["data"][0]["id"])
+        assert isinstance(item["amount"], int)
+        assert item["amount"] == expected["data"][0]["amount"]
+        assert body["meta"]["summary"] == expected["meta"]["summary"]
+        assert body["meta"]["generated_at"] == expected["meta"]["generated_at"]
+
+
+class TestMsgpackElections:
+    """選挙一覧の MessagePack 応答のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_returns_msgpack_when_requested(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value = chainable_query(
+            [
+                {
+                    "id": str(ELECTION_ID),
+                    "name": "選挙",
+                    "type": "general",
+                    "election_date": "2024-01-01",
+                    "district_id": str(DISTRICT_ID),
+                    "district_name": "第1区",
+                },
+                {
+                    "id": str(ELECTION_ID_2),
+                    "name": "選挙2",
+                    "type": "general",
+                    "election_date": "2026-01-01",
+                    "district_id": None,
+                    "district_name": None,
+                },
+            ]
+        )
+
+        test_app = create_test_app(mock_supabase, polimoney.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            response = await client.get(
+                "/api/v1/polimoney/elections",
+                headers={"Accept": MSGPACK_MEDIA_TYPE},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+        assert "max-age" in response.headers["cache-control"]
+        body = msgpack.unpackb(response.content)
+        assert {UUID(bytes=election["id"]) for election in body["data"]} == {
+            ELECTION_ID,
+            ELECTION_ID_2,
+        }
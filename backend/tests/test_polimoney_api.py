@@ -1,74 +1,35 @@
 """Polimoney APIのテスト"""
 
 from unittest.mock import MagicMock
-from uuid import UUID, uuid4
+from uuid import uuid4
 
 import pytest
-from fastapi import FastAPI, status
-from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 from httpx import ASGITransport, AsyncClient
 
-from app.database.supabase import get_supabase_client_dep
+from app import schemas
 from app.routers import polimoney
-from app.utils.election_funds_response import sum_public_expense_by_ledger
-from app.utils.polimoney_response import MultipleCandidatesException
-
-ELECTION_ID = UUID("11111111-1111-1111-1111-111111111111")
-ELECTION_ID_2 = UUID("22222222-2222-2222-2222-222222222222")
-POLITICIAN_ID_1 = UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
-POLITICIAN_ID_2 = UUID("bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb")
-LEDGER_ID_1 = UUID("cccccccc-cccc-cccc-cccc-cccccccccccc")
-LEDGER_ID_2 = UUID("dddddddd-dddd-dddd-dddd-dddddddddddd")
-NON_ELECTION_LEDGER_ID = UUID("eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee")
-MISSING_ELECTION_ID = UUID("ffffffff-ffff-ffff-ffff-ffffffffffff")
-
-
-def _make_execute_response(data):
-    response = MagicMock()
-    response.data = data
-    return response
-
-
-def _chainable_query(final_data):
-    query = MagicMock()
-
-    def configure(method_name):
-        def chained(*_args, **_kwargs):
-            return query
-
-        setattr(query, method_name, chained)
-
-    for method_name in (
-        "select",
-        "eq",
-        "not_",
-        "is_",
-        "in_",
-        "order",
-        "maybe_single",
-        "single",
-    ):
-        configure(method_name)
-
-    query.not_.is_ = MagicMock(return_value=query)
-    query.execute.return_value = _make_execute_response(final_data)
-    return query
-
-
-def _create_test_app(mock_supabase: MagicMock) -> FastAPI:
-    test_app = FastAPI()
-
-    @test_app.exception_handler(MultipleCandidatesException)
-    async def multiple_candidates_exception_handler(_request, exc):
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content=exc.error.model_dump(mode="json"),
-        )
-
-    test_app.include_router(polimoney.router, prefix="/api/v1")
-    test_app.dependency_overrides[get_supabase_client_dep] = lambda: mock_supabase
-    return test_app
+from app.utils.ledger_response import (
+    build_columnar_journal_data,
+    sum_public_expense_by_ledger,
+)
+from tests.supabase_mock import (
+    DISTRICT_ID,
+    ELECTION_FUNDS_TABLES,
+    ELECTION_ID,
+    ELECTION_ID_2,
+    ELECTION_LEDGER_ROW,
+    ELECTION_LEDGER_WITH_META,
+    ELECTION_WITH_META,
+    LEDGER_ID_1,
+    LEDGER_ID_2,
+    MISSING_ELECTION_ID,
+    NON_ELECTION_LEDGER_ID,
+    POLITICIAN_ID_1,
+    POLITICIAN_ID_2,
+    chainable_query,
+    create_test_app,
+)
 
 
 class TestSumPublicExpenseByLedger:
@@ -98,51 +59,42 @@ class TestSumPublicExpenseByLedger:
 class TestPolimoneyElectionsAPI:
     """公開選挙一覧APIのテスト"""
 
-    def test_deduplicates_and_sorts_elections(self):
+    def test_returns_elections_from_published_view(self):
         mock_supabase = MagicMock()
-        mock_supabase.table.return_value = _chainable_query(
+        mock_supabase.table.return_value = chainable_query(
             [
                 {
-                    "election_id": str(ELECTION_ID),
-                    "elections": {
-                        "id": str(ELECTION_ID),
-                        "name": "古い選挙",
-                        "type": "general",
-                        "election_date": "2024-01-01",
-                        "district": {"id": str(uuid4()), "name": "第1区"},
-                    },
-                },
-                {
-                    "election_id": str(ELECTION_ID),
-                    "elections": {
-                        "id": str(ELECTION_ID),
-                        "name": "古い選挙",
-                        "type": "general",
-                        "election_date": "2024-01-01",
-                        "district": {"id": str(uuid4()), "name": "第1区"},
-                    },
+                    "id": str(ELECTION_ID_2),
+                    "name": "新しい選挙",
+                    "type": "general",
+                    "election_date": "2026-01-01",
+                    "district_id": str(DISTRICT_ID),
+                    "district_name": "第2区",
                 },
                 {
-                    "election_id": str(ELECTION_ID_2),
-                    "elections": {
-                        "id": str(ELECTION_ID_2),
-                        "name": "新しい選挙",
-                        "type": "general",
-                        "election_date": "2026-01-01",
-                        "district": {"id": str(uuid4()), "name": "第2区"},
-                    },
+                    "id": str(ELECTION_ID),
+                    "name": "古い選挙",
+                    "type": "general",
+                    "election_date": "2024-01-01",
+                    "district_id": None,
+                    "district_name": None,
                 },
             ]
         )
 
-        client = TestClient(_create_test_app(mock_supabase))
+        client = TestClient(create_test_app(mock_supabase, polimoney.router))
         response = client.get("/api/v1/polimoney/elections")
 
         assert response.status_code == 200
+        mock_supabase.table.assert_called_once_with("published_elections")
+        assert "stale-while-revalidate=" in response.headers["cache-control"]
         body = response.json()
         assert body["total_count"] == 2
         assert body["data"][0]["name"] == "新しい選挙"
+        assert body["data"][0]["district_id"] == str(DISTRICT_ID)
+        assert body["data"][0]["district_name"] == "第2区"
         assert body["data"][1]["name"] == "古い選挙"
+        assert body["data"][1]["district_id"] is None
 
 
 class TestPolimoneyElectionJournalsAPI:
@@ -151,12 +103,12 @@ class TestPolimoneyElectionJournalsAPI:
     @pytest.mark.asyncio
     async def test_returns_404_when_election_not_found(self):
         mock_supabase = MagicMock()
-        elections_query = _chainable_query(None)
-        mock_supabase.table.side_effect = (
-            lambda name: elections_query if name == "elections" else MagicMock()
+        elections_query = chainable_query(None)
+        mock_supabase.table.side_effect = lambda name: (
+            elections_query if name == "elections" else MagicMock()
         )
 
-        test_app = _create_test_app(mock_supabase)
+        test_app = create_test_app(mock_supabase, polimoney.router)
         async with AsyncClient(
             transport=ASGITransport(app=test_app),
             base_url="http://testserver",
@@ -171,28 +123,26 @@ class TestPolimoneyElectionJournalsAPI:
     @pytest.mark.asyncio
     async def test_returns_400_when_multiple_candidates_without_politician_id(self):
         mock_supabase = MagicMock()
-
-        def table_side_effect(name):
-            if name == "elections":
-                return _chainable_query({"id": str(ELECTION_ID)})
-            if name == "public_ledgers":
-                return _chainable_query(
-                    [
-                        {
-                            "id": str(LEDGER_ID_1),
-                            "politician_id": str(POLITICIAN_ID_1),
-                        },
+        mock_supabase.table.side_effect = lambda name: (
+            chainable_query(
+                {
+                    **ELECTION_WITH_META,
+                    "public_ledgers": [
+                        {**ELECTION_LEDGER_ROW, "politicians": None},
                         {
+                            **ELECTION_LEDGER_ROW,
                             "id": str(LEDGER_ID_2),
                             "politician_id": str(POLITICIAN_ID_2),
+                            "politicians": None,
                         },
-                    ]
-                )
-            return MagicMock()
-
-        mock_supabase.table.side_effect = table_side_effect
+                    ],
+                }
+            )
+            if name == "elections"
+            else MagicMock()
+        )
 
-        test_app = _create_test_app(mock_supabase)
+        test_app = create_test_app(mock_supabase, polimoney.router)
         async with AsyncClient(
             transport=ASGITransport(app=test_app),
             base_url="http://testserver",
@@ -206,6 +156,66 @@ class TestPolimoneyElectionJournalsAPI:
         assert "error" in body
         assert len(body["candidates"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_returns_404_when_no_ledger_for_election(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: (
+            chainable_query({**ELECTION_WITH_META, "public_ledgers": []})
+            if name == "elections"
+            else MagicMock()
+        )
+
+        test_app = create_test_app(mock_supabase, polimoney.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://testserver",
+        ) as client:
+            response = await client.get(
+                f"/api/v1/polimoney/elections/{ELECTION_ID}/journals",
+                params={"politician_id": str(POLITICIAN_ID_2)},
+            )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "選挙資金の台帳が見つかりません"
+
+    @pytest.mark.asyncio
+    async def test_resolves_ledger_in_single_upstream_call(self):
+        mock_supabase = MagicMock()
+        queried_tables: list[str] = []
+        tables = {
+            **ELECTION_FUNDS_TABLES,
+            "elections": {
+                **ELECTION_WITH_META,
+                "public_ledgers": [
+                    {
+                        **ELECTION_LEDGER_ROW,
+                        "politicians": ELECTION_LEDGER_WITH_META["politicians"],
+                    }
+                ],
+            },
+        }
+
+        def table_side_effect(name):
+            queried_tables.append(name)
+            return chainable_query(tables[name])
+
+        mock_supabase.table.side_effect = table_side_effect
+
+        test_app = create_test_app(mock_supabase, polimoney.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://testserver",
+        ) as client:
+            response = await client.get(
+                f"/api/v1/polimoney/elections/{ELECTION_ID}/journals"
+            )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["meta"]["election"]["district_name"] == "テスト市"
+        assert body["meta"]["politician"]["name"] == "候補者A"
+        assert queried_tables == ["elections", "public_journals", "account_codes"]
+
 
 class TestPolimoneyElectionCandidatesAPI:
     """候補者一覧APIのテスト"""
@@ -213,9 +223,9 @@ class TestPolimoneyElectionCandidatesAPI:
     @pytest.mark.asyncio
     async def test_returns_404_when_election_not_found(self):
         mock_supabase = MagicMock()
-        mock_supabase.table.return_value = _chainable_query(None)
+        mock_supabase.table.return_value = chainable_query(None)
 
-        test_app = _create_test_app(mock_supabase)
+        test_app = create_test_app(mock_supabase, polimoney.router)
         async with AsyncClient(
             transport=ASGITransport(app=test_app),
             base_url="http://testserver",
@@ -228,14 +238,16 @@ class TestPolimoneyElectionCandidatesAPI:
         assert response.json()["detail"] == "選挙情報が見つかりません"
 
     @pytest.mark.asyncio
-    async def test_aggregates_public_expense_total(self):
+    async def test_returns_stored_public_expense_total(self):
         mock_supabase = MagicMock()
+        queried_tables: list[str] = []
 
         def table_side_effect(name):
+            queried_tables.append(name)
             if name == "elections":
-                return _chainable_query({"id": str(ELECTION_ID)})
+                return chainable_query({"id": str(ELECTION_ID)})
             if name == "public_ledgers":
-                return _chainable_query(
+                return chainable_query(
                     [
                         {
                             "id": str(LEDGER_ID_1),
@@ -243,6 +255,7 @@ class TestPolimoneyElectionCandidatesAPI:
                             "total_income": 1000,
                             "total_expense": 400,
                             "journal_count": 2,
+                            "public_expense_total": 150,
                             "politicians": {
                                 "id": str(POLITICIAN_ID_1),
                                 "name": "候補者A",
@@ -251,28 +264,11 @@ class TestPolimoneyElectionCandidatesAPI:
                         }
                     ]
                 )
-            if name == "public_journals":
-                return _chainable_query(
-                    [
-                        {
-                            "ledger_id": str(LEDGER_ID_1),
-                            "public_expense_amount": 100,
-                        },
-                        {
-                            "ledger_id": str(LEDGER_ID_1),
-                            "public_expense_amount": 0,
-                        },
-                        {
-                            "ledger_id": str(LEDGER_ID_1),
-                            "public_expense_amount": 50,
-                        },
-                    ]
-                )
             return MagicMock()
 
         mock_supabase.table.side_effect = table_side_effect
 
-        test_app = _create_test_app(mock_supabase)
+        test_app = create_test_app(mock_supabase, polimoney.router)
         async with AsyncClient(
             transport=ASGITransport(app=test_app),
             base_url="http://testserver",
@@ -285,6 +281,7 @@ class TestPolimoneyElectionCandidatesAPI:
         candidate = response.json()["data"][0]
         assert candidate["summary"]["public_expense_total"] == 150
         assert candidate["summary"]["balance"] == 600
+        assert "public_journals" not in queried_tables
 
 
 class TestPolimoneyLedgerJournalsAPI:
@@ -293,7 +290,7 @@ class TestPolimoneyLedgerJournalsAPI:
     @pytest.mark.asyncio
     async def test_returns_400_for_non_election_ledger(self):
         mock_supabase = MagicMock()
-        mock_supabase.table.return_value = _chainable_query(
+        mock_supabase.table.return_value = chainable_query(
             {
                 "id": str(NON_ELECTION_LEDGER_ID),
                 "election_id": None,
@@ -311,7 +308,7 @@ class TestPolimoneyLedgerJournalsAPI:
             }
         )
 
-        test_app = _create_test_app(mock_supabase)
+        test_app = create_test_app(mock_supabase, polimoney.router)
         async with AsyncClient(
             transport=ASGITransport(app=test_app),
             base_url="http://testserver",
@@ -326,9 +323,9 @@ class TestPolimoneyLedgerJournalsAPI:
     @pytest.mark.asyncio
     async def test_returns_404_when_ledger_not_found(self):
         mock_supabase = MagicMock()
-        mock_supabase.table.return_value = _chainable_query(None)
+        mock_supabase.table.return_value = chainable_query(None)
 
-        test_app = _create_test_app(mock_supabase)
+        test_app = create_test_app(mock_supabase, polimoney.router)
         async with AsyncClient(
             transport=ASGITransport(app=test_app),
             base_url="http://testserver",
@@ -337,3 +334,124 @@ class TestPolimoneyLedgerJournalsAPI:
 
         assert response.status_code == 404
         assert response.json()["detail"] == "台帳が見つかりません"
+
+
+class TestElectionFundsLedgerJournals:
+    """選挙資金レスポンス組み立てのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_builds_response_from_embedded_meta(self):
+        queried_tables: list[str] = []
+        mock_supabase = MagicMock()
+
+        def table_side_effect(name):
+            queried_tables.append(name)
+            return chainable_query(ELECTION_FUNDS_TABLES[name])
+
+        mock_supabase.table.side_effect = table_side_effect
+
+        test_app = create_test_app(mock_supabase, polimoney.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://testserver",
+        ) as client:
+            response = await client.get(
+                f"/api/v1/polimoney/ledgers/{LEDGER_ID_1}/journals"
+            )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["meta"]["politician"]["name"] == "候補者A"
+        assert body["meta"]["election"]["district_name"] == "テスト市"
+        assert body["meta"]["election"]["type_name"] == "市区町村議会議員選挙"
+        assert body["meta"]["summary"]["public_expense_total"] == 100
+        assert body["data"][0]["category_name"] == "人件費（選挙）"
+        assert body["data"][1]["type"] == "立候補準備"
+        assert body["data"][1]["public_expense_amount"] is None
+        assert queried_tables == ["public_ledgers", "public_journals", "account_codes"]
+
+    @pytest.mark.asyncio
+    async def test_returns_404_when_embedded_district_missing(self):
+        ledger_data = {
+            **ELECTION_LEDGER_WITH_META,
+            "elections": {**ELECTION_LEDGER_WITH_META["elections"], "district": None},
+        }
+        mock_supabase = MagicMock()
+        mock_supabase.table.return_value = chainable_query(ledger_data)
+
+        test_app = create_test_app(mock_supabase, polimoney.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://testserver",
+        ) as client:
+            response = await client.get(
+                f"/api/v1/polimoney/ledgers/{LEDGER_ID_1}/journals"
+            )
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "選挙区情報が見つかりません"
+
+    @pytest.mark.asyncio
+    async def test_returns_columnar_format_with_dictionary_encoding(self):
+        mock_supabase = MagicMock()
+        mock_supabase.table.side_effect = lambda name: chainable_query(
+            ELECTION_FUNDS_TABLES[name]
+        )
+
+        test_app = create_test_app(mock_supabase, polimoney.router)
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://testserver",
+        ) as client:
+            rows = await client.get(f"/api/v1/polimoney/ledgers/{LEDGER_ID_1}/journals")
+            columnar = await client.get(
+                f"/api/v1/polimoney/ledgers/{LEDGER_ID_1}/journals",
+                params={"format": "columnar"},
+            )
+
+        assert columnar.status_code == 200
+        assert columnar.headers["etag"] != rows.headers["etag"]
+        body = columnar.json()
+        assert body["meta"] == rows.json()["meta"]
+
+        data = body["data"]
+        assert data["count"] == len(rows.json()["data"])
+        assert set(data["dictionaries"]) == {"category", "category_name", "type"}
+
+        # 列形式を行に戻すと行形式と一致する
+        decoded = [
+            {
+                field: (
+                    data["dictionaries"][field][values[index]]
+                    if field in data["dictionaries"]
+                    else values[index]
+                )
+                for field, values in data["columns"].items()
+            }
+            for index in range(data["count"])
+        ]
+        assert decoded == rows.json()["data"]
+
+    def test_columnar_schema_example_matches_builder(self):
+        example = schemas.ColumnarJournalData.model_config["json_schema_extra"][
+            "example"
+        ]
+        data_items = [
+            schemas.ElectionFundsDataItem(
+                **{
+                    field: (
+                        example["dictionaries"][field][values[index]]
+                        if field in example["dictionaries"]
+                        else values[index]
+                    )
+                    for field, values in example["columns"].items()
+                }
+            )
+            for index in range(example["count"])
+        ]
+
+        # OpenAPI の例は、実際の列形式への変換結果と同じ形である
+        assert (
+            build_columnar_journal_data(data_items, "election").model_dump(mode="json")
+            == example
+        )
@@ -0,0 +1,246 @@
+"""台帳レスポンスキャッシュのテスト"""
+
+import asyncio
+import gc
+import tracemalloc
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic_core import to_json
+
+from app import schemas
+from app.routers import polimoney
+from app.utils import master_data
+from app.utils.ledger_response import (
+    LEDGER_JOURNALS_SIZE_FACTOR,
+    build_conditional_ledger_response,
+    build_journal_data_items,
+    build_ledger_response,
+)
+from app.utils.master_data import MasterDataSnapshot
+from app.utils.response_cache import LRUResponseCache, ledger_response_cache
+from tests.supabase_mock import (
+    ELECTION_FUNDS_TABLES,
+    ELECTION_LEDGER_WITH_META,
+    chainable_query,
+    create_mock_supabase,
+    create_test_app,
+)
+
+LEDGER_ID = UUID(ELECTION_LEDGER_WITH_META["id"])
+
+
+def _master_data_snapshot(version: str, personnel_name: str) -> MasterDataSnapshot:
+    return MasterDataSnapshot(
+        version={"account_codes": version, "election_types": version},
+        account_code_names={
+            "EXP_PERSONNEL_ELEC": personnel_name,
+            "EXP_PRINTING_ELEC": "印刷費（選挙）",
+        },
+        election_type_names={},
+    )
+
+
+class TestLRUResponseCache:
+    """LRUResponseCache のテスト"""
+
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        cache = LRUResponseCache(max_bytes=100)
+        cache.put("a", "A", 40)
+        cache.put("b", "B", 40)
+        assert cache.get("a") == "A"
+
+        cache.put("c", "C", 40)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.entries == 2
+        assert stats.size_bytes == 80
+        assert stats.hits == 3
+        assert stats.misses == 1
+
+    def test_skips_values_larger_than_max_bytes(self):
+        cache = LRUResponseCache(max_bytes=0)
+        cache.put("a", "A", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats().entries == 0
+
+
+class TestLedgerResponseCaching:
+    """台帳レスポンス組み立てのキャッシュ利用のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_journals_until_last_updated_at_changes(self):
+        queried_tables: list[str] = []
+        mock_supabase = create_mock_supabase(ELECTION_FUNDS_TABLES, queried_tables)
+        hits_before = ledger_response_cache.stats().hits
+
+        first = await build_ledger_response(
+            mock_supabase, LEDGER_ID, ELECTION_LEDGER_WITH_META, "election"
+        )
+        second = await build_ledger_response(
+            mock_supabase, LEDGER_ID, ELECTION_LEDGER_WITH_META, "election"
+        )
+
+        assert queried_tables == ["public_journals", "account_codes"]
+        assert second.data == first.data
+        assert second.meta.summary.public_expense_total == 100
+        assert ledger_response_cache.stats().hits == hits_before + 1
+
+        updated_ledger = {
+            **ELECTION_LEDGER_WITH_META,
+            "last_updated_at": "2026-03-01T00:00:00+00:00",
+        }
+        await build_ledger_response(
+            mock_supabase, LEDGER_ID, updated_ledger, "election"
+        )
+
+        assert queried_tables.count("public_journals") == 2
+
+    @pytest.mark.asyncio
+    async def test_rendered_json_is_reused_and_matches_response_model(self):
+        mock_supabase = create_mock_supabase(ELECTION_FUNDS_TABLES, [])
+
+        first = await build_conditional_ledger_response(
+            mock_supabase,
+            LEDGER_ID,
+            ELECTION_LEDGER_WITH_META,
+            "election",
+            render="json",
+        )
+        second = await build_conditional_ledger_response(
+            mock_supabase,
+            LEDGER_ID,
+            ELECTION_LEDGER_WITH_META,
+            "election",
+            render="json",
+        )
+
+        # 2回目はレンダリング済みの JSON を返し、本体を組み立てない
+        assert second.body is None
+        assert second.content == first.content
+        assert second.etag == first.etag
+
+        # response_model を通した FastAPI の出力とバイト単位で一致する
+        test_app = FastAPI()
+
+        @test_app.get("/model", response_model=schemas.ElectionFundsResponse)
+        async def via_response_model():
+            return first.body
+
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app), base_url="http://testserver"
+        ) as client:
+            expected = await client.get("/model")
+
+        assert first.content == expected.content
+
+    @pytest.mark.asyncio
+    async def test_master_data_update_rebuilds_journals_and_changes_etag(
+        self, monkeypatch
+    ):
+        queried_tables: list[str] = []
+        mock_supabase = create_mock_supabase(ELECTION_FUNDS_TABLES, queried_tables)
+        monkeypatch.setattr(
+            master_data.master_data_cache,
+            "_snapshot",
+            _master_data_snapshot("v1", "人件費（選挙）"),
+        )
+
+        first = await build_conditional_ledger_response(
+            mock_supabase, LEDGER_ID, ELECTION_LEDGER_WITH_META, "election"
+        )
+        cached = await build_conditional_ledger_response(
+            mock_supabase, LEDGER_ID, ELECTION_LEDGER_WITH_META, "election"
+        )
+        monkeypatch.setattr(
+            master_data.master_data_cache,
+            "_snapshot",
+            _master_data_snapshot("v2", "人件費（選挙運動）"),
+        )
+        renamed = await build_conditional_ledger_response(
+            mock_supabase, LEDGER_ID, ELECTION_LEDGER_WITH_META, "election"
+        )
+
+        assert queried_tables == ["public_journals", "public_journals"]
+        assert cached.etag == first.etag
+        assert renamed.etag != first.etag
+        assert first.body.data[0].category_name == "人件費（選挙）"
+        assert renamed.body.data[0].category_name == "人件費（選挙運動）"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_requests_share_ledger_lookup(self):
+        ledger_query = chainable_query(ELECTION_LEDGER_WITH_META)
+        ledger_response = ledger_query.execute.return_value
+
+        async def slow_execute():
+            # 最初の問い合わせが終わる前に、他のリクエストが台帳の取得に到達するようにする
+            await asyncio.sleep(0.01)
+            return ledger_response
+
+        ledger_query.execute = AsyncMock(side_effect=slow_execute)
+        queried_tables: list[str] = []
+        mock_supabase = create_mock_supabase(
+            ELECTION_FUNDS_TABLES,
+            queried_tables,
+            queries={"public_ledgers": ledger_query},
+        )
+
+        async with AsyncClient(
+            transport=ASGITransport(
+                app=create_test_app(mock_supabase, polimoney.router)
+            ),
+            base_url="http://testserver",
+        ) as client:
+            responses = await asyncio.gather(
+                *(
+                    client.get(f"/api/v1/polimoney/ledgers/{LEDGER_ID}/journals")
+                    for _ in range(5)
+                )
+            )
+
+        assert [response.status_code for response in responses] == [200] * 5
+        assert ledger_query.execute.await_count == 1
+        assert queried_tables.count("public_journals") == 1
+
+
+class TestLedgerJournalsSizeEstimate:
+    """仕訳から組み立てた部分の推定サイズのテスト"""
+
+    def test_size_factor_covers_retained_memory(self):
+        template = ELECTION_FUNDS_TABLES["public_journals"][0]
+        account_codes_map = {"EXP_PERSONNEL_ELEC": "人件費（選挙）"}
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            journals_data = [
+                {
+                    **template,
+                    "id": str(uuid4()),
+                    "description": f"{template['description']} {index}",
+                    "amount": 1000 + index,
+                    "content_hash": uuid4().hex,
+                }
+                for index in range(2000)
+            ]
+            estimated = len(to_json(journals_data)) * LEDGER_JOURNALS_SIZE_FACTOR
+            data_items = build_journal_data_items(
+                journals_data, account_codes_map, "election"
+            )
+            del journals_data
+            gc.collect()
+            retained, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(data_items) == 2000
+        # 推定サイズはキャッシュが実際に保持するメモリを下回らない
+        assert retained <= estimated < retained * 2
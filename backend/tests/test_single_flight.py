@@ -0,0 +1,66 @@
+"""single-flight のテスト"""
+
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """SingleFlight のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight(timeout=1)
+        release = asyncio.Event()
+        calls = 0
+
+        async def build() -> str:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "built"
+
+        waiters = [asyncio.create_task(flight.do("key", build)) for _ in range(10)]
+        await asyncio.sleep(0)
+        assert flight.in_flight() == 1
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["built"] * 10
+        assert calls == 1
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        flight = SingleFlight(timeout=1)
+        release = asyncio.Event()
+
+        async def build() -> str:
+            await release.wait()
+            raise ValueError("upstream failed")
+
+        waiters = [asyncio.create_task(flight.do("key", build)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.in_flight() == 0
+
+    @pytest.mark.asyncio
+    async def test_waiter_timeout_does_not_cancel_shared_execution(self):
+        flight = SingleFlight(timeout=0.01)
+        release = asyncio.Event()
+
+        async def build() -> str:
+            await release.wait()
+            return "built"
+
+        with pytest.raises(TimeoutError):
+            await flight.do("key", build)
+
+        assert flight.in_flight() == 1
+        flight.timeout = 1
+        release.set()
+        assert await flight.do("key", build) == "built"
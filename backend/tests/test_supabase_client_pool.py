@@ -0,0 +1,82 @@
+"""Supabaseクライアントプールのテスト"""
+
+import pytest
+
+from app.config import settings
+from app.database import supabase as supabase_module
+from app.database.supabase import SupabaseClientPool, get_supabase_client
+
+SUPABASE_URL = "https://example.supabase.co"
+
+
+def _create_pool() -> SupabaseClientPool:
+    return SupabaseClientPool(
+        SUPABASE_URL,
+        max_connections=10,
+        max_keepalive_connections=5,
+        keepalive_expiry=5.0,
+        http2=False,
+        timeout=10.0,
+    )
+
+
+class TestSupabaseClientPool:
+    """APIキーごとの共有クライアントのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_for_same_key(self):
+        pool = _create_pool()
+        try:
+            assert pool.get("publishable-key") is pool.get("publishable-key")
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_separates_clients_but_shares_transport(self):
+        pool = _create_pool()
+        try:
+            public_client = pool.get("publishable-key")
+            admin_client = pool.get("secret-key")
+
+            assert public_client is not admin_client
+            public_session = public_client.postgrest.session
+            admin_session = admin_client.postgrest.session
+            assert public_session is not admin_session
+            assert public_session._transport is admin_session._transport
+            assert public_session.headers["apikey"] == "publishable-key"
+            assert admin_session.headers["apikey"] == "secret-key"
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_rejects_get_after_close(self):
+        pool = _create_pool()
+        pool.get("publishable-key")
+        await pool.close()
+
+        with pytest.raises(RuntimeError):
+            pool.get("publishable-key")
+
+
+class TestGetSupabaseClient:
+    """プールからのクライアント取得のテスト"""
+
+    @pytest.fixture(autouse=True)
+    def supabase_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "supabase_url", SUPABASE_URL)
+        monkeypatch.setattr(settings, "supabase_publishable_key", "publishable-key")
+
+    @pytest.mark.asyncio
+    async def test_returns_shared_client_from_open_pool(self, monkeypatch):
+        pool = _create_pool()
+        monkeypatch.setattr(supabase_module, "_pool", pool)
+        try:
+            assert get_supabase_client() is pool.get("publishable-key")
+        finally:
+            await pool.close()
+
+    def test_rejects_call_without_open_pool(self, monkeypatch):
+        monkeypatch.setattr(supabase_module, "_pool", None)
+
+        with pytest.raises(RuntimeError):
+            get_supabase_client()
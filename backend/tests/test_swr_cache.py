@@ -0,0 +1,88 @@
+"""stale-while-revalidate キャッシュのテスト"""
+
+import asyncio
+
+import pytest
+
+from app.utils.swr_cache import StaleWhileRevalidateCache
+
+
+class _CountingLoader:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> int:
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+
+class TestStaleWhileRevalidateCache:
+    """StaleWhileRevalidateCache のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_cold_requests_share_one_load(self):
+        cache: StaleWhileRevalidateCache[int] = StaleWhileRevalidateCache(
+            ttl=60, stale_while_revalidate=60
+        )
+        loader = _CountingLoader()
+        loader.release.clear()
+
+        pending = [asyncio.create_task(cache.get(loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        loader.release.set()
+
+        assert await asyncio.gather(*pending) == [1, 1, 1, 1, 1]
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_value_while_refreshing(self):
+        cache: StaleWhileRevalidateCache[int] = StaleWhileRevalidateCache(
+            ttl=0, stale_while_revalidate=60
+        )
+        loader = _CountingLoader()
+        assert await cache.get(loader) == 1
+
+        loader.release.clear()
+        assert await cache.get(loader) == 1
+        assert await cache.get(loader) == 1
+        loader.release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert loader.calls == 2
+        assert await cache.get(loader) == 2
+
+    @pytest.mark.asyncio
+    async def test_keeps_stale_value_when_refresh_fails(self):
+        cache: StaleWhileRevalidateCache[int] = StaleWhileRevalidateCache(
+            ttl=0, stale_while_revalidate=60
+        )
+        assert await cache.get(_CountingLoader()) == 1
+
+        async def failing_loader() -> int:
+            raise RuntimeError("upstream unavailable")
+
+        assert await cache.get(failing_loader) == 1
+        await asyncio.sleep(0)
+        assert await cache.get(failing_loader) == 1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_load_after_stale_window(self, monkeypatch):
+        cache: StaleWhileRevalidateCache[int] = StaleWhileRevalidateCache(
+            ttl=60, stale_while_revalidate=300
+        )
+        loader = _CountingLoader()
+        assert await cache.get(loader) == 1
+
+        monkeypatch.setattr(cache, "_loaded_at", cache._loaded_at - 361)
+        assert await cache.get(loader) == 2
+
+        async def failing_loader() -> int:
+            raise RuntimeError("upstream unavailable")
+
+        monkeypatch.setattr(cache, "_loaded_at", cache._loaded_at - 361)
+        with pytest.raises(RuntimeError):
+            await cache.get(failing_loader)
@@ -0,0 +1,127 @@
+-- ============================================
+-- 選挙資金レスポンスをサーバー側で組み立てる RPC 関数
+-- Supabase SQL Editor で実行してください
+-- ============================================
+
+-- バックエンドの ELECTION_FUNDS_RPC_ENABLED=true 時に supabase.rpc から呼び出される。
+-- 台帳（メタ情報を埋め込んだ行）・サマリー・ElectionFundsDataItem 形式の仕訳一覧を
+-- 1つの JSONB で返す。台帳が存在しない、または選挙台帳でない場合は NULL を返す。
+-- カテゴリ導出は backend/app/utils/category.py と同じ規則で行う。
+CREATE OR REPLACE FUNCTION get_election_funds_response(p_ledger_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'ledger', to_jsonb(l) || jsonb_build_object(
+            'politicians', (
+                SELECT jsonb_build_object('id', p.id, 'name', p.name, 'name_kana', p.name_kana)
+                FROM politicians p
+                WHERE p.id = l.politician_id
+            ),
+            'elections', (
+                SELECT jsonb_build_object(
+                    'id', e.id,
+                    'name', e.name,
+                    'type', e.type,
+                    'election_date', e.election_date,
+                    'district', (
+                        SELECT jsonb_build_object('id', d.id, 'name', d.name)
+                        FROM districts d
+                        WHERE d.id = e.district_id
+                    ),
+                    'election_type', (
+                        SELECT jsonb_build_object('code', t.code, 'name', t.name)
+                        FROM election_types t
+                        WHERE t.code = e.type
+                    )
+                )
+                FROM elections e
+                WHERE e.id = l.election_id
+            )
+        ),
+        'summary', jsonb_build_object(
+            'total_income', COALESCE(l.total_income, 0),
+            'total_expense', COALESCE(l.total_expense, 0),
+            'balance', COALESCE(l.total_income, 0) - COALESCE(l.total_expense, 0),
+            'public_expense_total', (
+                SELECT COALESCE(SUM(j.public_expense_amount), 0)
+                FROM public_journals j
+                WHERE j.ledger_id = l.id AND j.public_expense_amount > 0
+            ),
+            'journal_count', COALESCE(l.journal_count, 0)
+        ),
+        'data', COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', j.id,
+                        'date', j.date,
+                        'amount', j.amount,
+                        'category', c.category,
+                        'category_name', COALESCE(
+                            ac.name,
+                            CASE c.category
+                                WHEN 'personnel' THEN '人件費'
+                                WHEN 'building' THEN '家屋費'
+                                WHEN 'communication' THEN '通信費'
+                                WHEN 'transportation' THEN '交通費'
+                                WHEN 'printing' THEN '印刷費'
+                                WHEN 'advertising' THEN '広告費'
+                                WHEN 'stationery' THEN '文具費'
+                                WHEN 'food' THEN '食糧費'
+                                WHEN 'lodging' THEN '休泊費'
+                                WHEN 'miscellaneous' THEN '雑費'
+                                WHEN 'other_income' THEN 'その他の収入'
+                                WHEN 'donation' THEN '寄附'
+                                ELSE c.category
+                            END
+                        ),
+                        'type', CASE j.classification
+                            WHEN 'pre-campaign' THEN '立候補準備'
+                            ELSE '選挙運動'
+                        END,
+                        'purpose', j.description,
+                        'non_monetary_basis', j.non_monetary_basis,
+                        'note', j.note,
+                        'public_expense_amount', CASE
+                            WHEN j.public_expense_amount > 0 THEN j.public_expense_amount
+                        END
+                    )
+                    ORDER BY j.date ASC NULLS LAST, j.id ASC
+                )
+                FROM public_journals j
+                CROSS JOIN LATERAL (
+                    SELECT CASE
+                        WHEN j.account_code IS NULL OR j.account_code = '' THEN 'miscellaneous'
+                        WHEN j.account_code = 'EXP_PERSONNEL_ELEC' THEN 'personnel'
+                        WHEN j.account_code = 'EXP_BUILDING_ELEC' THEN 'building'
+                        WHEN j.account_code = 'EXP_COMMUNICATION_ELEC' THEN 'communication'
+                        WHEN j.account_code = 'EXP_TRANSPORT_ELEC' THEN 'transportation'
+                        WHEN j.account_code = 'EXP_PRINTING_ELEC' THEN 'printing'
+                        WHEN j.account_code = 'EXP_ADVERTISING_ELEC' THEN 'advertising'
+                        WHEN j.account_code = 'EXP_STATIONERY_ELEC' THEN 'stationery'
+                        WHEN j.account_code = 'EXP_FOOD_ELEC' THEN 'food'
+                        WHEN j.account_code = 'EXP_LODGING_ELEC' THEN 'lodging'
+                        WHEN j.account_code = 'EXP_MISC_ELEC' THEN 'miscellaneous'
+                        WHEN j.account_code = 'REV_SELF_FINANCING' THEN 'other_income'
+                        WHEN j.account_code = 'REV_LOAN_ELEC' THEN 'other_income'
+                        WHEN j.account_code = 'REV_DONATION_INDIVIDUAL_ELEC' THEN 'donation'
+                        WHEN j.account_code = 'REV_DONATION_POLITICAL_ELEC' THEN 'donation'
+                        WHEN j.account_code = 'REV_MISC_ELEC' THEN 'other_income'
+                        WHEN starts_with(j.account_code, 'REV_')
+                            AND strpos(j.account_code, 'DONATION') > 0 THEN 'donation'
+                        WHEN starts_with(j.account_code, 'REV_') THEN 'other_income'
+                        ELSE 'miscellaneous'
+                    END AS category
+                ) c
+                LEFT JOIN account_codes ac ON ac.code = j.account_code
+                WHERE j.ledger_id = l.id
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM public_ledgers l
+    WHERE l.id = p_ledger_id
+      AND l.election_id IS NOT NULL;
+$$;
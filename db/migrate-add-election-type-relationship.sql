@@ -0,0 +1,16 @@
+-- ============================================
+-- elections → election_types の computed relationship
+-- Supabase SQL Editor で実行してください
+-- ============================================
+
+-- elections.type には外部キーが無いため、PostgREST のリソース埋め込み
+-- （例: elections(..., election_type(code, name))）で選挙タイプを取得できるよう
+-- to-one の computed relationship を定義する
+CREATE OR REPLACE FUNCTION election_type(elections)
+RETURNS SETOF election_types
+ROWS 1
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT * FROM election_types WHERE code = $1.type
+$$;
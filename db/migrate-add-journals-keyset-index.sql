@@ -0,0 +1,12 @@
+-- ============================================
+-- public_journals のキーセットページング用の複合インデックス
+-- Supabase SQL Editor で実行してください
+-- ============================================
+
+-- バックエンド API は台帳の仕訳を (ledger_id, date, id) の順にキーセットでページング取得する
+-- （backend/app/utils/journal_stream.py）。idx_public_journals_ledger と
+-- idx_public_journals_date だけではページごとに台帳の仕訳を並べ替えることになるため、
+-- 並び順（date は昇順・NULL は末尾）と同じ複合インデックスを作成し、
+-- 各ページをインデックスの範囲走査で取得できるようにする
+CREATE INDEX IF NOT EXISTS idx_public_journals_ledger_date_id
+    ON public_journals(ledger_id, date, id);
@@ -0,0 +1,75 @@
+-- ============================================
+-- public_ledgers.public_expense_total（台帳ごとの公費負担合計）
+-- Supabase SQL Editor で実行してください
+-- ============================================
+
+-- 候補者一覧 API が仕訳を全件取得せずに公費負担合計を返せるよう、
+-- public_journals の変更に合わせて台帳ごとの合計を保持する
+ALTER TABLE public_ledgers
+ADD COLUMN IF NOT EXISTS public_expense_total INT NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN public_ledgers.public_expense_total IS '公費負担合計（public_journals.public_expense_amount の正の値の合計）';
+
+-- 指定した台帳の公費負担合計を再計算する
+CREATE OR REPLACE FUNCTION recompute_public_expense_total(p_ledger_ids UUID[])
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE public_ledgers l
+    SET public_expense_total = COALESCE((
+        SELECT SUM(j.public_expense_amount)
+        FROM public_journals j
+        WHERE j.ledger_id = l.id
+          AND j.public_expense_amount > 0
+    ), 0)
+    WHERE l.id = ANY(p_ledger_ids);
+$$;
+
+-- 同期は仕訳を一括 INSERT するため、行単位ではなく文単位で
+-- 影響を受けた台帳のみを再計算する
+CREATE OR REPLACE FUNCTION refresh_public_expense_total()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM recompute_public_expense_total(
+            ARRAY(SELECT DISTINCT ledger_id FROM new_rows)
+        );
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM recompute_public_expense_total(
+            ARRAY(
+                SELECT ledger_id FROM new_rows
+                UNION
+                SELECT ledger_id FROM old_rows
+            )
+        );
+    ELSE
+        PERFORM recompute_public_expense_total(
+            ARRAY(SELECT DISTINCT ledger_id FROM old_rows)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_public_journals_expense_insert ON public_journals;
+CREATE TRIGGER trg_public_journals_expense_insert
+AFTER INSERT ON public_journals
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION refresh_public_expense_total();
+
+DROP TRIGGER IF EXISTS trg_public_journals_expense_update ON public_journals;
+CREATE TRIGGER trg_public_journals_expense_update
+AFTER UPDATE ON public_journals
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION refresh_public_expense_total();
+
+DROP TRIGGER IF EXISTS trg_public_journals_expense_delete ON public_journals;
+CREATE TRIGGER trg_public_journals_expense_delete
+AFTER DELETE ON public_journals
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION refresh_public_expense_total();
+
+-- 既存データのバックフィル
+SELECT recompute_public_expense_total(ARRAY(SELECT id FROM public_ledgers));
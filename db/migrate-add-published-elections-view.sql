@@ -0,0 +1,25 @@
+-- ============================================
+-- 収支データ公開済み選挙のビュー
+-- Supabase SQL Editor で実行してください
+-- ============================================
+
+-- public_ledgers に台帳が存在する選挙を1件ずつ返す。
+-- 台帳の走査ではなく EXISTS（idx_public_ledgers_election）で判定するため、
+-- コストは候補者の台帳数ではなく選挙数に比例する。
+-- security_invoker により、参照元テーブルの RLS がそのまま適用される。
+CREATE OR REPLACE VIEW published_elections
+WITH (security_invoker = true) AS
+SELECT
+    e.id,
+    e.name,
+    e.type,
+    e.election_date,
+    e.district_id,
+    d.name AS district_name
+FROM elections e
+LEFT JOIN districts d ON d.id = e.district_id
+WHERE EXISTS (
+    SELECT 1
+    FROM public_ledgers l
+    WHERE l.election_id = e.id
+);
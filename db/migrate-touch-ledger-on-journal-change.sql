@@ -0,0 +1,62 @@
+-- ============================================
+-- public_journals の変更時に public_ledgers.last_updated_at を更新
+-- Supabase SQL Editor で実行してください
+-- ============================================
+
+-- バックエンド API は (台帳ID, last_updated_at) をキーに台帳レスポンスをキャッシュする。
+-- 仕訳の同期・削除は台帳の同期とは別に行われるため、仕訳が変わった台帳の
+-- last_updated_at をトリガーで更新し、キャッシュが古いデータを返さないようにする
+CREATE OR REPLACE FUNCTION touch_public_ledgers_last_updated_at(p_ledger_ids UUID[])
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE public_ledgers
+    SET last_updated_at = NOW()
+    WHERE id = ANY(p_ledger_ids);
+$$;
+
+-- 同期は仕訳を一括 INSERT するため、行単位ではなく文単位で
+-- 影響を受けた台帳のみを更新する
+CREATE OR REPLACE FUNCTION touch_ledgers_on_journal_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM touch_public_ledgers_last_updated_at(
+            ARRAY(SELECT DISTINCT ledger_id FROM new_rows)
+        );
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM touch_public_ledgers_last_updated_at(
+            ARRAY(
+                SELECT ledger_id FROM new_rows
+                UNION
+                SELECT ledger_id FROM old_rows
+            )
+        );
+    ELSE
+        PERFORM touch_public_ledgers_last_updated_at(
+            ARRAY(SELECT DISTINCT ledger_id FROM old_rows)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_public_journals_touch_ledger_insert ON public_journals;
+CREATE TRIGGER trg_public_journals_touch_ledger_insert
+AFTER INSERT ON public_journals
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION touch_ledgers_on_journal_change();
+
+DROP TRIGGER IF EXISTS trg_public_journals_touch_ledger_update ON public_journals;
+CREATE TRIGGER trg_public_journals_touch_ledger_update
+AFTER UPDATE ON public_journals
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION touch_ledgers_on_journal_change();
+
+DROP TRIGGER IF EXISTS trg_public_journals_touch_ledger_delete ON public_journals;
+CREATE TRIGGER trg_public_journals_touch_ledger_delete
+AFTER DELETE ON public_journals
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION touch_ledgers_on_journal_change();
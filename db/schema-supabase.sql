@@ -162,6 +162,7 @@ CREATE TABLE IF NOT EXISTS public_ledgers (
     total_income INT DEFAULT 0,
     total_expense INT DEFAULT 0,
     journal_count INT DEFAULT 0,
+    public_expense_total INT NOT NULL DEFAULT 0,
     ledger_source_id UUID NOT NULL UNIQUE,
     is_test BOOLEAN DEFAULT FALSE,
     last_updated_at TIMESTAMPTZ NOT NULL,
@@ -209,6 +210,7 @@ CREATE INDEX IF NOT EXISTS idx_public_ledgers_fiscal_year ON public_ledgers(fisc
 CREATE INDEX IF NOT EXISTS idx_public_ledgers_election ON public_ledgers(election_id);
 CREATE INDEX IF NOT EXISTS idx_public_journals_ledger ON public_journals(ledger_id);
 CREATE INDEX IF NOT EXISTS idx_public_journals_date ON public_journals(date);
+CREATE INDEX IF NOT EXISTS idx_public_journals_ledger_date_id ON public_journals(ledger_id, date, id);
 CREATE INDEX IF NOT EXISTS idx_change_logs_ledger ON ledger_change_logs(ledger_id);
 CREATE INDEX IF NOT EXISTS idx_change_logs_changed_at ON ledger_change_logs(changed_at DESC);
 
@@ -384,3 +386,282 @@ CREATE POLICY "Allow service write" ON election_requests FOR ALL USING (auth.rol
 CREATE POLICY "Allow service write" ON organization_requests FOR ALL USING (auth.role() = 'service_role');
 CREATE POLICY "Allow service write" ON unlock_requests FOR ALL USING (auth.role() = 'service_role');
 CREATE POLICY "Allow service write" ON admin_users FOR ALL USING (auth.role() = 'service_role');
+
+-- ============================================
+-- バックエンド API 用の関数
+-- ============================================
+
+-- elections → election_types の computed relationship
+-- （elections.type には外部キーが無いため、PostgREST の埋め込み用に定義）
+CREATE OR REPLACE FUNCTION election_type(elections)
+RETURNS SETOF election_types
+ROWS 1
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT * FROM election_types WHERE code = $1.type
+$$;
+
+-- 選挙資金レスポンスをサーバー側で組み立てる RPC 関数
+-- バックエンドの ELECTION_FUNDS_RPC_ENABLED=true 時に supabase.rpc から呼び出される。
+-- 台帳（メタ情報を埋め込んだ行）・サマリー・ElectionFundsDataItem 形式の仕訳一覧を
+-- 1つの JSONB で返す。台帳が存在しない、または選挙台帳でない場合は NULL を返す。
+-- カテゴリ導出は backend/app/utils/category.py と同じ規則で行う。
+CREATE OR REPLACE FUNCTION get_election_funds_response(p_ledger_id UUID)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'ledger', to_jsonb(l) || jsonb_build_object(
+            'politicians', (
+                SELECT jsonb_build_object('id', p.id, 'name', p.name, 'name_kana', p.name_kana)
+                FROM politicians p
+                WHERE p.id = l.politician_id
+            ),
+            'elections', (
+                SELECT jsonb_build_object(
+                    'id', e.id,
+                    'name', e.name,
+                    'type', e.type,
+                    'election_date', e.election_date,
+                    'district', (
+                        SELECT jsonb_build_object('id', d.id, 'name', d.name)
+                        FROM districts d
+                        WHERE d.id = e.district_id
+                    ),
+                    'election_type', (
+                        SELECT jsonb_build_object('code', t.code, 'name', t.name)
+                        FROM election_types t
+                        WHERE t.code = e.type
+                    )
+                )
+                FROM elections e
+                WHERE e.id = l.election_id
+            )
+        ),
+        'summary', jsonb_build_object(
+            'total_income', COALESCE(l.total_income, 0),
+            'total_expense', COALESCE(l.total_expense, 0),
+            'balance', COALESCE(l.total_income, 0) - COALESCE(l.total_expense, 0),
+            'public_expense_total', (
+                SELECT COALESCE(SUM(j.public_expense_amount), 0)
+                FROM public_journals j
+                WHERE j.ledger_id = l.id AND j.public_expense_amount > 0
+            ),
+            'journal_count', COALESCE(l.journal_count, 0)
+        ),
+        'data', COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'id', j.id,
+                        'date', j.date,
+                        'amount', j.amount,
+                        'category', c.category,
+                        'category_name', COALESCE(
+                            ac.name,
+                            CASE c.category
+                                WHEN 'personnel' THEN '人件費'
+                                WHEN 'building' THEN '家屋費'
+                                WHEN 'communication' THEN '通信費'
+                                WHEN 'transportation' THEN '交通費'
+                                WHEN 'printing' THEN '印刷費'
+                                WHEN 'advertising' THEN '広告費'
+                                WHEN 'stationery' THEN '文具費'
+                                WHEN 'food' THEN '食糧費'
+                                WHEN 'lodging' THEN '休泊費'
+                                WHEN 'miscellaneous' THEN '雑費'
+                                WHEN 'other_income' THEN 'その他の収入'
+                                WHEN 'donation' THEN '寄附'
+                                ELSE c.category
+                            END
+                        ),
+                        'type', CASE j.classification
+                            WHEN 'pre-campaign' THEN '立候補準備'
+                            ELSE '選挙運動'
+                        END,
+                        'purpose', j.description,
+                        'non_monetary_basis', j.non_monetary_basis,
+                        'note', j.note,
+                        'public_expense_amount', CASE
+                            WHEN j.public_expense_amount > 0 THEN j.public_expense_amount
+                        END
+                    )
+                    ORDER BY j.date ASC NULLS LAST, j.id ASC
+                )
+                FROM public_journals j
+                CROSS JOIN LATERAL (
+                    SELECT CASE
+                        WHEN j.account_code IS NULL OR j.account_code = '' THEN 'miscellaneous'
+                        WHEN j.account_code = 'EXP_PERSONNEL_ELEC' THEN 'personnel'
+                        WHEN j.account_code = 'EXP_BUILDING_ELEC' THEN 'building'
+                        WHEN j.account_code = 'EXP_COMMUNICATION_ELEC' THEN 'communication'
+                        WHEN j.account_code = 'EXP_TRANSPORT_ELEC' THEN 'transportation'
+                        WHEN j.account_code = 'EXP_PRINTING_ELEC' THEN 'printing'
+                        WHEN j.account_code = 'EXP_ADVERTISING_ELEC' THEN 'advertising'
+                        WHEN j.account_code = 'EXP_STATIONERY_ELEC' THEN 'stationery'
+                        WHEN j.account_code = 'EXP_FOOD_ELEC' THEN 'food'
+                        WHEN j.account_code = 'EXP_LODGING_ELEC' THEN 'lodging'
+                        WHEN j.account_code = 'EXP_MISC_ELEC' THEN 'miscellaneous'
+                        WHEN j.account_code = 'REV_SELF_FINANCING' THEN 'other_income'
+                        WHEN j.account_code = 'REV_LOAN_ELEC' THEN 'other_income'
+                        WHEN j.account_code = 'REV_DONATION_INDIVIDUAL_ELEC' THEN 'donation'
+                        WHEN j.account_code = 'REV_DONATION_POLITICAL_ELEC' THEN 'donation'
+                        WHEN j.account_code = 'REV_MISC_ELEC' THEN 'other_income'
+                        WHEN starts_with(j.account_code, 'REV_')
+                            AND strpos(j.account_code, 'DONATION') > 0 THEN 'donation'
+                        WHEN starts_with(j.account_code, 'REV_') THEN 'other_income'
+                        ELSE 'miscellaneous'
+                    END AS category
+                ) c
+                LEFT JOIN account_codes ac ON ac.code = j.account_code
+                WHERE j.ledger_id = l.id
+            ),
+            '[]'::jsonb
+        )
+    )
+    FROM public_ledgers l
+    WHERE l.id = p_ledger_id
+      AND l.election_id IS NOT NULL;
+$$;
+
+-- 収支データ公開済み選挙のビュー
+-- public_ledgers に台帳が存在する選挙を1件ずつ返す。
+-- 台帳の走査ではなく EXISTS（idx_public_ledgers_election）で判定するため、
+-- コストは候補者の台帳数ではなく選挙数に比例する。
+-- security_invoker により、参照元テーブルの RLS がそのまま適用される。
+CREATE OR REPLACE VIEW published_elections
+WITH (security_invoker = true) AS
+SELECT
+    e.id,
+    e.name,
+    e.type,
+    e.election_date,
+    e.district_id,
+    d.name AS district_name
+FROM elections e
+LEFT JOIN districts d ON d.id = e.district_id
+WHERE EXISTS (
+    SELECT 1
+    FROM public_ledgers l
+    WHERE l.election_id = e.id
+);
+
+-- 台帳ごとの公費負担合計（public_ledgers.public_expense_total）の維持
+-- 指定した台帳の公費負担合計を再計算する
+CREATE OR REPLACE FUNCTION recompute_public_expense_total(p_ledger_ids UUID[])
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE public_ledgers l
+    SET public_expense_total = COALESCE((
+        SELECT SUM(j.public_expense_amount)
+        FROM public_journals j
+        WHERE j.ledger_id = l.id
+          AND j.public_expense_amount > 0
+    ), 0)
+    WHERE l.id = ANY(p_ledger_ids);
+$$;
+
+-- 同期は仕訳を一括 INSERT するため、行単位ではなく文単位で
+-- 影響を受けた台帳のみを再計算する
+CREATE OR REPLACE FUNCTION refresh_public_expense_total()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM recompute_public_expense_total(
+            ARRAY(SELECT DISTINCT ledger_id FROM new_rows)
+        );
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM recompute_public_expense_total(
+            ARRAY(
+                SELECT ledger_id FROM new_rows
+                UNION
+                SELECT ledger_id FROM old_rows
+            )
+        );
+    ELSE
+        PERFORM recompute_public_expense_total(
+            ARRAY(SELECT DISTINCT ledger_id FROM old_rows)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_public_journals_expense_insert ON public_journals;
+CREATE TRIGGER trg_public_journals_expense_insert
+AFTER INSERT ON public_journals
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION refresh_public_expense_total();
+
+DROP TRIGGER IF EXISTS trg_public_journals_expense_update ON public_journals;
+CREATE TRIGGER trg_public_journals_expense_update
+AFTER UPDATE ON public_journals
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION refresh_public_expense_total();
+
+DROP TRIGGER IF EXISTS trg_public_journals_expense_delete ON public_journals;
+CREATE TRIGGER trg_public_journals_expense_delete
+AFTER DELETE ON public_journals
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION refresh_public_expense_total();
+
+-- 仕訳の変更時に台帳の last_updated_at を更新（台帳レスポンスキャッシュのキー）
+CREATE OR REPLACE FUNCTION touch_public_ledgers_last_updated_at(p_ledger_ids UUID[])
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    UPDATE public_ledgers
+    SET last_updated_at = NOW()
+    WHERE id = ANY(p_ledger_ids);
+$$;
+
+-- 同期は仕訳を一括 INSERT するため、行単位ではなく文単位で
+-- 影響を受けた台帳のみを更新する
+CREATE OR REPLACE FUNCTION touch_ledgers_on_journal_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM touch_public_ledgers_last_updated_at(
+            ARRAY(SELECT DISTINCT ledger_id FROM new_rows)
+        );
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM touch_public_ledgers_last_updated_at(
+            ARRAY(
+                SELECT ledger_id FROM new_rows
+                UNION
+                SELECT ledger_id FROM old_rows
+            )
+        );
+    ELSE
+        PERFORM touch_public_ledgers_last_updated_at(
+            ARRAY(SELECT DISTINCT ledger_id FROM old_rows)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_public_journals_touch_ledger_insert ON public_journals;
+CREATE TRIGGER trg_public_journals_touch_ledger_insert
+AFTER INSERT ON public_journals
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION touch_ledgers_on_journal_change();
+
+DROP TRIGGER IF EXISTS trg_public_journals_touch_ledger_update ON public_journals;
+CREATE TRIGGER trg_public_journals_touch_ledger_update
+AFTER UPDATE ON public_journals
+REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION touch_ledgers_on_journal_change();
+
+DROP TRIGGER IF EXISTS trg_public_journals_touch_ledger_delete ON public_journals;
+CREATE TRIGGER trg_public_journals_touch_ledger_delete
+AFTER DELETE ON public_journals
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION touch_ledgers_on_journal_change();